@@ -0,0 +1,101 @@
+"""
+Headless batch entry point: compute the default indicator set for symbols in
+the bar store without importing pandas, yaml or lightweight_charts, so batch
+workers start in well under 100 ms.
+
+    python -m src.headless --store ./src/data/bars --interval 1d AAPL MSFT
+    python -m src.headless --store ./src/data/bars --interval 1d --all
+
+Each symbol is written to `{output}/{symbol}_{interval}_indicators.npz`, holding
+the bar `time` (epoch seconds) and one array per chart line name.
+
+Histories larger than memory are computed in blocks with `--chunk-rows`; the
+lines then go to a bar store partition under `{output}/{symbol}/{interval}/`
+(one `.npy` per line name), written block by block:
+
+    python -m src.headless --store ./src/data/bars --interval 1s --chunk-rows 1000000 --output ./lines AAPL
+"""
+
+import os
+import argparse
+import numpy as np
+from src.trading_funcs.data.store import BarStore
+from src.trading_funcs.indicators.chunked import compute_chunked
+from src.trading_funcs.indicators.compute import allocate_lines, compute_indicators
+from src.utils.logs import set_up_log
+
+
+logger = set_up_log(__name__)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compute indicators for stored bars without the chart")
+    parser.add_argument('symbols', nargs='*', help="Symbols to compute")
+    parser.add_argument('--all', action='store_true', help="Every symbol stored for the interval")
+    parser.add_argument('--store', default="./src/data/bars", help="BarStore root")
+    parser.add_argument('--interval', default='1d')
+    parser.add_argument('--output', default="./src/export")
+    parser.add_argument('--dtype', default='float64', choices=['float64', 'float32'], help="Precision of the written indicator arrays")
+    parser.add_argument('--chunk-rows', type=int, default=None, help="Compute in blocks of this many bars, with bounded memory, into a bar store under --output")
+    return parser.parse_args(argv)
+
+
+def stored_symbols(store: BarStore, interval: str) -> list[str]:
+    if not os.path.isdir(store.root):
+        return []
+    return sorted(symbol for symbol in os.listdir(store.root) if store.exists(symbol, interval))
+
+
+def compute_symbol(store: BarStore, symbol: str, interval: str, output_path: str, dtype: str = 'float64') -> str:
+    """
+    Compute and write the indicators of one stored symbol.
+
+    :return: The written file path.
+    """
+    bars = store.load_bars(symbol, interval, columns=['high', 'low', 'close'])
+    values = compute_indicators(bars.high, bars.low, bars.close, out=allocate_lines(len(bars), dtype=dtype))
+    file_path = os.path.join(output_path, f'{symbol.upper()}_{interval}_indicators.npz')
+    np.savez(file_path, time=bars.time, **values)
+    return file_path
+
+
+def compute_symbol_chunked(store: BarStore, symbol: str, interval: str, output_path: str, chunk_rows: int, dtype: str = 'float64') -> str:
+    """
+    Compute the indicators of one stored symbol block by block into the bar
+    store at `output_path`; memory is bounded by `chunk_rows`, not the history.
+
+    :return: The written partition directory.
+    """
+    blocks = store.iter_blocks(symbol, interval, chunk_rows, columns=['high', 'low', 'close'])
+    with BarStore(output_path).writer(symbol, interval, kind='indicators') as writer:
+        for lines in compute_chunked(blocks, dtype=dtype):
+            writer.append(lines)
+    return os.path.join(output_path, symbol.upper(), interval)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    store = BarStore(args.store)
+    symbols = stored_symbols(store, args.interval) if args.all else [symbol.upper() for symbol in args.symbols]
+    if not symbols:
+        logger.info("No symbols to compute.")
+        return 1
+
+    os.makedirs(args.output, exist_ok=True)
+    failed = 0
+    for symbol in symbols:
+        try:
+            if args.chunk_rows:
+                file_path = compute_symbol_chunked(store, symbol, args.interval, args.output, args.chunk_rows, dtype=args.dtype)
+            else:
+                file_path = compute_symbol(store, symbol, args.interval, args.output, dtype=args.dtype)
+        except (FileNotFoundError, ValueError) as e:
+            logger.error(e)
+            failed += 1
+            continue
+        logger.info(f'Wrote {file_path}')
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,14 +1,135 @@
+import argparse
 import datetime
 from dateutil.relativedelta import relativedelta
-from src.trading_funcs.charting import StockChart
 from src.utils.logs import set_up_log
 
 
 logger = set_up_log(__name__)
 
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Trading playground")
+    parser.add_argument('--watchlist', help="Comma separated symbols, or a file with one symbol per line")
+    parser.add_argument('--offline', help="Read bars from this directory of CSV snapshots instead of Yahoo Finance")
+    parser.add_argument('--output', default="./src/export", help="Where the watchlist mode writes indicator files")
+    parser.add_argument('--interval', default='1d')
+    parser.add_argument('--batch-size', type=int, default=100, help="Symbols per provider call")
+    parser.add_argument('--rate-limit', type=float, help="Provider calls started per second (default unlimited)")
+    parser.add_argument('--latency', type=float, default=0.0, help="Simulated seconds per provider call in --offline mode")
+    parser.add_argument('--replay', type=float, help="Replay the last --replay-bars stored bars as live ticks at this speed (60 = 1 minute per second)")
+    parser.add_argument('--replay-bars', type=int, default=500)
+    parser.add_argument('--screen', help='Screen the stored universe, e.g. "RSI < 30 and close < Lower Bollinger 20 and %%K crosses above %%D"')
+    parser.add_argument('--rank', help="Line to rank screen matches by (lowest first unless --descending)")
+    parser.add_argument('--descending', action='store_true')
+    parser.add_argument('--top', type=int, default=20, help="Screen matches to print")
+    parser.add_argument('--panel', help="Aligned universe file (.npz) for --screen and --peers: read if it exists, written otherwise")
+    parser.add_argument('--peers', help="List the stored symbols whose returns are most correlated with this one")
+    parser.add_argument('--window', type=int, default=60, help="Bars of the rolling --peers window")
+    parser.add_argument('--report', help="Write static HTML charts of the stored --watchlist symbols (default all) to this directory")
+    parser.add_argument('--workers', type=int, help="Worker processes for --report (default one per CPU)")
+    parser.add_argument('--shared-assets', action='store_true', help="--report pages load the chart library from one copy in the directory instead of embedding it")
+    parser.add_argument('--prefetch', help="Comma separated symbols, or a file with one symbol per line, prepared in the background so the chart switches to them instantly")
+    return parser.parse_args()
+
+
+def read_watchlist(watchlist: str) -> list[str]:
+    try:
+        with open(watchlist, 'r', encoding='utf-8') as f:
+            return [line.strip() for line in f if line.strip()]
+    except OSError:
+        return watchlist.split(',')
+
+
+def run_watchlist(args: argparse.Namespace, start_date: str, end_date: str) -> None:
+    from src.trading_funcs.data import LocalFileProvider, ReplayProvider, YahooProvider
+    from src.trading_funcs.pipeline import WatchlistPipeline
+
+    if args.offline:
+        provider = LocalFileProvider(args.offline, batch_size=args.batch_size)
+        if args.latency:
+            provider = ReplayProvider(provider, latency=args.latency)
+    else:
+        provider = YahooProvider(batch_size=args.batch_size)
+    pipeline = WatchlistPipeline(
+        provider=provider,
+        output_path=args.output,
+        start_date=start_date,
+        end_date=end_date,
+        interval=args.interval,
+        rate_limit=args.rate_limit
+    )
+    written = pipeline.run(read_watchlist(args.watchlist))
+    logger.info(f'Wrote indicators for {len(written)} symbols to {args.output}')
+
+
+def load_panel(args: argparse.Namespace):
+    import os
+    from src.headless import stored_symbols
+    from src.trading_funcs.data import BarStore, Panel
+
+    if args.panel and os.path.exists(args.panel):
+        return Panel.load(args.panel)
+    store = BarStore('./src/data/bars')
+    symbols = read_watchlist(args.watchlist) if args.watchlist else stored_symbols(store, args.interval)
+    panel = Panel.from_store(store, symbols, args.interval)
+    if args.panel:
+        panel.save(args.panel)
+    return panel
+
+
+def run_screen(args: argparse.Namespace) -> None:
+    from src.trading_funcs.screener import Screener
+
+    matches = Screener(load_panel(args)).scan(args.screen, rank_by=args.rank, ascending=not args.descending, top=args.top)
+    print(matches.to_string(index=False))
+
+
+def run_peers(args: argparse.Namespace) -> None:
+    from src.trading_funcs.portfolio import RollingCorrelation
+
+    engine = RollingCorrelation.from_panel(load_panel(args), window=args.window)
+    print(engine.peers(args.peers.upper(), k=args.top).to_string(index=False))
+
+
+def run_report(args: argparse.Namespace, start_date: str, end_date: str) -> None:
+    from src.trading_funcs.pipeline import ReportPipeline
+
+    pipeline = ReportPipeline(
+        stock_data_path="./src/data",
+        output_path=args.report,
+        start_date=start_date,
+        end_date=end_date,
+        interval=args.interval,
+        max_workers=args.workers,
+        inline_assets=not args.shared_assets
+    )
+    pipeline.run(read_watchlist(args.watchlist) if args.watchlist else None)
+
+
 if __name__ == "__main__":
 
+    args = parse_args()
+    start_date = (datetime.datetime.now() - relativedelta(years=3)).strftime('%Y-%m-%d')
+    end_date = datetime.datetime.now().strftime('%Y-%m-%d')
+
+    if args.screen:
+        run_screen(args)
+        exit()
+
+    if args.peers:
+        run_peers(args)
+        exit()
+
+    if args.report:
+        run_report(args, start_date=start_date, end_date=end_date)
+        exit()
+
+    if args.watchlist:
+        run_watchlist(args, start_date=start_date, end_date=end_date)
+        exit()
+
+    from src.trading_funcs.charting import StockChart
+
     # input the stock code
     stock_code = input("Enter stock code (e.g., AAPL): ").strip().upper()
     if not stock_code:
@@ -17,20 +138,26 @@ if __name__ == "__main__":
 
     # initialization
     stock_data_path = "./src/data"
-    start_date = (datetime.datetime.now() - relativedelta(years=3)).strftime('%Y-%m-%d')
-    end_date = datetime.datetime.now().strftime('%Y-%m-%d')
-    interval = '1d'
+    interval = args.interval
     save_flag = True
     excel_extensions = ['.xlsx', '.xls', '.xlsm', 'csv']
 
     stock_chart = StockChart(
-        stock_code=stock_code, 
-        stock_data_path=stock_data_path, 
-        start_date=start_date, 
+        stock_code=stock_code,
+        stock_data_path=stock_data_path,
+        start_date=start_date,
         end_date=end_date,
         interval=interval,
         save_flag=save_flag
     )
-    data = stock_chart.get_bar_data(stock_code=stock_code)
-    chart_plot = stock_chart.plot(data=data)
-    chart_plot.show(block=True)  # This will open the chart in a web browser
\ No newline at end of file
+    feed = stock_chart.replay(args.replay, args.replay_bars) if args.replay else None
+    history = stock_chart.get_history(stock_code=stock_code) if feed is None else None
+    if feed is not None:
+        chart_plot = stock_chart.chart
+    elif history is None:
+        chart_plot = stock_chart.plot(data=stock_chart.get_bar_data(stock_code=stock_code))
+    else:
+        chart_plot = stock_chart.plot_history(history)
+    if args.prefetch:
+        stock_chart.prefetch([symbol.strip().upper() for symbol in read_watchlist(args.prefetch) if symbol.strip()])
+    chart_plot.show(block=True)  # This will open the chart in a web browser
@@ -1,13 +1,42 @@
 import os
-import yaml
+from functools import lru_cache
+from types import MappingProxyType
 
 
 # Constants for trading settings
 SHIFT_STOCHASTIC_VAL = 200
 SHIFT_RSI_VAL = 100
 
-PROJECT_DIR = os.getcwd()
-PROJECT_DIR = '/Users/tongcc/dev/projects/trading'
+# resolved from this file, so the config is found from any working directory
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+INDICATOR_CONFIG_PATH = os.path.join(PROJECT_DIR, 'config', 'indicators_config.yaml')
 
-with open(os.path.join(PROJECT_DIR, 'config', 'indicators_config.yaml'), 'r', encoding='utf-8') as f:
-    indicator_config = yaml.safe_load(f)
\ No newline at end of file
+
+def freeze(value):
+    """
+    Read-only copy of parsed YAML: mappings become MappingProxyType, lists tuples.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+@lru_cache(maxsize=None)
+def load_config(path: str = INDICATOR_CONFIG_PATH) -> MappingProxyType:
+    """
+    Parse a YAML config once per process and return it frozen.
+    yaml is only imported here, so modules that never read config do not pay for it.
+    """
+    import yaml
+
+    with open(path, 'r', encoding='utf-8') as f:
+        return freeze(yaml.safe_load(f) or {})
+
+
+def __getattr__(name: str):
+    # `indicator_config` is parsed on first access rather than at import
+    if name == 'indicator_config':
+        return load_config()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -3,6 +3,27 @@ from dotenv import load_dotenv
 
 load_dotenv(override=True)
 
+TRUE_STRINGS = ('1', 'true', 'yes', 'on')
+FALSE_STRINGS = ('0', 'false', 'no', 'off', '')
+
+
+def to_bool(value) -> bool:
+    """
+    Parse a boolean environment value ('1'/'true'/'yes'/'on' or '0'/'false'/'no'/'off'/'', any case).
+
+    Raises:
+        ValueError: If the value is not one of the recognised strings.
+    """
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in TRUE_STRINGS:
+        return True
+    if text in FALSE_STRINGS:
+        return False
+    raise ValueError(f"'{value}' is not a boolean value.")
+
+
 class ConfigBase:
     """
     A base configuration class that loads environment variables.
@@ -41,7 +62,7 @@ class ConfigBase:
         
         try:
             if cast is bool:
-                return eval(value)
+                return to_bool(value)
             return cast(value)
         except ValueError:
             raise ValueError(f"Environment variable '{key}' cannot be cast to {cast.__name__}.")
@@ -75,7 +96,8 @@ class Environment(ConfigBase):
 
     Attributes:
         LOG_LEVEL (str): The Log level of the logger.
-        TURN_ON_LOGGING (str): A switch for turning logging or not.
+        TURN_ON_LOGGING (bool): Whether logging is turned on ('1'/'true'/'yes'/'on', or '0'/'false'/'no'/'off'/'').
+        INSTRUMENTATION (str): '' (off), 'on', or 'memory' to also trace allocations.
     """
 
     def __init__(self):
@@ -84,4 +106,5 @@ class Environment(ConfigBase):
         """
         super().__init__()
         self.LOG_LEVEL = ("LOG_LEVEL", str)
-        self.TURN_ON_LOGGING = ("TURN_ON_LOGGING", str)
\ No newline at end of file
+        self.TURN_ON_LOGGING = ("TURN_ON_LOGGING", bool)
+        self.INSTRUMENTATION = ("INSTRUMENTATION", str, "")
\ No newline at end of file
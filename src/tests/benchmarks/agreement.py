@@ -0,0 +1,137 @@
+"""
+Numeric agreement of the fast indicator paths and the portfolio statistics with
+the pandas reference.
+"""
+
+import numpy as np
+import pandas as pd
+from src.trading_funcs.indicators import SMA, BollingerBands, DonchianChannels, RSI, StochasticOscillator, EMA, MACD, ATR, ADX
+from src.trading_funcs.portfolio import RollingCorrelation, bar_returns
+from src.tests.benchmarks import reference
+from src.tests.benchmarks.synthetic import make_bars
+
+# pandas sums in a different order and leaves rounding noise in flat windows,
+# so values are compared with a tolerance relative to the price level
+RTOL = 1e-9
+ATOL = 1e-6
+
+
+def indicator_errors(df: pd.DataFrame) -> dict[str, float]:
+    """
+    Error of every `calculate_indicator_df` line against the reference, over the
+    bars where the reference is defined, in units of the tolerance (<= 1 agrees).
+    """
+    expected = {
+        'SMA 9': reference.sma(df, 9),
+        'SMA 4': reference.sma(df, 4),
+        **reference.bollinger_bands(df),
+        **reference.donchian_channels(df),
+        'RSI': reference.wilder_rsi(df),
+        'RSI simple': reference.rsi(df),
+        **reference.stochastic_oscillator(df),
+        'EMA 12': reference.ema(df, 12),
+        'EMA 26': reference.ema(df, 26),
+        **reference.macd(df),
+        'ATR': reference.atr(df),
+        **reference.adx(df)
+    }
+    actual = {}
+    for frame in (
+        SMA().calculate_indicator_df(df, 9),
+        SMA().calculate_indicator_df(df, 4),
+        BollingerBands().calculate_indicator_df(df),
+        DonchianChannels().calculate_indicator_df(df),
+        RSI().calculate_indicator_df(df),
+        RSI(name='RSI simple', smoothing='simple').calculate_indicator_df(df),
+        StochasticOscillator().calculate_indicator_df(df),
+        EMA().calculate_indicator_df(df, 12),
+        EMA().calculate_indicator_df(df, 26),
+        MACD().calculate_indicator_df(df),
+        ATR().calculate_indicator_df(df),
+        ADX().calculate_indicator_df(df)
+    ):
+        actual.update({col: frame[col].to_numpy() for col in frame.columns if col in expected})
+
+    # pandas' rolling std leaves sqrt(rounding noise) on constant windows where the
+    # kernels return exactly 0, so the std-based bands are not compared there
+    close = df['close'].rolling(window=20)
+    flat = (close.max() == close.min()).to_numpy()
+
+    errors = {}
+    for name, values in expected.items():
+        values = values.to_numpy()
+        defined = np.isfinite(values)
+        if name in ('Upper Bollinger 20', 'Lower Bollinger 20'):
+            defined &= ~flat
+        scale = np.abs(values[defined]).max() if defined.any() else 0.0
+        error = np.abs(actual[name][defined] - values[defined]).max() if defined.any() else 0.0
+        errors[name] = float(error / (ATOL + RTOL * scale))
+    return errors
+
+
+def correlation_errors(n_symbols: int = 6, n_bars: int = 300, window: int = 20, min_periods: int = 12, missing: float = 0.05) -> dict[str, float]:
+    """
+    Error of the RollingCorrelation matrices at every bar from the first full
+    window (moved incrementally), and of `pairs`, against pandas' pairwise rolling
+    statistics on returns with missing bars, relative to each statistic's scale
+    (<= 1 agrees). A bar where only one side is NaN is an infinite error.
+    """
+    closes = np.stack([make_bars(n_bars, seed=seed)['close'].to_numpy() for seed in range(n_symbols)])
+    closes[np.random.default_rng(0).random(closes.shape) < missing] = np.nan
+    returns = bar_returns(closes)
+    engine = RollingCorrelation(returns, window, min_periods=min_periods)
+    expected = reference.rolling_pair_statistics(pd.DataFrame(returns.T), window, min_periods)
+
+    errors = {}
+    for stat, values in expected.items():
+        values = values[window - 1:]
+        actual = {
+            stat: np.stack([matrix.copy() for _, matrix in engine.iter(stat)]),
+            f'{stat} pairs': np.stack([engine.pairs(symbol, stat) for symbol in engine.symbols], axis=-1)[:, window - 1:].transpose(1, 0, 2)
+        }
+        scale = np.nanmax(np.abs(values))
+        for name, result in actual.items():
+            if not np.array_equal(np.isnan(result), np.isnan(values)):
+                errors[name] = float('inf')
+                continue
+            errors[name] = float(np.nanmax(np.abs(result - values)) / (RTOL * scale))
+    return errors
+
+
+def disagreements(df: pd.DataFrame) -> list[str]:
+    return [
+        f'{name}: {error:.2f}x tolerance'
+        for name, error in indicator_errors(df).items() if error > 1
+    ]
+
+
+def streaming_errors(df: pd.DataFrame, primed: int = 100) -> dict[str, float]:
+    """
+    Error of bar-by-bar `update` against the batch result after priming each
+    indicator on the first `primed` bars, in units of the tolerance.
+    """
+    errors = {}
+    for indicator, frames in (
+        (SMA(), lambda ind: [ind.calculate_indicator_df(df, 9), ind.calculate_indicator_df(df, 4)]),
+        (BollingerBands(), lambda ind: [ind.calculate_indicator_df(df)]),
+        (DonchianChannels(), lambda ind: [ind.calculate_indicator_df(df)]),
+        (RSI(), lambda ind: [ind.calculate_indicator_df(df)]),
+        (RSI(name='RSI simple', smoothing='simple'), lambda ind: [ind.calculate_indicator_df(df)]),
+        (StochasticOscillator(), lambda ind: [ind.calculate_indicator_df(df)]),
+        (EMA(), lambda ind: [ind.calculate_indicator_df(df, 12), ind.calculate_indicator_df(df, 26)]),
+        (MACD(), lambda ind: [ind.calculate_indicator_df(df)]),
+        (ATR(), lambda ind: [ind.calculate_indicator_df(df)]),
+        (ADX(), lambda ind: [ind.calculate_indicator_df(df)])
+    ):
+        batch = {}
+        for frame in frames(indicator):
+            batch.update(frame)
+        indicator.create(df.iloc[:primed])
+        points = {}
+        for i in range(primed, len(df)):
+            for name, value in indicator.update(df.iloc[i]).items():
+                points.setdefault(name, []).append(value)
+        for name, values in points.items():
+            expected = np.asarray(batch[name])[primed:]
+            errors[name] = float(np.abs(np.asarray(values) - expected).max() / (ATOL + RTOL * np.abs(expected).max()))
+    return errors
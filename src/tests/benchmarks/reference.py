@@ -0,0 +1,114 @@
+"""
+Reference pandas implementations of the indicators, as they were written before
+the NumPy kernels (the exponential ones with pandas `ewm`), and of the rolling
+pair statistics. Only used to check the fast paths for numeric agreement.
+"""
+
+import numpy as np
+import pandas as pd
+from src.settings.consts import SHIFT_RSI_VAL, SHIFT_STOCHASTIC_VAL
+
+
+def sma(df: pd.DataFrame, period: int) -> pd.Series:
+    return df['close'].rolling(window=period).mean()
+
+
+def bollinger_bands(df: pd.DataFrame, period: int = 20, num_std_dev: int = 2) -> dict[str, pd.Series]:
+    mean = df['close'].rolling(window=period).mean()
+    std = df['close'].rolling(window=period).std()
+    return {
+        f'Upper Bollinger {period}': mean + num_std_dev * std,
+        f'Mean Bollinger {period}': mean,
+        f'Lower Bollinger {period}': mean - num_std_dev * std
+    }
+
+
+def donchian_channels(df: pd.DataFrame, period: int = 20) -> dict[str, pd.Series]:
+    upper = df['high'].rolling(window=period).max()
+    lower = df['low'].rolling(window=period).min()
+    return {
+        f'Upper Donchian {period}': upper,
+        f'Mean Donchian {period}': (upper + lower) / 2,
+        f'Lower Donchian {period}': lower
+    }
+
+
+def rsi(df: pd.DataFrame, period: int = 14) -> pd.Series:
+    delta = df['close'].diff()
+    gain = delta.where(delta > 0, 0).rolling(window=period).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+    return 100 - 100 / (1 + gain / loss) - SHIFT_RSI_VAL
+
+
+def _seeded_ewm(series: pd.Series, alpha: float, window: int) -> pd.Series:
+    # exponential mean started from the simple mean of the first `window` valid values
+    valid = series.dropna()
+    if len(valid) < window:
+        return pd.Series(float('nan'), index=series.index)
+    seeded = valid.iloc[window - 1:].copy()
+    seeded.iloc[0] = valid.iloc[:window].mean()
+    return seeded.ewm(alpha=alpha, adjust=False).mean().reindex(series.index)
+
+
+def ema(df: pd.DataFrame, period: int) -> pd.Series:
+    return _seeded_ewm(df['close'], 2 / (period + 1), period)
+
+
+def macd(df: pd.DataFrame, fast: int = 12, slow: int = 26, signal: int = 9) -> dict[str, pd.Series]:
+    line = ema(df, fast) - ema(df, slow)
+    signal_line = _seeded_ewm(line, 2 / (signal + 1), signal)
+    return {'MACD': line, 'MACD signal': signal_line, 'MACD histogram': line - signal_line}
+
+
+def wilder_rsi(df: pd.DataFrame, period: int = 14) -> pd.Series:
+    delta = df['close'].diff()
+    gain = _seeded_ewm(delta.clip(lower=0), 1 / period, period)
+    loss = _seeded_ewm(-delta.clip(upper=0), 1 / period, period)
+    return 100 - 100 / (1 + gain / loss) - SHIFT_RSI_VAL
+
+
+def _true_range(df: pd.DataFrame) -> pd.Series:
+    previous_close = df['close'].shift()
+    ranges = pd.concat([df['high'] - df['low'], (df['high'] - previous_close).abs(), (df['low'] - previous_close).abs()], axis=1)
+    return ranges.max(axis=1, skipna=False)
+
+
+def atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
+    return _seeded_ewm(_true_range(df), 1 / period, period)
+
+
+def adx(df: pd.DataFrame, period: int = 14) -> dict[str, pd.Series]:
+    up = df['high'].diff()
+    down = -df['low'].diff()
+    plus_dm = up.where((up > down) & (up > 0), 0.0).where(up.notna())
+    minus_dm = down.where((down > up) & (down > 0), 0.0).where(down.notna())
+    true_range = _seeded_ewm(_true_range(df), 1 / period, period)
+    plus_di = 100 * _seeded_ewm(plus_dm, 1 / period, period) / true_range
+    minus_di = 100 * _seeded_ewm(minus_dm, 1 / period, period) / true_range
+    dx = 100 * (plus_di - minus_di).abs() / (plus_di + minus_di)
+    return {'ADX': _seeded_ewm(dx, 1 / period, period), '+DI': plus_di, '-DI': minus_di}
+
+
+def stochastic_oscillator(df: pd.DataFrame, period: int = 14, smooth: int = 3) -> dict[str, pd.Series]:
+    lowest = df['low'].rolling(window=period).min()
+    highest = df['high'].rolling(window=period).max()
+    k = 100 * (df['close'] - lowest) / (highest - lowest)
+    d = k.rolling(window=smooth).mean()
+    return {'%K': k - SHIFT_STOCHASTIC_VAL, '%D': d - SHIFT_STOCHASTIC_VAL}
+
+
+def rolling_pair_statistics(returns: pd.DataFrame, window: int, min_periods: int) -> dict[str, np.ndarray]:
+    """
+    (bars, symbols, symbols) rolling correlation, covariance and beta of every
+    pair of columns, each pair over the bars both have; beta[t, i, j] is the
+    beta of column i to column j.
+    """
+    rolling = returns.rolling(window=window, min_periods=min_periods)
+    shape = (len(returns), returns.shape[1], returns.shape[1])
+    covariance = rolling.cov().to_numpy().reshape(shape)
+    beta = np.full(shape, np.nan)
+    for i, row in enumerate(returns.columns):
+        for j, column in enumerate(returns.columns):
+            variance = returns[column].where(returns[row].notna()).rolling(window=window, min_periods=min_periods).var()
+            beta[:, i, j] = covariance[:, i, j] / variance.to_numpy()
+    return {'correlation': rolling.corr().to_numpy().reshape(shape), 'covariance': covariance, 'beta': beta}
@@ -0,0 +1,278 @@
+"""
+Benchmark suite for the hot paths, on deterministic synthetic bars.
+
+    python -m src.tests.benchmarks.suite --sizes 1k,100k --save        # record a baseline
+    python -m src.tests.benchmarks.suite --sizes 1k,100k               # compare against it
+
+Every case reports its best and median wall time, throughput in bars/s and the
+peak traced allocation. A run fails (exit code 1) when a case is slower, or
+allocates more, than the baseline by more than `--threshold`, or when the fast
+indicator paths disagree with the pandas reference.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import tracemalloc
+from typing import Callable
+import numpy as np
+import pandas as pd
+from src.trading_funcs.data.providers import preprocess_stock_data
+from src.trading_funcs.data.store import BarStore
+from src.trading_funcs.data.bars import Bars
+from src.trading_funcs.data.live import ReplaySource
+from src.trading_funcs.data.panel import Panel
+from src.trading_funcs.indicators import SMA, BollingerBands, DonchianChannels, RSI, StochasticOscillator, EMA, MACD, ATR, ADX
+from src.trading_funcs.indicators.compute import allocate_lines, compute_indicators
+from src.trading_funcs.charting.decimation import Decimator
+from src.trading_funcs.charting.indicators import StockIndicators
+from src.trading_funcs.charting.live import LiveFeed
+from src.trading_funcs.screener import Screener
+from src.trading_funcs.portfolio import RollingCorrelation
+from src.tests.benchmarks.agreement import disagreements
+from src.tests.benchmarks.synthetic import SIZES, make_bars, make_yf_frame
+
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+POINT_BUDGET = 5000
+SCREEN_BARS = 252
+SCREEN_CONDITION = 'RSI < 30 and close < Lower Bollinger 20 and %K crosses above %D'
+CORRELATION_SYMBOLS = 2000
+CORRELATION_WINDOW = 60
+
+
+def measure(func: Callable[[], object], repeat: int = 3, memory: bool = True) -> dict[str, float]:
+    """
+    Time `func` `repeat` times with perf_counter_ns, then trace its peak allocation in one more call.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        func()
+        times.append(time.perf_counter_ns() - start)
+    result = {'seconds': min(times) / 1e9, 'median_seconds': float(np.median(times)) / 1e9}
+
+    if memory:
+        # instrumentation may already be tracing; its tracing is left running
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            func()
+            result['peak_mb'] = (tracemalloc.get_traced_memory()[1] - before) / 2 ** 20
+        finally:
+            if started:
+                tracemalloc.stop()
+    return result
+
+
+def js_payload(frame: pd.DataFrame) -> str:
+    # what StockChart serialises (off the UI thread) for a `set` call
+    from src.trading_funcs.charting.payload import SeriesPayload
+    return SeriesPayload(frame).json
+
+
+def plot_payload(df: pd.DataFrame) -> int:
+    """
+    The `plot` push: decimate bars and indicator lines to the point budget and serialise them.
+    """
+    decimator = Decimator(len(df), POINT_BUDGET)
+    lines = compute_indicators(df['high'].to_numpy(), df['low'].to_numpy(), df['close'].to_numpy())
+    size = len(js_payload(decimator.bars(df)))
+    size += len(js_payload(decimator.lines(pd.DataFrame({'time': df['time'], **lines}))))
+    return size
+
+
+def live_replay(bars: Bars) -> LiveFeed:
+    feed = LiveFeed(ReplaySource(bars, '1m', speed=0), StockIndicators(), '1m', frame_budget=1.0)
+    return feed.start(background=False)
+
+
+def screen_panel(df: pd.DataFrame, max_symbols: int | None = None) -> Panel:
+    """
+    The bars cut into a universe of one-year daily series, one symbol per row.
+    """
+    n_symbols = max(len(df) // SCREEN_BARS, 1)
+    if max_symbols is not None:
+        n_symbols = min(n_symbols, max_symbols)
+    n_bars = min(len(df), SCREEN_BARS)
+    columns = {col: df[col].to_numpy()[:n_symbols * n_bars].reshape(n_symbols, n_bars) for col in ('open', 'high', 'low', 'close', 'volume')}
+    time = df['time'].to_numpy().astype('datetime64[s]').astype(np.int64)[:n_bars]
+    return Panel([f'S{row}' for row in range(n_symbols)], time, columns)
+
+
+def correlation_scan(panel: Panel) -> int:
+    """
+    Weekly correlation matrices over the year, plus the top 10 peers and the
+    betas of one symbol at every bar.
+    """
+    engine = RollingCorrelation.from_panel(panel, CORRELATION_WINDOW)
+    out = np.empty((len(panel), len(panel)))
+    matrices = sum(1 for _ in engine.iter(step=5, out=out))
+    engine.peer_history(panel.symbols[0], k=10)
+    engine.pairs(panel.symbols[0], 'beta')
+    return matrices
+
+
+def selected(name: str, cases: list[str] | None) -> bool:
+    return not cases or any(case in name for case in cases)
+
+
+def build_cases(df: pd.DataFrame, workdir: str, cases: list[str] | None = None) -> dict[str, Callable[[], object]]:
+    """
+    Benchmark cases for one dataset, filtered by `cases`.
+    File-based inputs of the selected cases are written to `workdir` first (untimed).
+    """
+    store = BarStore(os.path.join(workdir, 'bars'))
+    if any(selected(name, cases) for name in ('load.binary', 'load.binary_close', 'load.bars_float32')):
+        store.write('SYN', '1m', df)
+    csv_path = os.path.join(workdir, 'SYN.csv')
+    if selected('load.csv', cases):
+        df.to_csv(csv_path)
+    yf_frame = make_yf_frame(df) if selected('preprocess_stock_data', cases) else None
+    lines = allocate_lines(len(df)) if selected('indicator.all_preallocated', cases) else None
+    bars = Bars.from_frame(df) if selected('live.replay', cases) else None
+    panel = screen_panel(df) if selected('screen.panel', cases) else None
+    universe = screen_panel(df, CORRELATION_SYMBOLS) if selected('portfolio.correlation', cases) else None
+
+    all_cases = {
+        'indicator.sma': lambda: SMA().calculate_indicator_df(df, 9),
+        'indicator.bollinger_bands': lambda: BollingerBands().calculate_indicator_df(df),
+        'indicator.donchian_channels': lambda: DonchianChannels().calculate_indicator_df(df),
+        'indicator.rsi': lambda: RSI().calculate_indicator_df(df),
+        'indicator.stochastic_oscillator': lambda: StochasticOscillator().calculate_indicator_df(df),
+        'indicator.ema': lambda: EMA().calculate_indicator_df(df, 12),
+        'indicator.macd': lambda: MACD().calculate_indicator_df(df),
+        'indicator.atr': lambda: ATR().calculate_indicator_df(df),
+        'indicator.adx': lambda: ADX().calculate_indicator_df(df),
+        'indicator.all_shared': lambda: compute_indicators(df['high'].to_numpy(), df['low'].to_numpy(), df['close'].to_numpy()),
+        'indicator.all_preallocated': lambda: compute_indicators(df['high'].to_numpy(), df['low'].to_numpy(), df['close'].to_numpy(), out=lines),
+        'preprocess_stock_data': lambda: preprocess_stock_data(yf_frame),
+        # the legacy CSV path of get_bar_data against the binary store it now reads
+        'load.csv': lambda: pd.read_csv(csv_path, index_col=0, parse_dates=['time']),
+        'load.binary': lambda: store.load_frame('SYN', '1m'),
+        'load.binary_close': lambda: store.load_frame('SYN', '1m', columns=['close']),
+        'load.bars_float32': lambda: store.load_bars('SYN', '1m', dtype='float32'),
+        'plot.payload': lambda: plot_payload(df),
+        # 4 ticks per bar through the aggregator, queue and headless streaming indicators
+        'live.replay': lambda: live_replay(bars),
+        # indicators and a three-clause condition over (symbols, 252 bars)
+        'screen.panel': lambda: Screener(panel).scan(SCREEN_CONDITION, rank_by='RSI'),
+        # rolling pair statistics over (up to 2,000 symbols, 252 bars)
+        'portfolio.correlation': lambda: correlation_scan(universe)
+    }
+    if len(df) > 1_000_000:
+        # the per-bar streaming path would take minutes on the largest set
+        all_cases.pop('live.replay')
+    return {name: func for name, func in all_cases.items() if selected(name, cases)}
+
+
+def run_suite(sizes: list[str], repeat: int = 3, memory: bool = True, cases: list[str] | None = None, agreement: bool = True) -> tuple[dict, list[str]]:
+    """
+    Run every case at every size.
+
+    :param cases: Only run cases whose name contains one of these strings.
+    :return: Results keyed by '{case}[{size}]', and any numeric disagreements.
+    """
+    results, failures = {}, []
+    for label in sizes:
+        n_bars = SIZES[label]
+        df = make_bars(n_bars, flat_every=5000)
+        # the pandas reference is itself slow and memory hungry on the largest set
+        if agreement and n_bars <= 1_000_000:
+            failures += [f'[{label}] {failure}' for failure in disagreements(df)]
+
+        with tempfile.TemporaryDirectory() as workdir:
+            for name, func in build_cases(df, workdir, cases).items():
+                result = measure(func, repeat=repeat, memory=memory)
+                result['bars'] = n_bars
+                result['bars_per_sec'] = n_bars / result['seconds'] if result['seconds'] else float('inf')
+                results[f'{name}[{label}]'] = result
+                print(f"{name}[{label}]: {result['seconds'] * 1e3:.2f} ms, {result['bars_per_sec']:.3g} bars/s, peak {result.get('peak_mb', float('nan')):.1f} MB", flush=True)
+    return results, failures
+
+
+def compare(results: dict, baseline: dict, threshold: float = 0.25, min_seconds: float = 0.005, min_mb: float = 1.0) -> list[str]:
+    """
+    Cases that regressed past `threshold` (0.25 = 25% slower or larger) against the baseline.
+    Cases faster than `min_seconds` or smaller than `min_mb` are too noisy to judge.
+    """
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        if base['seconds'] >= min_seconds and result['seconds'] > base['seconds'] * (1 + threshold):
+            regressions.append(f"{key}: {result['seconds'] * 1e3:.2f} ms vs {base['seconds'] * 1e3:.2f} ms baseline")
+        if base.get('peak_mb', 0) >= min_mb and result.get('peak_mb', 0) > base['peak_mb'] * (1 + threshold):
+            regressions.append(f"{key}: peak {result['peak_mb']:.1f} MB vs {base['peak_mb']:.1f} MB baseline")
+    return regressions
+
+
+def save_baseline(results: dict, path: str) -> None:
+    document = {
+        'created': pd.Timestamp.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'results': results
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2)
+
+
+def load_baseline(path: str) -> dict | None:
+    if not os.path.isfile(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)['results']
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the indicator, load and plot paths")
+    parser.add_argument('--sizes', default='1k,100k,10m', help=f"Comma separated dataset sizes from {list(SIZES)}")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--cases', help="Comma separated substrings; only matching cases run")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline JSON to compare against or save to")
+    parser.add_argument('--save', action='store_true', help="Save this run as the baseline instead of comparing")
+    parser.add_argument('--threshold', type=float, default=0.25, help="Allowed slowdown / growth before failing (0.25 = 25%%)")
+    parser.add_argument('--no-memory', action='store_true', help="Skip the tracemalloc pass")
+    parser.add_argument('--output', help="Also write this run's results as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    results, failures = run_suite(
+        sizes=args.sizes.split(','),
+        repeat=args.repeat,
+        memory=not args.no_memory,
+        cases=args.cases.split(',') if args.cases else None
+    )
+    if args.output:
+        save_baseline(results, args.output)
+
+    if args.save:
+        save_baseline(results, args.baseline)
+        print(f'Saved baseline to {args.baseline}')
+    else:
+        baseline = load_baseline(args.baseline)
+        if baseline is None:
+            print(f'No baseline at {args.baseline}; run with --save to record one')
+        else:
+            failures += compare(results, baseline, threshold=args.threshold)
+
+    for failure in failures:
+        print(f'FAIL {failure}')
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""
+Deterministic synthetic OHLCV data for benchmarks and agreement tests.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+SIZES = {'1k': 1_000, '100k': 100_000, '10m': 10_000_000}
+
+
+def make_bars(n_bars: int, seed: int = 0, freq: str = 'min', flat_every: int = 0) -> pd.DataFrame:
+    """
+    A geometric random walk with consistent OHLC relations.
+
+    :param flat_every: If set, every `flat_every` bars start a 30-bar stretch of
+        identical prices, to exercise the constant-window paths of the kernels.
+    """
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 1e-3, n_bars)))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    spread = np.abs(rng.normal(0, 5e-4, n_bars)) * close
+    high = np.maximum(open_, close) + spread
+    low = np.minimum(open_, close) - spread
+    volume = rng.integers(1_000, 100_000, n_bars).astype(np.float64)
+
+    if flat_every:
+        for start in range(flat_every, n_bars - 30, flat_every):
+            price = close[start]
+            open_[start:start + 30] = high[start:start + 30] = low[start:start + 30] = close[start:start + 30] = price
+
+    return pd.DataFrame({
+        'time': pd.date_range('2000-01-03', periods=n_bars, freq=freq),
+        'open': open_,
+        'high': high,
+        'low': low,
+        'close': close,
+        'volume': volume
+    })
+
+
+def make_yf_frame(bars: pd.DataFrame, symbol: str = 'SYN') -> pd.DataFrame:
+    """
+    The same bars shaped like a single-ticker `yf.download` result (Date index, (Price, Ticker) columns).
+    """
+    frame = bars.set_index('time').rename(columns=str.capitalize)
+    frame.index.name = 'Date'
+    frame.columns = pd.MultiIndex.from_product([frame.columns, [symbol]], names=['Price', 'Ticker'])
+    return frame
@@ -0,0 +1,36 @@
+import pytest
+from src.tests.benchmarks.agreement import correlation_errors, indicator_errors, streaming_errors
+from src.tests.benchmarks.suite import compare, run_suite
+from src.tests.benchmarks.synthetic import make_bars
+
+
+@pytest.mark.parametrize('n_bars', [1_000, 100_000])
+def test_indicators_agree_with_pandas_reference(n_bars):
+    errors = indicator_errors(make_bars(n_bars, flat_every=500))
+    assert all(error <= 1 for error in errors.values()), errors
+
+
+def test_streaming_updates_agree_with_batch():
+    errors = streaming_errors(make_bars(2_000, seed=1, flat_every=500))
+    assert all(error <= 1 for error in errors.values()), errors
+
+
+def test_rolling_correlation_agrees_with_pandas_reference():
+    errors = correlation_errors()
+    assert all(error <= 1 for error in errors.values()), errors
+
+
+def test_compare_flags_time_and_memory_regressions():
+    baseline = {'case[1k]': {'seconds': 0.010, 'peak_mb': 10.0}, 'tiny[1k]': {'seconds': 0.0001, 'peak_mb': 0.1}}
+    results = {'case[1k]': {'seconds': 0.020, 'peak_mb': 20.0}, 'tiny[1k]': {'seconds': 0.001, 'peak_mb': 1.0}}
+    regressions = compare(results, baseline, threshold=0.25)
+    assert len(regressions) == 2
+    assert all(regression.startswith('case[1k]') for regression in regressions)
+    assert compare(results, results, threshold=0.25) == []
+
+
+def test_suite_smoke():
+    results, failures = run_suite(['1k'], repeat=1, cases=['indicator.rsi', 'load.', 'plot.payload'])
+    assert failures == []
+    assert {'indicator.rsi[1k]', 'load.csv[1k]', 'load.binary[1k]', 'plot.payload[1k]'} <= set(results)
+    assert all(result['bars_per_sec'] > 0 and result['peak_mb'] >= 0 for result in results.values())
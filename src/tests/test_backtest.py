@@ -0,0 +1,66 @@
+import numpy as np
+from src.trading_funcs.backtest.engine import SUMMARIES, run_grid, simulate
+from src.trading_funcs.backtest.optimizer import ParameterOptimizer, SharedBars
+from src.tests.benchmarks.synthetic import make_bars
+
+
+PARAMS = [{'fast': fast, 'slow': slow} for fast in (3, 5, 8) for slow in (13, 21)]
+
+
+def universe(n_symbols: int = 3, n_bars: int = 300) -> dict[str, np.ndarray]:
+    frames = [make_bars(n_bars, seed=seed) for seed in range(n_symbols)]
+    return {col: np.stack([frame[col].to_numpy() for frame in frames]) for col in ('open', 'high', 'low', 'close')}
+
+
+def test_positions_fill_at_the_next_open_and_pay_fees():
+    open = np.array([10.0, 11.0, 12.0, 9.0, 10.0])
+    close = np.array([10.5, 11.5, 12.5, 9.5, 11.0])
+    # long decided on bar 1's close, flat again on bar 3's close
+    positions = np.array([0.0, 1.0, 1.0, 0.0, 0.0])
+
+    result = simulate(open, close, positions, fee=0.01)
+
+    np.testing.assert_array_equal(result['held'], [0, 0, 1, 1, 0])
+    # bar 2 earns open[2] -> open[3] after paying the entry fee, bar 3 open[3] -> open[4],
+    # bar 4 pays the exit fee; the last bar would be marked to its close
+    expected = np.array([0.0, 0.0, 9 / 12 - 1 - 0.01, 10 / 9 - 1, -0.01])
+    np.testing.assert_allclose(result['returns'], expected)
+    np.testing.assert_allclose(result['equity'], np.cumprod(1 + expected))
+    assert result['trades'] == 2
+    np.testing.assert_allclose(result['total_return'], np.prod(1 + expected) - 1)
+    # the lowest point is the losing bar 2, from the starting equity
+    np.testing.assert_allclose(result['max_drawdown'], expected[2])
+
+
+def test_a_position_held_into_the_last_bar_is_marked_to_its_close():
+    open = np.array([10.0, 10.0, 10.0])
+    close = np.array([10.0, 10.0, 12.0])
+    result = simulate(open, close, np.array([0.0, 1.0, 1.0]), fee=0.0)
+    np.testing.assert_allclose(result['returns'], [0.0, 0.0, 0.2])
+    np.testing.assert_allclose(result['total_return'], 0.2)
+
+
+def test_metrics_only_matches_the_full_grid():
+    bars = universe()
+    full = run_grid(bars, 'sma_crossover', PARAMS)
+    metrics = run_grid(bars, 'sma_crossover', PARAMS, metrics_only=True)
+    assert set(metrics) == set(SUMMARIES)
+    for name in SUMMARIES:
+        np.testing.assert_allclose(metrics[name], full[name], err_msg=name)
+
+
+def test_optimizer_ranks_from_shared_memory_only():
+    bars = universe()
+    expected = np.nanmean(run_grid(bars, 'sma_crossover', PARAMS)['sharpe'], axis=0)
+
+    with ParameterOptimizer(bars, 'sma_crossover', workers=2, chunk_size=2, top_k=3) as optimizer:
+        best = optimizer.optimize(PARAMS)
+        # only the published copy is kept, and reused by the next run
+        assert isinstance(optimizer.bars, SharedBars)
+        shared = optimizer.bars
+        assert optimizer.optimize(PARAMS) == best
+        assert optimizer.bars is shared
+
+    order = np.argsort(-expected, kind='stable')[:3]
+    np.testing.assert_allclose([score for score, _ in best], expected[order])
+    assert [params for _, params in best] == [PARAMS[i] for i in order]
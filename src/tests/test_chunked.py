@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.tests.benchmarks.synthetic import make_bars
+from src.trading_funcs.data.store import BarStore
+from src.trading_funcs.indicators.chunked import compute_chunked
+from src.trading_funcs.indicators.compute import INDICATOR_LINES, INDICATOR_LOOKBACK, compute_indicators
+
+
+N_BARS = 700
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = BarStore(str(tmp_path))
+    store.write('SYN', '1m', make_bars(N_BARS, seed=11, flat_every=200))
+    return store
+
+
+@pytest.mark.parametrize('block_rows', [1, 7, INDICATOR_LOOKBACK, 64, 333, N_BARS, 5000])
+def test_chunked_matches_in_memory(store, block_rows):
+    # blocks shorter than the halo draw on several earlier blocks
+    arrays = store.load('SYN', '1m', columns=['high', 'low', 'close'], mmap=False)
+    expected = compute_indicators(arrays['high'], arrays['low'], arrays['close'])
+
+    blocks = list(compute_chunked(store.iter_blocks('SYN', '1m', block_rows, columns=['high', 'low', 'close'])))
+    assert [block['time'].shape[0] for block in blocks[:-1]] == [block_rows] * (len(blocks) - 1)
+
+    np.testing.assert_array_equal(np.concatenate([block['time'] for block in blocks]), arrays['time'])
+    for name in INDICATOR_LINES:
+        chunked = np.concatenate([block[name] for block in blocks])
+        np.testing.assert_allclose(chunked, expected[name], rtol=1e-9, atol=1e-9, equal_nan=True, err_msg=name)
+
+
+def test_iter_blocks_covers_the_requested_range(store):
+    arrays = store.load('SYN', '1m', mmap=False)
+    start, end = arrays['time'][100], arrays['time'][450]
+    blocks = list(store.iter_blocks('SYN', '1m', 64, columns=['close'], start=pd.Timestamp(start, unit='s'), end=pd.Timestamp(end, unit='s')))
+
+    assert all(list(block) == ['time', 'close'] for block in blocks)
+    np.testing.assert_array_equal(np.concatenate([block['close'] for block in blocks]), arrays['close'][100:450])
+
+
+def test_partition_writer_round_trip(store, tmp_path):
+    lines = BarStore(str(tmp_path / 'lines'))
+    blocks = store.iter_blocks('SYN', '1m', 128, columns=['high', 'low', 'close'])
+    with lines.writer('SYN', '1m', source='chunked') as writer:
+        for block in compute_chunked(blocks, dtype='float32'):
+            writer.append(block)
+
+    meta = lines.meta('SYN', '1m')
+    assert meta['rows'] == N_BARS and meta['source'] == 'chunked'
+    assert meta['columns'] == ['time', *INDICATOR_LINES]
+
+    arrays = store.load('SYN', '1m', mmap=False)
+    expected = compute_indicators(arrays['high'], arrays['low'], arrays['close'])
+    loaded = lines.load('SYN', '1m')
+    assert loaded['RSI'].dtype == np.float32
+    np.testing.assert_array_equal(loaded['time'], arrays['time'])
+    for name in INDICATOR_LINES:
+        np.testing.assert_allclose(loaded[name], expected[name], rtol=1e-5, equal_nan=True, err_msg=name)
+
+    # reading the written partition back in blocks gives the same columns
+    read_back = list(lines.iter_blocks('SYN', '1m', 100))
+    assert len(read_back) == 7
+    for name in ('time', 'MACD'):
+        np.testing.assert_array_equal(np.concatenate([block[name] for block in read_back]), loaded[name])
+
+
+def test_partition_writer_rejects_out_of_order_blocks(store):
+    blocks = list(store.iter_blocks('SYN', '1m', 100))
+    with pytest.raises(ValueError, match='time order'):
+        with store.writer('SYN', '1m') as writer:
+            writer.append(blocks[1])
+            writer.append(blocks[0])
+    # the aborted writer leaves the stored partition as it was
+    assert store.meta('SYN', '1m')['rows'] == N_BARS
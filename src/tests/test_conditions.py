@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from src.trading_funcs.screener.conditions import Combined, Compare, Cross, parse_condition
+
+
+NAMES = ['RSI', '%K', '%D', 'close', 'Lower Bollinger 20']
+LINES = {
+    'RSI': np.array([[35.0, 25.0, 20.0, np.nan]]),
+    '%K': np.array([[10.0, 20.0, 30.0, 20.0]]),
+    '%D': np.array([[15.0, 20.0, 25.0, 25.0]]),
+    'close': np.array([[100.0, 98.0, 97.0, 99.0]]),
+    'Lower Bollinger 20': np.array([[99.0, 99.0, 99.0, 99.0]])
+}
+
+
+def test_and_binds_tighter_than_or():
+    condition = parse_condition('RSI < 30 or close < lower bollinger 20 AND %K crosses above %D', NAMES)
+    assert isinstance(condition, Combined) and condition.word == 'or'
+    assert repr(condition) == '(RSI < 30 or (close < Lower Bollinger 20 and %K crosses above %D))'
+    np.testing.assert_array_equal(condition.mask(LINES), [[False, True, True, False]])
+
+
+def test_word_operators_and_their_crossing_forms():
+    under = parse_condition('RSI under 30', NAMES)
+    assert isinstance(under, Compare) and repr(under) == 'RSI under 30'
+    # NaN (warm-up) never satisfies a comparison
+    np.testing.assert_array_equal(under.mask(LINES), [[False, True, True, False]])
+
+    for text in ('%K crossing %D', '%K crossing above %D', '%K crosses %D'):
+        condition = parse_condition(text, NAMES)
+        assert isinstance(condition, Cross) and condition.above
+        # touching on bar 1 and strictly above on bar 2
+        np.testing.assert_array_equal(condition.mask(LINES), [[False, False, True, False]])
+
+    below = parse_condition('%K crossing below %D', NAMES)
+    np.testing.assert_array_equal(below.mask(LINES), [[False, False, False, True]])
+    np.testing.assert_array_equal(parse_condition('close over 98.5', NAMES).mask(LINES), [[True, False, False, True]])
+    np.testing.assert_array_equal(parse_condition('RSI >= 25', NAMES).mask(LINES), [[True, True, False, False]])
+
+
+@pytest.mark.parametrize('text, message', [
+    ('', 'Cannot parse'),
+    ('RSI 30', 'Cannot parse'),
+    ('RSI < 30 and', 'Unknown line'),
+    ('MACD > 0', 'Unknown line'),
+    ('RSI < 30 or or close > 1', 'Unknown line "or close"')
+])
+def test_invalid_conditions_are_rejected(text, message):
+    with pytest.raises(ValueError, match=message):
+        parse_condition(text, NAMES)
@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+from src.trading_funcs.indicators.features import FeatureCache
+
+
+def test_cached_columns_are_read_only_views_of_the_source():
+    close = np.arange(10, dtype=np.float64)
+    high = close + 1
+    features = FeatureCache({'high': high}, close=close)
+
+    for name, source in (('close', close), ('high', high)):
+        cached = features.column(name)
+        with pytest.raises(ValueError):
+            cached[0] = -1.0
+        # the caller's array is not copied and stays writeable
+        assert np.shares_memory(cached, source)
+        assert source.flags.writeable
+
+
+def test_rolling_primitives_are_computed_once():
+    features = FeatureCache(close=np.arange(30, dtype=np.float64))
+    first = features.rolling('close', 'mean', 5)
+    assert features.rolling('close', 'mean', 5) is first
+    assert (features.hits, features.misses) == (1, 1)
+    assert not first.flags.writeable
+    np.testing.assert_allclose(first[4:], np.arange(2, 28))
@@ -0,0 +1,77 @@
+import asyncio
+import threading
+import time
+import pandas as pd
+from src.trading_funcs.data.fetcher import AsyncFetcher
+from src.trading_funcs.data.providers import DataProvider
+
+
+class ScriptedProvider(DataProvider):
+    """
+    A blocking provider whose calls take `delays[i]` seconds and raise while `failures` remain.
+    """
+
+    def __init__(self, batch_size: int = 10, delays: list[float] | None = None, failures: int = 0):
+        self.batch_size = batch_size
+        self.delays = delays or []
+        self.failures = failures
+        self.calls = []
+        self.finished = 0
+        self.running = self.max_running = 0
+        self._lock = threading.Lock()
+
+    def fetch(self, symbols, start_date, end_date, interval='1d'):
+        with self._lock:
+            call = len(self.calls)
+            self.calls.append(list(symbols))
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            time.sleep(self.delays[call] if call < len(self.delays) else 0.01)
+            if call < self.failures:
+                raise ConnectionError('provider down')
+            return {symbol: pd.DataFrame({'time': [pd.Timestamp('2024-01-02')], 'close': [1.0]}) for symbol in symbols}
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.finished += 1
+
+
+def test_concurrent_requests_share_calls_for_the_same_symbol():
+    provider = ScriptedProvider(delays=[0.05, 0.05])
+    fetcher = AsyncFetcher(provider)
+
+    async def main():
+        return await asyncio.gather(fetcher.fetch(['A', 'B'], '2024-01-01', '2024-02-01'), fetcher.fetch(['B', 'C', 'C'], '2024-01-01', '2024-02-01'))
+
+    first, second = asyncio.run(main())
+    assert set(first) == {'A', 'B'} and set(second) == {'B', 'C'}
+    assert first['B'] is second['B']
+    assert provider.calls == [['A', 'B'], ['C']]
+
+
+def test_failed_calls_are_retried_and_given_up_after_the_retries():
+    provider = ScriptedProvider(batch_size=1, failures=2)
+    fetcher = AsyncFetcher(provider, retries=2, backoff=0.001)
+    assert set(asyncio.run(fetcher.fetch(['A'], '2024-01-01', '2024-02-01'))) == {'A'}
+    assert len(provider.calls) == 3
+
+    provider = ScriptedProvider(batch_size=1, failures=10)
+    fetcher = AsyncFetcher(provider, retries=2, backoff=0.001)
+    assert asyncio.run(fetcher.fetch(['A'], '2024-01-01', '2024-02-01')) == {}
+    assert len(provider.calls) == 3
+
+
+def test_timed_out_calls_keep_their_thread_until_they_return():
+    provider = ScriptedProvider(batch_size=1, delays=[0.4])
+    fetcher = AsyncFetcher(provider, max_concurrency=4, max_threads=1, retries=1, backoff=0.001, timeout=0.1)
+
+    started = time.monotonic()
+    result = asyncio.run(fetcher.fetch(['A'], '2024-01-01', '2024-02-01'))
+    elapsed = time.monotonic() - started
+
+    assert set(result) == {'A'}
+    # the retry waited for the stalled call's thread instead of starting a second one
+    assert provider.max_running == 1 and provider.finished == 2
+    assert elapsed >= 0.4
+    fetcher.close(wait=True)
@@ -0,0 +1,24 @@
+import tracemalloc
+from src.utils.instrumentation import Instrumentation
+
+
+def test_disable_stops_only_the_tracing_it_started():
+    assert not tracemalloc.is_tracing()
+    registry = Instrumentation()
+    registry.enable(trace_memory=True)
+    assert tracemalloc.is_tracing()
+    registry.disable()
+    assert not tracemalloc.is_tracing()
+
+    # tracing someone else started survives enable/disable
+    tracemalloc.start()
+    try:
+        registry.enable(trace_memory=True)
+        with registry.span('alloc') as span:
+            block = bytearray(1 << 20)
+        assert span.alloc_bytes >= 1 << 20
+        registry.disable()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+    del block
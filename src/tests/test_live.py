@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.trading_funcs.data.bars import Bars
+from src.trading_funcs.data.live import BarAggregator, ReplaySource
+from src.trading_funcs.data.resample import resample_bars
+from src.tests.benchmarks.synthetic import make_bars
+
+
+def epoch(timestamp: str) -> int:
+    return int(pd.Timestamp(timestamp).timestamp())
+
+
+def test_ticks_close_bars_on_bucket_boundaries():
+    aggregator = BarAggregator('5m')
+    start = epoch('2024-03-04 14:00')
+
+    assert aggregator.add(start + 10, 100.0, 1) is None
+    assert aggregator.add(start + 299, 101.0, 2) is None
+    # the first second of the next bucket closes the bar
+    closed = aggregator.add(start + 300, 99.0, 3)
+    assert closed == {'time': start, 'open': 100.0, 'high': 101.0, 'low': 100.0, 'close': 101.0, 'volume': 3.0}
+    assert aggregator.open_bar['time'] == start + 300
+    # an empty bucket is skipped, not filled
+    closed = aggregator.add(start + 900, 98.0)
+    assert closed['time'] == start + 300 and aggregator.open_bar['time'] == start + 900
+    assert aggregator.flush()['close'] == 98.0 and aggregator.open_bar is None
+
+
+def test_weekly_buckets_start_on_monday():
+    aggregator = BarAggregator('1w')
+    aggregator.add(epoch('2024-03-06 12:00'), 1.0)
+    assert aggregator.open_bar['time'] == epoch('2024-03-04')
+    assert aggregator.add(epoch('2024-03-11 00:00'), 2.0)['time'] == epoch('2024-03-04')
+
+
+def test_late_ticks_are_counted_and_dropped():
+    aggregator = BarAggregator('1m')
+    start = epoch('2024-03-04 14:00')
+    aggregator.add(start + 65, 100.0, 1)
+    assert aggregator.add(start + 30, 50.0, 1) is None
+    closed = aggregator.add_many(np.array([start + 10, start + 70, start + 50, start + 130]), np.array([1.0, 101.0, 2.0, 102.0]), np.ones(4))
+    assert aggregator.late == 3 and aggregator.events == 6
+    assert closed == [{'time': start + 60, 'open': 100.0, 'high': 101.0, 'low': 100.0, 'close': 101.0, 'volume': 2.0}]
+
+
+@pytest.mark.parametrize('chunk', [1, 7, 4096])
+def test_chunked_ticks_match_the_resampled_bars(chunk):
+    bars = make_bars(600, seed=2, freq='min')
+    columns = {col: bars[col].to_numpy() for col in bars if col != 'time'}
+    columns['time'] = bars['time'].to_numpy().astype('datetime64[s]').astype(np.int64)
+    time, price, size = ReplaySource(Bars.from_arrays(columns), '1m', speed=0).ticks()
+
+    aggregator = BarAggregator('5m')
+    closed = []
+    for lo in range(0, time.shape[0], chunk):
+        closed += aggregator.add_many(time[lo:lo + chunk], price[lo:lo + chunk], size[lo:lo + chunk])
+    closed.append(aggregator.flush())
+
+    expected = resample_bars(columns, 300)
+    for col in ('time', 'open', 'high', 'low', 'close', 'volume'):
+        np.testing.assert_allclose([bar[col] for bar in closed], expected[col], err_msg=col)
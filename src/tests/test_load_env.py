@@ -0,0 +1,14 @@
+import pytest
+from src.settings.load_env import Environment
+
+
+@pytest.mark.parametrize('value, expected', [('', False), ('false', False), ('0', False), (' Off ', False), ('true', True), ('1', True), ('YES', True)])
+def test_turn_on_logging_is_parsed_as_a_boolean(monkeypatch, value, expected):
+    monkeypatch.setenv('TURN_ON_LOGGING', value)
+    assert Environment().TURN_ON_LOGGING is expected
+
+
+def test_invalid_boolean_is_rejected(monkeypatch):
+    monkeypatch.setenv('TURN_ON_LOGGING', 'maybe')
+    with pytest.raises(ValueError, match='TURN_ON_LOGGING'):
+        Environment()
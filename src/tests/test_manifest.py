@@ -0,0 +1,95 @@
+import pandas as pd
+import pytest
+from src.trading_funcs.charting.plotting import StockChart
+from src.trading_funcs.charting.report import ReportChart
+from src.trading_funcs.data.manifest import CacheManifest
+from src.trading_funcs.data.providers import DataProvider
+
+
+class FixedProvider(DataProvider):
+    """
+    Serves a fixed frame clipped to the requested range, or raises when told to.
+    """
+
+    def __init__(self, data: pd.DataFrame):
+        self.batch_size = 1
+        self.data = data
+        self.error = None
+
+    def fetch(self, symbols, start_date, end_date, interval='1d'):
+        if self.error is not None:
+            raise self.error
+        rows = self.data[(self.data['time'] >= start_date) & (self.data['time'] < end_date)]
+        return {symbol: rows.reset_index(drop=True) for symbol in symbols if not rows.empty}
+
+
+def weekday_bars(start: str, end: str) -> pd.DataFrame:
+    time = pd.bdate_range(start, end, inclusive='left')
+    close = pd.Series(range(len(time)), dtype=float) + 100
+    return pd.DataFrame({'time': time, 'open': close, 'high': close + 1, 'low': close - 1, 'close': close, 'volume': 1000.0})
+
+
+def test_missing_ranges_around_the_cached_range(tmp_path):
+    manifest = CacheManifest(str(tmp_path / 'manifest.sqlite'))
+    assert manifest.missing('AAPL', '1d', '2024-01-01', '2024-02-01') == [('2024-01-01', '2024-02-01')]
+
+    manifest.record('aapl', '1d', '2024-01-10', '2024-01-20', rows=7)
+    assert manifest.get('AAPL', '1d') == ('2024-01-10', '2024-01-20')
+    assert manifest.covers('AAPL', '1d', '2024-01-12', '2024-01-20')
+    assert manifest.missing('AAPL', '1d', '2024-01-01', '2024-01-15') == [('2024-01-01', '2024-01-10')]
+    assert manifest.missing('AAPL', '1d', '2024-01-15', '2024-02-01') == [('2024-01-20', '2024-02-01')]
+    assert manifest.missing('AAPL', '1d', '2024-01-01', '2024-02-01') == [('2024-01-01', '2024-01-10'), ('2024-01-20', '2024-02-01')]
+
+    # recording extends the range and survives a restart
+    manifest.record('AAPL', '1d', '2024-01-20', '2024-02-01', rows=15)
+    manifest.close()
+    manifest = CacheManifest(str(tmp_path / 'manifest.sqlite'))
+    assert manifest.get('AAPL', '1d') == ('2024-01-10', '2024-02-01')
+    assert manifest.missing('AAPL', '1d', '2024-01-01', '2024-02-01') == [('2024-01-01', '2024-01-10')]
+
+
+
+def test_record_keeps_a_disjoint_range_out_of_coverage(tmp_path):
+    manifest = CacheManifest(str(tmp_path / 'manifest.sqlite'))
+    manifest.record('AAPL', '1d', '2024-01-10', '2024-01-20', rows=7)
+
+    manifest.record('AAPL', '1d', '2024-02-01', '2024-02-10', rows=14)
+    manifest.record('AAPL', '1d', '2023-12-01', '2023-12-10', rows=20)
+    assert manifest.get('AAPL', '1d') == ('2024-01-10', '2024-01-20')
+    assert manifest.missing('AAPL', '1d', '2024-01-10', '2024-02-10') == [('2024-01-20', '2024-02-10')]
+
+    # overlapping and adjacent ranges still widen it
+    manifest.record('AAPL', '1d', '2024-01-15', '2024-01-25', rows=21)
+    manifest.record('AAPL', '1d', '2024-01-01', '2024-01-10', rows=27)
+    assert manifest.get('AAPL', '1d') == ('2024-01-01', '2024-01-25')
+
+
+@pytest.fixture
+def stock_chart(tmp_path):
+    provider = FixedProvider(weekday_bars('2024-01-01', '2024-03-01'))
+    return StockChart('AAPL', str(tmp_path), '2024-01-01', '2024-03-01', provider=provider, chart=ReportChart())
+
+
+def test_download_records_only_stored_bars(stock_chart):
+    # an empty first download and a failed one leave the range uncovered
+    stock_chart.download_bars('AAPL', '2023-01-01', '2023-02-01')
+    assert stock_chart.manifest.get('AAPL', '1d') is None
+    stock_chart.provider.error = ConnectionError('timed out')
+    with pytest.raises(ConnectionError):
+        stock_chart.download_bars('AAPL', '2024-01-01', '2024-02-01')
+    assert stock_chart.manifest.get('AAPL', '1d') is None
+
+    stock_chart.provider.error = None
+    stock_chart.download_bars('AAPL', '2024-01-01', '2024-02-01')
+    assert stock_chart.manifest.get('AAPL', '1d') == ('2024-01-01', '2024-02-01')
+    assert stock_chart.bar_store.meta('AAPL', '1d')['rows'] == 23
+
+
+def test_download_records_an_empty_gap_next_to_the_stored_bars(stock_chart):
+    stock_chart.download_bars('AAPL', '2024-01-08', '2024-01-13')
+    # a weekend right after the stored bars is recorded
+    stock_chart.download_bars('AAPL', '2024-01-13', '2024-01-15')
+    assert stock_chart.manifest.get('AAPL', '1d') == ('2024-01-08', '2024-01-15')
+    # an empty range that does not touch the stored bars is not
+    stock_chart.download_bars('AAPL', '2023-12-23', '2023-12-25')
+    assert stock_chart.manifest.get('AAPL', '1d') == ('2024-01-08', '2024-01-15')
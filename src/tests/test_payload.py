@@ -0,0 +1,105 @@
+import json
+import re
+import numpy as np
+import pandas as pd
+import pytest
+from lightweight_charts.widgets import StaticLWC
+from src.tests.benchmarks.synthetic import make_bars
+from src.trading_funcs.charting import payload as payload_module
+from src.trading_funcs.charting.payload import SeriesPayload, set_bars, set_line, volume_frame
+
+
+class ScriptChart(StaticLWC):
+    """
+    A chart that keeps the scripts it is sent.
+    """
+
+    scripts = None
+
+    def run_script(self, script, run_last=False):
+        if self.scripts is None:
+            self.scripts = []
+        self.scripts.append(script)
+
+
+def _set_data(chart: ScriptChart, target: str) -> list[dict]:
+    # the points of the last `<target>.setData(...)` script
+    for script in reversed(chart.scripts):
+        match = re.search(rf'{re.escape(target)}\.setData\((\[.*\])\)', script, re.DOTALL)
+        if match:
+            return json.loads(match.group(1))
+    raise AssertionError(f'No setData for {target}')
+
+
+def _assert_same_state(ours, theirs, data: str) -> None:
+    # the state lightweight_charts' `update` reads after `set`
+    pd.testing.assert_frame_equal(getattr(ours, data).reset_index(drop=True), getattr(theirs, data).reset_index(drop=True), check_dtype=False)
+    pd.testing.assert_series_equal(ours._last_bar, theirs._last_bar, check_dtype=False, check_names=False)
+    assert (ours._interval, ours.offset) == (theirs._interval, theirs.offset)
+
+
+def _bars(freq: str = '1h', offset: str = '30min') -> pd.DataFrame:
+    bars = make_bars(50, seed=3, freq=freq)
+    bars['time'] = pd.to_datetime(bars['time']).astype('datetime64[ns]') + pd.Timedelta(offset)
+    return bars
+
+
+def test_set_line_matches_line_set():
+    bars = _bars()
+    frame = pd.DataFrame({'time': bars['time'], 'SMA 9': bars['close'].rolling(9).mean()})
+    ours, theirs = ScriptChart(), ScriptChart()
+    line, expected = ours.create_line('SMA 9'), theirs.create_line('SMA 9')
+
+    set_line(line, SeriesPayload(frame, 'SMA 9'))
+    expected.set(frame)
+
+    _assert_same_state(line, expected, 'data')
+    assert line._interval == 3600 and line.offset == 1800
+    assert _set_data(ours, f'{line.id}.series') == _set_data(theirs, f'{expected.id}.series')
+
+    # the library's `update` carries on from the state `set_line` left
+    point = pd.Series({'time': bars['time'].iloc[-1] + pd.Timedelta('1h'), 'SMA 9': 123.5})
+    line.update(point)
+    expected.update(point)
+    _assert_same_state(line, expected, 'data')
+
+
+def test_set_bars_matches_chart_set():
+    bars = _bars('D', '0min')
+    ours, theirs = ScriptChart(), ScriptChart()
+    for chart in (ours, theirs):
+        chart.volume_config(up_color='#2962ffcb', down_color='#e91e63cb')
+
+    payload = SeriesPayload(bars)
+    set_bars(ours, payload, SeriesPayload(volume_frame(bars, '#2962ffcb', '#e91e63cb')))
+    theirs.set(bars)
+
+    _assert_same_state(ours, theirs, 'candle_data')
+    assert ours._interval == 86400 and ours.offset == 0
+    assert _set_data(ours, f'{ours.id}.series') == _set_data(theirs, f'{theirs.id}.series')
+    assert _set_data(ours, f'{ours.id}.volumeSeries') == _set_data(theirs, f'{theirs.id}.volumeSeries')
+
+    bar = bars.iloc[-1].copy()
+    bar['time'] += pd.Timedelta('1d')
+    ours.update(bar)
+    theirs.update(bar)
+    _assert_same_state(ours, theirs, 'candle_data')
+
+
+def test_state_is_only_written_for_the_pinned_library(monkeypatch):
+    payload = SeriesPayload(_bars())
+    with pytest.raises(RuntimeError, match='has no'):
+        set_bars(object(), payload)
+
+    monkeypatch.setattr(payload_module, '_library_version', lambda: '2.2')
+    with pytest.raises(RuntimeError, match='lightweight_charts 2.1, found 2.2'):
+        set_bars(ScriptChart(), payload)
+
+
+def test_payload_formats_date_column_and_index():
+    bars = _bars('D', '0min')
+    by_date = SeriesPayload(bars.rename(columns={'time': 'Date', 'close': 'Close'}))
+    by_index = SeriesPayload(bars.set_index('time'))
+    assert list(by_date.frame.columns) == list(bars.columns)
+    np.testing.assert_array_equal(by_date.frame['time'], bars['time'].astype('int64') // 10 ** 9)
+    np.testing.assert_array_equal(by_index.frame['time'], by_date.frame['time'])
@@ -0,0 +1,28 @@
+import pytest
+from lightweight_charts import abstract
+from src.tests.benchmarks.synthetic import make_bars
+from src.trading_funcs.charting import report
+from src.trading_funcs.charting.report import ReportChart
+
+
+def test_page_keeps_the_chart_scripts_and_compacts_set_data():
+    chart = ReportChart(inline_assets=False)
+    chart.set(make_bars(50, freq='D'))
+    page = chart.html(title='SYN 1d')
+
+    # the handler StaticLWC creates while building the chart comes after the decoder
+    assert page.index('function _points') < page.index(f'{chart.id} = new Lib.Handler')
+    assert f'{chart.id}.series.setData(_points(' in page
+    assert 'src="./bundle.js"' in page and '<title>SYN 1d</title>' in page
+
+
+def test_page_fails_on_unexpected_library_markup(tmp_path, monkeypatch):
+    index = tmp_path / 'index.html'
+    index.write_text('<html><body></body></html>', encoding='utf-8')
+    monkeypatch.setattr(abstract, 'INDEX', str(index))
+    report._page.cache_clear()
+    try:
+        with pytest.raises(RuntimeError, match='</body>'):
+            report._page(False)
+    finally:
+        report._page.cache_clear()
@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.trading_funcs.data.resample import Resampler, resample_bars
+from src.trading_funcs.data.store import BarStore
+from src.tests.benchmarks.synthetic import make_bars
+
+
+AGG = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+
+
+def bars_from(start: str, n_bars: int, seed: int) -> pd.DataFrame:
+    bars = make_bars(n_bars, seed=seed, freq='min')
+    bars['time'] = pd.date_range(start, periods=n_bars, freq='min')
+    return bars
+
+
+def minute_bars() -> pd.DataFrame:
+    # two weeks of minute bars with the nights, weekends and a few random minutes missing
+    bars = bars_from('2024-03-06', 14 * 1440, seed=11)
+    bars = bars[(bars['time'].dt.hour >= 13) & (bars['time'].dt.hour < 21) & (bars['time'].dt.dayofweek < 5)]
+    return bars.drop(bars.sample(frac=0.05, random_state=1).index).reset_index(drop=True)
+
+
+def reference(bars: pd.DataFrame, rule: str, origin='epoch') -> pd.DataFrame:
+    expected = bars.set_index('time').resample(rule, origin=origin, label='left', closed='left').agg(AGG)
+    return expected.dropna(subset=['open']).reset_index()
+
+
+@pytest.mark.parametrize('seconds, rule, origin', [
+    (300, '5min', 'epoch'),
+    (3600, '1h', 'epoch'),
+    (14400, '4h', 'epoch'),
+    (86400, '24h', 'epoch'),
+    (604800, '168h', pd.Timestamp('1970-01-05'))
+])
+def test_resample_matches_pandas(seconds, rule, origin):
+    bars = minute_bars()
+    columns = BarStore('').to_columns(bars)
+
+    result = BarStore.to_frame(resample_bars(columns, seconds))
+
+    pd.testing.assert_frame_equal(result, reference(bars, rule, origin)[list(result.columns)], check_dtype=False, check_freq=False)
+
+
+def test_resampler_serves_ranges_and_rebuilds_after_a_merge(tmp_path):
+    bars = minute_bars()
+    store = BarStore(str(tmp_path))
+    store.write('SYN', '1m', bars)
+    resampler = Resampler(store, '1m')
+
+    hourly = resampler.load('SYN', '1h', start='2024-03-07 14:30', end='2024-03-08')
+    # the bucket holding the start is kept whole
+    assert pd.Timestamp(hourly['time'][0], unit='s') == pd.Timestamp('2024-03-07 14:00')
+    assert pd.Timestamp(hourly['time'][-1], unit='s') == pd.Timestamp('2024-03-07 20:00')
+
+    before = resampler.load('SYN', '1d')['time'].shape[0]
+    extra = bars_from('2024-03-21 14:00', 60, seed=12)
+    store.merge('SYN', '1m', extra)
+    assert resampler.load('SYN', '1d')['time'].shape[0] == before + 1
+
+    with pytest.raises(ValueError):
+        Resampler(store, '1h').load('SYN', '5m')
+
+
+def test_resampler_rebuilds_after_the_last_bar_is_corrected(tmp_path):
+    bars = minute_bars()
+    store = BarStore(str(tmp_path))
+    store.write('SYN', '1m', bars)
+    resampler = Resampler(store, '1m')
+    before = resampler.load('SYN', '1d')
+
+    # same row count and last bar time, different close
+    corrected = bars.iloc[[-1]].copy()
+    corrected['close'] = 999.0
+    store.merge('SYN', '1m', corrected)
+    after = resampler.load('SYN', '1d')
+
+    assert after['time'].shape == before['time'].shape
+    assert before['close'][-1] != 999.0 and after['close'][-1] == 999.0
+
+
+def test_resampler_cache_evicts_least_recently_used(tmp_path):
+    store = BarStore(str(tmp_path))
+    store.write('SYN', '1m', minute_bars())
+    hourly = Resampler(store, '1m').load('SYN', '1h')
+    size = sum(values.nbytes for values in hourly.values())
+    resampler = Resampler(store, '1m', max_bytes=2 * size)
+
+    resampler.load('SYN', '1h')
+    resampler.load('SYN', '5m')
+    # the 5m bars alone are over the cap: only the most recent timeframe is kept
+    resampler.load('SYN', '1d')
+    assert list(resampler._cache) == [('SYN', '1d')]
+    assert resampler.nbytes <= resampler.max_bytes
+
+    resampler.invalidate('syn')
+    assert not resampler._cache and resampler.nbytes == 0
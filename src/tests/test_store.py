@@ -0,0 +1,78 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from src.trading_funcs.data.store import BarStore
+
+
+def make_frame(start: str, periods: int, offset: float = 0.0) -> pd.DataFrame:
+    close = np.arange(periods, dtype=float) + 100 + offset
+    return pd.DataFrame({
+        'time': pd.date_range(start, periods=periods, freq='D'),
+        'open': close - 0.5,
+        'high': close + 1,
+        'low': close - 1,
+        'close': close,
+        'volume': np.full(periods, 1000.0)
+    })
+
+
+def test_write_and_load_round_trip(tmp_path):
+    store = BarStore(str(tmp_path))
+    data = make_frame('2024-01-01', 10)
+    # rows out of order are sorted on write
+    store.write('aapl', '1d', data.iloc[::-1], source='test')
+
+    meta = store.meta('AAPL', '1d')
+    assert meta['rows'] == 10 and meta['source'] == 'test'
+    assert meta['columns'] == ['time', 'open', 'high', 'low', 'close', 'volume']
+
+    loaded = store.load_frame('AAPL', '1d')
+    pd.testing.assert_frame_equal(loaded, data, check_dtype=False)
+
+    arrays = store.load('AAPL', '1d', columns=['close'], start='2024-01-03', end='2024-01-06')
+    assert list(arrays) == ['time', 'close']
+    np.testing.assert_array_equal(arrays['close'], [102.0, 103.0, 104.0])
+    assert not arrays['close'].flags.writeable
+
+
+def test_write_swaps_the_partition_in_atomically(tmp_path, monkeypatch):
+    store = BarStore(str(tmp_path))
+    store.write('AAPL', '1d', make_frame('2024-01-01', 5))
+    partition = os.path.join(str(tmp_path), 'AAPL', '1d')
+
+    # a write that fails half way leaves the stored partition untouched
+    save = np.save
+    calls = []
+
+    def failing_save(file, values, *args, **kwargs):
+        calls.append(file)
+        if len(calls) == 3:
+            raise OSError('disk full')
+        save(file, values, *args, **kwargs)
+
+    monkeypatch.setattr(np, 'save', failing_save)
+    with pytest.raises(OSError):
+        store.write('AAPL', '1d', make_frame('2024-02-01', 8))
+    monkeypatch.setattr(np, 'save', save)
+
+    assert store.meta('AAPL', '1d')['rows'] == 5
+    np.testing.assert_array_equal(store.load('AAPL', '1d')['close'], np.arange(5) + 100.0)
+
+    # the next write replaces the partition and leaves no temporary directories behind
+    store.write('AAPL', '1d', make_frame('2024-02-01', 8))
+    assert store.meta('AAPL', '1d')['rows'] == 8
+    assert sorted(os.listdir(os.path.join(str(tmp_path), 'AAPL'))) == ['1d']
+    assert os.path.isfile(os.path.join(partition, 'meta.json'))
+
+
+def test_merge_replaces_overlapping_bars(tmp_path):
+    store = BarStore(str(tmp_path))
+    store.write('AAPL', '1d', make_frame('2024-01-01', 10))
+
+    rows = store.merge('AAPL', '1d', make_frame('2024-01-08', 5, offset=50))
+
+    assert rows == 12
+    close = store.load('AAPL', '1d')['close']
+    np.testing.assert_array_equal(close[:7], np.arange(7) + 100.0)
+    np.testing.assert_array_equal(close[7:], np.arange(5) + 150.0)
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from src.trading_funcs.indicators import compute, streaming
+from src.tests.benchmarks.synthetic import make_bars
+
+
+CASES = [
+    (streaming.SMAState(9), compute.sma, ('close',), {'period': 9}),
+    (streaming.BollingerBandsState(20), compute.bollinger_bands, ('close',), {'period': 20}),
+    (streaming.DonchianChannelsState(20), compute.donchian_channels, ('high', 'low'), {'period': 20}),
+    (streaming.RSIState(14, smoothing='simple'), compute.rsi, ('close',), {'period': 14, 'smoothing': 'simple'}),
+    (streaming.StochasticOscillatorState(14, 3), compute.stochastic_oscillator, ('high', 'low', 'close'), {'period': 14, 'smooth': 3}),
+    (streaming.RSIState(14), compute.rsi, ('close',), {'period': 14}),
+    (streaming.EMAState(12), compute.ema, ('close',), {'period': 12}),
+    (streaming.MACDState(12, 26, 9), compute.macd, ('close',), {'fast': 12, 'slow': 26, 'signal': 9}),
+    (streaming.ATRState(14), compute.atr, ('high', 'low', 'close'), {'period': 14}),
+    (streaming.ADXState(14), compute.adx, ('high', 'low', 'close'), {'period': 14})
+]
+
+
+def bars_with_gaps(n_bars: int = 600) -> dict[str, np.ndarray]:
+    """
+    Synthetic bars with NaN in the first bar, isolated NaN bars and a NaN stretch
+    longer than every window.
+    """
+    df = make_bars(n_bars, seed=3, flat_every=200)
+    columns = {col: df[col].to_numpy().copy() for col in ('high', 'low', 'close')}
+    for values in columns.values():
+        values[[0, 57, 58, 131, 400]] = np.nan
+        values[250:290] = np.nan
+    return columns
+
+
+@pytest.mark.parametrize('state, batch, inputs, params', CASES, ids=[type(case[0]).__name__ + ''.join(f'-{value}' for value in case[3].values()) for case in CASES])
+def test_streaming_matches_batch_with_nan_and_warmup(state, batch, inputs, params):
+    columns = bars_with_gaps()
+    expected = batch(*(columns[col] for col in inputs), **params)
+    points = [state.update(*(float(columns[col][i]) for col in inputs)) for i in range(len(columns['close']))]
+
+    for key, values in expected.items():
+        streamed = np.array([point[key] for point in points])
+        # warm-up and every window touched by a gap is NaN on both sides
+        np.testing.assert_array_equal(np.isnan(streamed), np.isnan(values), err_msg=key)
+        np.testing.assert_allclose(streamed, values, rtol=1e-9, atol=1e-9, equal_nan=True, err_msg=key)
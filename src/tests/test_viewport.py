@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.trading_funcs.charting.plotting import StockChart
+from src.trading_funcs.charting.report import ReportChart
+from src.tests.benchmarks.synthetic import make_bars
+
+
+N_BARS = 1200
+
+
+@pytest.fixture
+def stock_chart(tmp_path):
+    bars = make_bars(N_BARS, seed=5)
+    stock_chart = StockChart('SYN', str(tmp_path), '1990-01-01', '2100-01-01', save_flag=False, chart=ReportChart())
+    stock_chart.bar_store.write('SYN', '1d', bars)
+    stock_chart.manifest.record('SYN', '1d', '1990-01-01', '2100-01-01', N_BARS)
+    stock_chart.point_budget, stock_chart.initial_bars, stock_chart.chunk_bars, stock_chart.offscreen_bars = None, 300, 200, 500
+    stock_chart.show(stock_chart.prepare_symbol('SYN'))
+    return stock_chart
+
+
+def assert_same_drawing(dataset, expected):
+    pd.testing.assert_frame_equal(dataset.bars.frame, expected.bars.frame)
+    assert dataset.bars.json == expected.bars.json
+    assert dataset.lines.keys() == expected.lines.keys()
+    for key, payloads in expected.lines.items():
+        for name, payload in payloads.items():
+            np.testing.assert_array_equal(dataset.lines[key][name].frame['time'], payload.frame['time'])
+            np.testing.assert_allclose(dataset.lines[key][name].frame['value'], payload.frame['value'], rtol=1e-9, equal_nan=True, err_msg=name)
+
+
+def full_window(stock_chart):
+    data, skip = stock_chart.history.frame()
+    return stock_chart.prepare(data, skip=skip, history=stock_chart.history)
+
+
+def test_extending_prepares_only_the_new_chunk(stock_chart, monkeypatch):
+    prepared = []
+    prepare = stock_chart.prepare
+    monkeypatch.setattr(stock_chart, 'prepare', lambda data, **kwargs: prepared.append(len(data) - kwargs['skip']) or prepare(data, **kwargs))
+
+    stock_chart.on_range_change(stock_chart.chart, 10, 290)
+    stock_chart.on_range_change(stock_chart.chart, 10, 490)
+
+    assert prepared == [200, 200]
+    assert (stock_chart.history.lo, stock_chart.history.hi) == (N_BARS - 700, N_BARS)
+    assert stock_chart._dataset.pieces == [200, 200, 300]
+    # the chunks warmed up on their halo draw what the whole window would
+    assert_same_drawing(stock_chart._dataset, full_window(stock_chart))
+
+
+def test_far_bars_are_trimmed_and_loaded_again(stock_chart):
+    for bars_after in (290, 490, 690):
+        stock_chart.on_range_change(stock_chart.chart, 10, bars_after)
+    assert len(stock_chart.history) == 900
+
+    # 890 bars right of the screen: the 300 newest are dropped, a whole chunk at a time
+    stock_chart.on_range_change(stock_chart.chart, 100, 890)
+    assert (stock_chart.history.lo, stock_chart.history.hi) == (N_BARS - 900, N_BARS - 300)
+    assert stock_chart._dataset.pieces == [200, 200, 200]
+    assert_same_drawing(stock_chart._dataset, full_window(stock_chart))
+
+    # scrolled back to the right edge, the dropped bars come back a chunk at a time
+    stock_chart.on_range_change(stock_chart.chart, 500, 10)
+    stock_chart.on_range_change(stock_chart.chart, 700, 10)
+    assert stock_chart.history.at_end
+    assert stock_chart._dataset.pieces == [200, 200, 200, 200, 100]
+    assert_same_drawing(stock_chart._dataset, full_window(stock_chart))
+
+
+def test_decimated_points_are_converted_to_bars(stock_chart):
+    stock_chart.point_budget = 100
+    stock_chart.show(stock_chart.prepare_symbol('SYN'))
+    # 3 bars per point: 20 points before the screen are 60 bars, more than a quarter chunk
+    stock_chart.on_range_change(stock_chart.chart, 20, 70)
+    assert len(stock_chart.history) == 300
+    stock_chart.on_range_change(stock_chart.chart, 10, 80)
+    assert len(stock_chart.history) == 500
+    # the chunk gets 200 / 500 of the budget
+    assert stock_chart._dataset.decimator.n_points == 140
+
+
+def test_live_bars_load_the_trimmed_bars_back_first(stock_chart):
+    for bars_after in (290, 490, 690):
+        stock_chart.on_range_change(stock_chart.chart, 10, bars_after)
+    stock_chart.on_range_change(stock_chart.chart, 100, 890)
+    assert not stock_chart.history.at_end
+
+    last = stock_chart.bar_store.load_frame('SYN', '1d').iloc[-1]
+    stock_chart.update({**last.to_dict(), 'time': int(last['time'].timestamp()) + 86400})
+    assert stock_chart.history.at_end
+    assert sum(stock_chart._dataset.pieces) == 900
+
+
+def test_toggled_indicator_gets_the_warm_up_it_needs(stock_chart):
+    for key in [key for key in stock_chart.stock_indicators.active if key != 'sma']:
+        stock_chart.toggle_indicator(key)
+    stock_chart.show(stock_chart.prepare_symbol('SYN'))
+    assert stock_chart.history.warmup == 9
+
+    stock_chart.toggle_indicator('bollinger_50')
+
+    assert stock_chart.history.warmup == 50
+    assert stock_chart._dataset.skip == 50
+    # every drawn bar has a value, equal to a computation on the whole window
+    line = stock_chart._dataset.lines['bollinger_50']
+    expected = full_window(stock_chart).lines['bollinger_50']
+    for name, payload in expected.items():
+        assert payload.frame['value'].notna().all()
+        pd.testing.assert_frame_equal(line[name].frame, payload.frame)
@@ -0,0 +1,61 @@
+import os
+import shutil
+import numpy as np
+import pandas as pd
+from src.trading_funcs.data.providers import LocalFileProvider
+from src.trading_funcs.indicators.compute import compute_indicators
+from src.trading_funcs.pipeline.watchlist import WatchlistPipeline
+
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), 'data')
+
+
+def test_pipeline_writes_indicators_per_symbol_in_batches(tmp_path):
+    provider = LocalFileProvider(DATA_PATH, batch_size=2)
+    pipeline = WatchlistPipeline(provider, str(tmp_path), '2024-01-01', '2024-12-31', max_workers=1)
+
+    written = pipeline.run(['aapl', 'T', 'TSM', 'AAPL', ' ', 'MISSING'])
+
+    # duplicates and blanks are dropped, symbols without data are left out
+    assert set(written) == {'AAPL', 'T', 'TSM'}
+    for symbol, file_path in written.items():
+        assert file_path == os.path.join(str(tmp_path), f'{symbol}_1d_indicators.csv')
+        result = pd.read_csv(file_path)
+        bars = provider.fetch([symbol], '2024-01-01', '2024-12-31')[symbol]
+        expected = compute_indicators(bars['high'].to_numpy(), bars['low'].to_numpy(), bars['close'].to_numpy())
+        assert len(result) == len(bars)
+        for name, values in expected.items():
+            np.testing.assert_allclose(result[name].to_numpy(), values, equal_nan=True, err_msg=name)
+
+
+def test_pipeline_trims_to_the_requested_range(tmp_path):
+    pipeline = WatchlistPipeline(LocalFileProvider(DATA_PATH), str(tmp_path), '2024-07-01', '2024-07-15', max_workers=1)
+    result = pd.read_csv(pipeline.run(['AAPL'])['AAPL'])
+    time = pd.to_datetime(result['time'])
+    assert time.min() >= pd.Timestamp('2024-07-01') and time.max() < pd.Timestamp('2024-07-15')
+
+
+def test_pipeline_shuts_the_fetcher_threads_down(tmp_path):
+    pipeline = WatchlistPipeline(LocalFileProvider(DATA_PATH), str(tmp_path), '2024-07-01', '2024-07-15', max_workers=1)
+    pipeline.run(['AAPL'])
+    assert pipeline.fetcher._executor is None
+    # a second run starts a new pool
+    assert set(pipeline.run(['T'])) == {'T'}
+    assert pipeline.fetcher._executor is None
+
+
+def test_offline_provider_ignores_the_pipeline_output(tmp_path):
+    # --offline and --output pointing at the same directory; `AAPL_5d_indicators.csv` sorts after the snapshot
+    shutil.copy(os.path.join(DATA_PATH, 'AAPL_2024-07-26.csv'), tmp_path)
+    pipeline = WatchlistPipeline(LocalFileProvider(str(tmp_path)), str(tmp_path), '2024-01-01', '2024-12-31', interval='5d', max_workers=1)
+    first = pd.read_csv(pipeline.run(['AAPL'])['AAPL'])
+    second = pd.read_csv(pipeline.run(['AAPL'])['AAPL'])
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_offline_provider_reads_snapshots_without_an_index_column(tmp_path):
+    bars = pd.read_csv(os.path.join(DATA_PATH, 'T_2024-07-26.csv'), index_col=0)
+    bars.to_csv(tmp_path / 'T_2024-07-26.csv', index=False)
+    fetched = LocalFileProvider(str(tmp_path)).fetch(['T'], '2024-01-01', '2024-12-31')['T']
+    assert list(fetched.columns) == list(bars.columns)
+    assert len(fetched) == len(bars)
@@ -0,0 +1,20 @@
+from src.utils.lazy import lazy_exports
+
+# submodules are imported on first attribute access, not with the package
+_EXPORTS = {
+    'simulate': 'src.trading_funcs.backtest.engine',
+    'run_grid': 'src.trading_funcs.backtest.engine',
+    'STRATEGIES': 'src.trading_funcs.backtest.signals',
+    'SharedBars': 'src.trading_funcs.backtest.optimizer',
+    'ParameterOptimizer': 'src.trading_funcs.backtest.optimizer'
+}
+
+__all__ = [
+    'simulate',
+    'run_grid',
+    'STRATEGIES',
+    'SharedBars',
+    'ParameterOptimizer'
+]
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
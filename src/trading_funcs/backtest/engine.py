@@ -0,0 +1,107 @@
+"""
+Vectorised backtester.
+
+Positions decided on bar t's close are filled at bar t + 1's open, so bar t + 1
+earns the open-to-open return of the position held since then (the last bar is
+marked to its close). Fees are charged on every change of position, as a
+fraction of the traded notional. Everything is whole-array NumPy over a
+(symbols, parameter sets, bars) cube; there is no per-bar Python loop. When
+only the summaries are needed, `run_grid(metrics_only=True)` simulates one
+symbol at a time and reduces its per-bar arrays before the next.
+"""
+
+import numpy as np
+from src.trading_funcs.backtest.signals import STRATEGIES
+
+
+SUMMARIES = ('total_return', 'max_drawdown', 'sharpe', 'trades')
+
+
+def simulate(open: np.ndarray, close: np.ndarray, positions: np.ndarray, fee: float = 0.0005, periods_per_year: int = 252, metrics_only: bool = False) -> dict[str, np.ndarray]:
+    """
+    Simulate target positions against prices.
+
+    :param open: Open prices, shape (..., n_bars); broadcast against `positions`.
+    :param close: Close prices, same shape as `open`.
+    :param positions: Target positions decided on each close, shape (..., n_bars).
+    :param fee: Cost per unit of position traded.
+    :param periods_per_year: Bars per year, used to annualise the Sharpe ratio.
+    :param metrics_only: Return only the per-run summaries.
+    :return: Dict with per-bar `held`, `returns`, `equity`, `drawdown` and
+        per-run `total_return`, `max_drawdown`, `sharpe` and `trades`.
+    """
+    open = np.asarray(open, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    positions = np.asarray(positions, dtype=np.float64)
+
+    # open-to-open returns; the last bar is marked to its close
+    with np.errstate(divide='ignore', invalid='ignore'):
+        bar_returns = np.empty_like(open)
+        bar_returns[..., :-1] = open[..., 1:] / open[..., :-1] - 1
+        bar_returns[..., -1] = close[..., -1] / open[..., -1] - 1
+    # filled at the next open: bar t + 1 holds the target from bar t, earning open[t + 1] -> open[t + 2]
+    held = np.zeros(np.broadcast_shapes(positions.shape, open.shape))
+    held[..., 1:] = positions[..., :-1]
+    earned = np.zeros_like(held)
+    earned[..., 1:] = bar_returns[..., 1:]
+    earned = np.nan_to_num(earned, nan=0.0, posinf=0.0, neginf=0.0)
+
+    turnover = np.abs(np.diff(held, axis=-1, prepend=0.0))
+    returns = held * earned - fee * turnover
+    equity = np.cumprod(1 + returns, axis=-1)
+    peak = np.maximum.accumulate(equity, axis=-1)
+    drawdown = equity / peak - 1
+
+    std = returns.std(axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.where(std > 0, returns.mean(axis=-1) / std * np.sqrt(periods_per_year), 0.0)
+    summaries = {
+        'total_return': equity[..., -1] - 1,
+        'max_drawdown': drawdown.min(axis=-1),
+        'sharpe': sharpe,
+        'trades': np.count_nonzero(turnover, axis=-1)
+    }
+    if metrics_only:
+        return summaries
+    return {'held': held, 'returns': returns, 'equity': equity, 'drawdown': drawdown, **summaries}
+
+
+def run_grid(bars: dict[str, np.ndarray], strategy: str, params: list[dict], fee: float = 0.0005, periods_per_year: int = 252, metrics_only: bool = False) -> dict[str, np.ndarray]:
+    """
+    Backtest one strategy over a symbols x parameter-sets grid in a single call.
+
+    :param bars: Dict of 2-D (n_symbols, n_bars) arrays with at least `open`, `close`
+        and the strategy's input columns; pad shorter histories with leading NaN.
+    :param strategy: One of `STRATEGIES`: 'sma_crossover', 'rsi_bands' or 'donchian_breakout'.
+    :param params: Parameter dicts, e.g. [{'fast': 4, 'slow': 9}, {'fast': 5, 'slow': 20}].
+    :param metrics_only: Simulate one symbol at a time and return only the
+        (n_symbols, n_params) summaries, so memory stays at n_params x n_bars
+        per array instead of the whole cube.
+    :return: `simulate` output with a leading (n_symbols, n_params) shape.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy '{strategy}', expected one of {sorted(STRATEGIES)}.")
+    signal, columns = STRATEGIES[strategy]
+
+    if metrics_only:
+        # rows are converted one symbol at a time, so (shared, float32) inputs are not copied whole
+        open, close = np.atleast_2d(bars['open']), np.atleast_2d(bars['close'])
+        inputs = [np.atleast_2d(bars[col]) for col in columns]
+        per_symbol = [
+            simulate(
+                open[symbol], close[symbol],
+                signal(*(np.asarray(values[symbol], dtype=np.float64) for values in inputs), params),
+                fee=fee, periods_per_year=periods_per_year, metrics_only=True
+            )
+            for symbol in range(open.shape[0])
+        ]
+        return {name: np.stack([summaries[name] for summaries in per_symbol]) for name in SUMMARIES}
+
+    open = np.atleast_2d(np.asarray(bars['open'], dtype=np.float64))
+    close = np.atleast_2d(np.asarray(bars['close'], dtype=np.float64))
+    inputs = [np.atleast_2d(np.asarray(bars[col], dtype=np.float64)) for col in columns]
+    positions = np.stack([
+        signal(*(values[symbol] for values in inputs), params)
+        for symbol in range(open.shape[0])
+    ])
+    return simulate(open[:, None, :], close[:, None, :], positions, fee=fee, periods_per_year=periods_per_year)
@@ -0,0 +1,173 @@
+"""
+Parallel parameter optimiser over shared-memory OHLCV arrays.
+
+The parent publishes the bar arrays once into a `multiprocessing.shared_memory`
+block; every worker attaches to it at start-up and wraps it in NumPy views, so
+no bar data is pickled per task and peak memory stays near one copy of the
+data regardless of the worker count: the optimiser drops its reference to the
+source arrays once they are published, and workers reduce each chunk to its
+metrics symbol by symbol. Parameter sets are scheduled in chunks and the
+best-so-far ranking is streamed back as chunks complete.
+"""
+
+import heapq
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Iterator
+import numpy as np
+from src.trading_funcs.backtest.engine import run_grid
+
+
+class SharedBars:
+    """
+    A dict of equally typed arrays packed into one shared-memory block.
+    `descriptor` is small and picklable; `attach` rebuilds zero-copy views from it.
+    """
+
+    def __init__(self, arrays: dict[str, np.ndarray], dtype: str = 'float64'):
+        dtype = np.dtype(dtype)
+        layout, offset = {}, 0
+        for name, values in arrays.items():
+            values = np.asarray(values)
+            layout[name] = (offset, values.shape)
+            offset += values.size * dtype.itemsize
+
+        self.shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        self.descriptor = {'name': self.shm.name, 'dtype': dtype.str, 'layout': layout}
+        for name, view in self.views(self.shm, self.descriptor).items():
+            view[...] = arrays[name]
+
+    @staticmethod
+    def views(shm: shared_memory.SharedMemory, descriptor: dict) -> dict[str, np.ndarray]:
+        dtype = np.dtype(descriptor['dtype'])
+        return {
+            name: np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)
+            for name, (offset, shape) in descriptor['layout'].items()
+        }
+
+    @staticmethod
+    def attach(descriptor: dict) -> tuple[shared_memory.SharedMemory, dict[str, np.ndarray]]:
+        """
+        Attach to a published block from another process.
+        The caller must keep the returned SharedMemory alive while using the views.
+        """
+        # only the publishing process owns (and unlinks) the block; pool workers
+        # share its resource tracker, so attaching must not unregister it there
+        try:
+            shm = shared_memory.SharedMemory(name=descriptor['name'], track=False)
+        except TypeError:
+            shm = shared_memory.SharedMemory(name=descriptor['name'])
+        views = SharedBars.views(shm, descriptor)
+        for view in views.values():
+            view.flags.writeable = False
+        return shm, views
+
+    @property
+    def arrays(self) -> dict[str, np.ndarray]:
+        return self.views(self.shm, self.descriptor)
+
+    def close(self) -> None:
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self) -> 'SharedBars':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# per-worker state, set once by the pool initializer
+_worker_shm = None
+_worker_bars = None
+
+
+def _init_worker(descriptor: dict) -> None:
+    global _worker_shm, _worker_bars
+    _worker_shm, _worker_bars = SharedBars.attach(descriptor)
+
+
+def _evaluate_chunk(strategy: str, params: list[dict], metric: str, fee: float, periods_per_year: int) -> list[tuple[float, dict]]:
+    # per-bar arrays are reduced symbol by symbol, so a worker never holds a cube
+    result = run_grid(_worker_bars, strategy, params, fee=fee, periods_per_year=periods_per_year, metrics_only=True)
+    # rank a parameter set by its metric averaged over all symbols
+    scores = np.nanmean(result[metric], axis=0)
+    return [(float(score), param) for score, param in zip(scores, params)]
+
+
+class ParameterOptimizer:
+    """
+    Rank strategy parameter sets across a universe using a process pool.
+
+    :param bars: Dict of (n_symbols, n_bars) arrays (`open`, `high`, `low`, `close`, ...),
+        or an already published SharedBars, which is reused across runs and not unlinked.
+        A dict is published on the first run and only the shared copy is kept; it is
+        unlinked by `close` or when the optimiser is garbage collected.
+    :param strategy: Strategy name from `backtest.signals.STRATEGIES`.
+    :param metric: `simulate` summary to maximise ('sharpe', 'total_return', 'max_drawdown').
+    :param chunk_size: Parameter sets per task; bounds per-worker memory to
+        chunk_size x n_bars per per-bar array.
+    """
+
+    def __init__(self, bars: dict[str, np.ndarray] | SharedBars, strategy: str, metric: str = 'sharpe', fee: float = 0.0005, periods_per_year: int = 252, workers: int | None = None, chunk_size: int = 16, top_k: int = 10):
+        self.bars = bars
+        self.strategy = strategy
+        self.metric = metric
+        self.fee = fee
+        self.periods_per_year = periods_per_year
+        self.workers = workers or os.cpu_count()
+        self.chunk_size = chunk_size
+        self.top_k = top_k
+        self.best = []
+        self._release = None
+
+    def _shared(self) -> SharedBars:
+        if not isinstance(self.bars, SharedBars):
+            # the optimiser's reference to the source arrays goes once they are in shared memory
+            self.bars = SharedBars(self.bars)
+            self._release = weakref.finalize(self, self.bars.close)
+        return self.bars
+
+    def close(self) -> None:
+        """
+        Unlink the shared block published from a dict of arrays (a SharedBars passed in is left alone).
+        """
+        if self._release is not None:
+            self._release()
+
+    def __enter__(self) -> 'ParameterOptimizer':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def run(self, param_grid: list[dict]) -> Iterator[list[tuple[float, dict]]]:
+        """
+        Evaluate the grid and yield the best-so-far top-k list after each finished chunk.
+        """
+        chunks = [param_grid[i:i + self.chunk_size] for i in range(0, len(param_grid), self.chunk_size)]
+        ranked = []
+        shared = self._shared()
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(shared.descriptor,)) as pool:
+            futures = [
+                pool.submit(_evaluate_chunk, self.strategy, chunk, self.metric, self.fee, self.periods_per_year)
+                for chunk in chunks
+            ]
+            for future in as_completed(futures):
+                ranked = heapq.nlargest(
+                    self.top_k,
+                    ranked + [item for item in future.result() if not np.isnan(item[0])],
+                    key=lambda item: item[0]
+                )
+                self.best = ranked
+                yield ranked
+
+    def optimize(self, param_grid: list[dict]) -> list[tuple[float, dict]]:
+        """
+        Evaluate the whole grid and return the final top-k (score, params) list.
+        """
+        for _ in self.run(param_grid):
+            pass
+        return self.best
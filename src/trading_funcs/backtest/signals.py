@@ -0,0 +1,90 @@
+"""
+Turn indicator arrays into target-position arrays for the backtester.
+
+Every strategy takes one symbol's price arrays plus a list of parameter dicts and
+returns a (len(params), n_bars) float array of target positions (1 long, 0 flat),
+decided on each bar's close. Indicators for all parameter sets come from the
+multi-window kernels, so a grid costs one kernel pass per symbol.
+"""
+
+import numpy as np
+from src.trading_funcs.indicators.kernels import (
+    rolling_mean_multi,
+    rolling_max_multi,
+    rolling_min_multi,
+    rsi_multi
+)
+
+
+def hold(entries: np.ndarray, exits: np.ndarray) -> np.ndarray:
+    """
+    Position that switches on at entries and off at exits (exits win on the same bar),
+    forward-filled along the last axis without a Python loop.
+    """
+    events = np.where(exits, 0.0, np.where(entries, 1.0, np.nan))
+    n = events.shape[-1]
+    index = np.where(np.isnan(events), 0, np.arange(n))
+    np.maximum.accumulate(index, axis=-1, out=index)
+    position = np.take_along_axis(events, index, axis=-1)
+    return np.nan_to_num(position, nan=0.0)
+
+
+def _rows(values: np.ndarray, windows: list[int], wanted: list[int]) -> np.ndarray:
+    lookup = {window: row for row, window in enumerate(windows)}
+    return values[[lookup[window] for window in wanted]]
+
+
+def _previous(values: np.ndarray) -> np.ndarray:
+    shifted = np.full_like(values, np.nan)
+    shifted[..., 1:] = values[..., :-1]
+    return shifted
+
+
+def sma_crossover(close: np.ndarray, params: list[dict]) -> np.ndarray:
+    """
+    Long while the fast SMA is above the slow SMA, e.g. {'fast': 4, 'slow': 9}.
+    """
+    fast = [p['fast'] for p in params]
+    slow = [p['slow'] for p in params]
+    windows = sorted(set(fast) | set(slow))
+    means = rolling_mean_multi(close, windows)
+    with np.errstate(invalid='ignore'):
+        return (_rows(means, windows, fast) > _rows(means, windows, slow)).astype(np.float64)
+
+
+def rsi_bands(close: np.ndarray, params: list[dict]) -> np.ndarray:
+    """
+    Enter long when RSI leaves the lower band upwards, exit when it leaves the upper
+    band downwards, e.g. {'period': 14, 'lower': 30, 'upper': 70}.
+    """
+    periods = [p.get('period', 14) for p in params]
+    lower = np.array([p.get('lower', 30) for p in params], dtype=np.float64)[:, None]
+    upper = np.array([p.get('upper', 70) for p in params], dtype=np.float64)[:, None]
+    windows = sorted(set(periods))
+    rsi = _rows(rsi_multi(close, windows), windows, periods)
+    previous = _previous(rsi)
+    with np.errstate(invalid='ignore'):
+        entries = (previous < lower) & (rsi >= lower)
+        exits = (previous > upper) & (rsi <= upper)
+    return hold(entries, exits)
+
+
+def donchian_breakout(high: np.ndarray, low: np.ndarray, close: np.ndarray, params: list[dict]) -> np.ndarray:
+    """
+    Enter long when the close breaks above the previous bar's upper channel, exit
+    when it breaks below the previous lower channel, e.g. {'period': 20}.
+    """
+    periods = [p.get('period', 20) for p in params]
+    windows = sorted(set(periods))
+    upper = _previous(_rows(rolling_max_multi(high, windows), windows, periods))
+    lower = _previous(_rows(rolling_min_multi(low, windows), windows, periods))
+    close = np.asarray(close, dtype=np.float64)
+    with np.errstate(invalid='ignore'):
+        return hold(close > upper, close < lower)
+
+
+STRATEGIES = {
+    'sma_crossover': (sma_crossover, ('close',)),
+    'rsi_bands': (rsi_bands, ('close',)),
+    'donchian_breakout': (donchian_breakout, ('high', 'low', 'close'))
+}
@@ -1,5 +1,16 @@
-from src.trading_funcs.charting.plotting import StockChart
+from src.utils.lazy import lazy_exports
+
+# submodules are imported on first attribute access, not with the package
+_EXPORTS = {
+    'StockChart': 'src.trading_funcs.charting.plotting',
+    'LiveFeed': 'src.trading_funcs.charting.live',
+    'ReportChart': 'src.trading_funcs.charting.report'
+}
 
 __all__ = [
-    StockChart
-]
\ No newline at end of file
+    'StockChart',
+    'LiveFeed',
+    'ReportChart'
+]
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
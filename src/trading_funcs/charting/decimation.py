@@ -0,0 +1,161 @@
+"""
+Render-side decimation for long histories.
+
+Bars are aggregated into equal-count OHLC buckets and every indicator line keeps
+one point per bucket, chosen with Largest-Triangle-Three-Buckets (LTTB) so peaks
+and troughs survive. Lines share the bar buckets and are stamped with the bucket
+time, which keeps them aligned with the candles. Indicators are still computed
+on the full-resolution data; only what is sent to the browser is reduced.
+"""
+
+import numpy as np
+import pandas as pd
+from src.trading_funcs.data.resample import aggregate_bars
+from src.trading_funcs.data.store import PRICE_COLUMNS
+
+
+def bucket_edges(n_bars: int, budget: int) -> np.ndarray:
+    """
+    Edges of at most `budget` equal-count buckets: bucket b is [edges[b], edges[b + 1]).
+    """
+    n_buckets = max(1, min(budget, n_bars))
+    return np.unique(np.linspace(0, n_bars, n_buckets + 1).astype(np.int64))
+
+
+def ohlc_buckets(data: pd.DataFrame, edges: np.ndarray) -> pd.DataFrame:
+    """
+    Aggregate bars per bucket: first open/time, max high, min low, last close, summed volume.
+    """
+    columns = {col: data[col].to_numpy() for col in ('time', *PRICE_COLUMNS) if col in data}
+    return pd.DataFrame(aggregate_bars(columns, edges[:-1]))
+
+
+def lttb_indices(values: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets over fixed buckets, for several lines at once.
+
+    :param values: (n_lines, n_bars) array; NaN is treated as 0 when comparing areas.
+    :param edges: Bucket edges from `bucket_edges`.
+    :return: (n_lines, n_buckets) indices of the point kept from each bucket.
+    """
+    values = np.nan_to_num(np.atleast_2d(np.asarray(values, dtype=np.float64)))
+    n_lines, n_bars = values.shape
+    n_buckets = edges.shape[0] - 1
+    x = np.arange(n_bars, dtype=np.float64)
+
+    starts = edges[:-1]
+    counts = np.diff(edges)
+    # mean point of every bucket, used as the third vertex of the triangle
+    mean_x = np.add.reduceat(x, starts) / counts
+    mean_y = np.add.reduceat(values, starts, axis=1) / counts
+
+    selected = np.empty((n_lines, n_buckets), dtype=np.int64)
+    lines = np.arange(n_lines)
+    anchor = np.zeros(n_lines, dtype=np.int64)
+    for bucket in range(n_buckets):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        if bucket == 0 or bucket == n_buckets - 1 or hi - lo == 1:
+            # keep the first and last points exactly
+            pick = np.full(n_lines, lo if bucket == 0 else hi - 1, dtype=np.int64)
+        else:
+            ax, ay = x[anchor], values[lines, anchor]
+            cx, cy = mean_x[bucket + 1], mean_y[:, bucket + 1]
+            area = np.abs(
+                (ax[:, None] - cx) * (values[:, lo:hi] - ay[:, None])
+                - (ax[:, None] - x[lo:hi]) * (cy - ay)[:, None]
+            )
+            pick = lo + np.argmax(area, axis=1)
+        selected[:, bucket] = pick
+        anchor = pick
+    return selected
+
+
+class Decimator:
+    """
+    Reduce bars and indicator lines of one dataset to a point budget.
+    With no budget, or data within it, frames pass through unchanged.
+
+    :param skip: Leading warm-up rows that were only loaded to seed the indicators;
+        they are dropped from every frame before it is drawn.
+    :param edges: Explicit bucket edges over the visible rows (see `concat`)
+        instead of equal-count buckets within `budget`.
+    """
+
+    def __init__(self, n_bars: int, budget: int | None, skip: int = 0, edges: np.ndarray | None = None):
+        self.budget = budget
+        self.skip = skip
+        self.n_visible = n_bars - skip
+        if edges is None and budget and self.n_visible > budget:
+            edges = bucket_edges(self.n_visible, budget)
+        self.edges = edges
+
+    @property
+    def active(self) -> bool:
+        return self.edges is not None
+
+    @property
+    def n_points(self) -> int:
+        return self.n_visible if self.edges is None else self.edges.shape[0] - 1
+
+    def _bucket_edges(self) -> np.ndarray:
+        return np.arange(self.n_visible + 1) if self.edges is None else self.edges
+
+    def concat(self, other: 'Decimator') -> 'Decimator':
+        """
+        Decimator of these visible bars followed by `other`'s, each keeping its
+        own buckets, for datasets joined without being recomputed.
+        """
+        n_bars = self.skip + self.n_visible + other.n_visible
+        if not self.active and not other.active:
+            return Decimator(n_bars, None, self.skip)
+        edges = np.concatenate((self._bucket_edges()[:-1], other._bucket_edges() + self.n_visible))
+        return Decimator(n_bars, self.budget, self.skip, edges=edges)
+
+    def with_skip(self, skip: int) -> 'Decimator':
+        """
+        The same buckets over the same visible bars, behind `skip` warm-up rows.
+        """
+        if not self.active:
+            return Decimator(skip + self.n_visible, None, skip)
+        return Decimator(skip + self.n_visible, self.budget, skip, edges=self.edges)
+
+    def head(self, n_visible: int) -> 'Decimator':
+        """
+        Decimator of the first `n_visible` visible bars, which must end on a bucket edge.
+        """
+        if not self.active:
+            return Decimator(self.skip + n_visible, None, self.skip)
+        return Decimator(self.skip + n_visible, self.budget, self.skip, edges=self.edges[self.edges <= n_visible])
+
+    def raw_bars(self, points: float, from_end: bool = False) -> int:
+        """
+        Bars behind the first (or last) `points` drawn points, e.g. to compare
+        the chart's logical range, which counts buckets, with a bar count.
+        """
+        points = min(max(int(points), 0), self.n_points)
+        edges = self._bucket_edges()
+        return int(edges[-1] - edges[-1 - points]) if from_end else int(edges[points])
+
+    def _visible(self, data: pd.DataFrame) -> pd.DataFrame:
+        return data.iloc[self.skip:].reset_index(drop=True) if self.skip else data
+
+    def bars(self, data: pd.DataFrame) -> pd.DataFrame:
+        data = self._visible(data)
+        if not self.active:
+            return data
+        return ohlc_buckets(data, self.edges)
+
+    def lines(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Keep one LTTB point per bucket of every non-time column, stamped with the bucket time.
+        """
+        data = self._visible(data)
+        if not self.active:
+            return data
+        columns = [col for col in data.columns if col != 'time']
+        values = data[columns].to_numpy(dtype=np.float64).T
+        picks = lttb_indices(values, self.edges)
+        result = {'time': data['time'].to_numpy()[self.edges[:-1]]}
+        for row, col in enumerate(columns):
+            result[col] = values[row, picks[row]]
+        return pd.DataFrame(result)
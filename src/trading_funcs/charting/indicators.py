@@ -1,15 +1,68 @@
-from lightweight_charts import Chart
-from src.trading_funcs.indicators import SMA
-from src.trading_funcs.indicators import StochasticOscillator
-from src.trading_funcs.indicators import RSI
-from src.trading_funcs.indicators import DonchianChannels
-from src.trading_funcs.indicators import BollingerBands
+from typing import Optional, TYPE_CHECKING
+from src.trading_funcs.indicators.registry import IndicatorSpec, indicator_specs
+
+if TYPE_CHECKING:
+    from lightweight_charts import Chart
+    from src.trading_funcs.indicators.base import IndicatorBase
 
 
 class StockIndicators:
-    def __init__(self, chart: Chart):
-        self.sma = SMA(chart=chart)
-        self.stochastic_oscillator = StochasticOscillator(chart=chart)
-        self.rsi = RSI(chart=chart)
-        self.donchian_channels = DonchianChannels(chart=chart)
-        self.bollinger_bands = BollingerBands(chart=chart)
\ No newline at end of file
+    """
+    The configured indicators of a chart (the `indicators` section of the YAML).
+    Only enabled ones are constructed, so disabled indicators have no line
+    series and are never computed; `enable`/`disable` build or remove one later.
+
+    :param specs: Indicators to offer (default from the config).
+    """
+
+    def __init__(self, chart: Optional['Chart'] = None, specs: list[IndicatorSpec] | None = None):
+        self.chart = chart
+        self.specs = {spec.key: spec for spec in (indicator_specs() if specs is None else specs)}
+        self.active: dict[str, 'IndicatorBase'] = {}
+        for spec in self.specs.values():
+            if spec.enabled:
+                self.enable(spec.key)
+
+    @property
+    def all(self) -> list:
+        return list(self.active.values())
+
+    @property
+    def warmup(self) -> int:
+        return max((indicator.warmup for indicator in self.active.values()), default=0)
+
+    def __getitem__(self, key: str) -> 'IndicatorBase':
+        return self.active[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.active
+
+    def enable(self, key: str) -> 'IndicatorBase':
+        """
+        Construct a configured indicator (and its line series) if it is not active yet.
+        """
+        if key not in self.active:
+            self.active[key] = self.specs[key].build(chart=self.chart)
+        return self.active[key]
+
+    def disable(self, key: str) -> None:
+        """
+        Drop an indicator and delete its line series from the chart.
+        """
+        indicator = self.active.pop(key, None)
+        if indicator is not None:
+            indicator.remove()
+
+    def update(self, bar) -> None:
+        """
+        Commit one closed bar to every indicator.
+        """
+        for indicator in self.all:
+            indicator.update(bar)
+
+    def preview(self, bar) -> None:
+        """
+        Show the still-open bar on every indicator without committing it.
+        """
+        for indicator in self.all:
+            indicator.preview(bar)
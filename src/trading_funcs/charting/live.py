@@ -0,0 +1,151 @@
+"""
+Streaming mode: ticks from a live or replay source are aggregated into bars and
+pushed to the chart at a bounded frame rate.
+
+    feed = LiveFeed(ReplaySource.from_store(store, 'AAPL', '1m', speed=60), stock_chart, '1m')
+    feed.start()
+    stock_chart.chart.show(block=True)
+
+The source is read on its own thread into a bounded queue. Once per frame the
+queue is drained into a BarAggregator: closed bars are committed with
+`target.update` within a per-frame time budget, and the open bar is redrawn once
+with `target.preview`, so the chart gets at most `max_fps` frames per second
+however fast ticks arrive. When rendering falls behind, closed bars wait in a
+backlog, the queue fills and the source thread blocks, which slows a replay down
+(or lets a live socket buffer) instead of flooding the UI.
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+from typing import Iterable
+import numpy as np
+from src.trading_funcs.data.live import BarAggregator
+from src.utils.instrumentation import span
+from src.utils.logs import set_up_log
+
+
+logger = set_up_log(__name__)
+
+_END = object()
+
+
+class LiveFeed:
+    """
+    :param source: Iterable of `(time, price, size)` array chunks, e.g. a ReplaySource.
+    :param target: Receives `update(bar)` for closed bars and `preview(bar)` for the
+        open one; a StockChart, or a headless StockIndicators for load tests.
+    :param max_fps: Most frames (chart pushes of the open bar) per second.
+    :param frame_budget: Share of each frame spent committing closed bars; the rest
+        is left to the UI. Bars over budget wait for the next frame, and the source
+        is not read again until they are drawn. Use 1.0 headless.
+    :param queue_size: Chunks buffered between the source and the frame loop.
+    """
+
+    def __init__(self, source: Iterable, target, interval: str, max_fps: float = 30, frame_budget: float = 0.5, queue_size: int = 64):
+        self.source = source
+        self.target = target
+        self.aggregator = BarAggregator(interval)
+        self.frame_seconds = 1 / max_fps
+        self.frame_budget = frame_budget
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.backlog = deque()
+        self.finished = False
+        self._stop = threading.Event()
+        self._threads = []
+        self._events_drawn = 0
+        self.stats = {'frames': 0, 'bars': 0, 'events': 0, 'backpressure_seconds': 0.0, 'max_queue': 0}
+
+    def _produce(self) -> None:
+        try:
+            for chunk in self.source:
+                if not self._put(chunk):
+                    return
+        except Exception as e:
+            logger.error(f'Live source failed: {e}')
+        self._put(_END)
+
+    def _put(self, item) -> bool:
+        # blocks while the queue is full: this is the backpressure on the source
+        started = time.perf_counter()
+        while not self._stop.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+            self.stats['backpressure_seconds'] += time.perf_counter() - started
+            self.stats['max_queue'] = max(self.stats['max_queue'], self.queue.qsize())
+            return True
+        return False
+
+    def _drain(self) -> list[dict]:
+        # only what is queued now, so a fast source cannot keep one frame open forever
+        closed = []
+        for _ in range(self.queue.qsize()):
+            try:
+                chunk = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if chunk is _END:
+                self.finished = True
+                last = self.aggregator.flush()
+                if last is not None:
+                    closed.append(last)
+                break
+            time_, price, size = chunk
+            self.stats['events'] += np.shape(time_)[0]
+            closed += self.aggregator.add_many(time_, price, size)
+        return closed
+
+    def frame(self) -> None:
+        """
+        One frame: drain what has arrived, commit closed bars within the frame
+        budget, then redraw the open bar once the backlog is drawn.
+        """
+        started = time.perf_counter()
+        if not self.backlog:
+            self.backlog.extend(self._drain())
+        if not self.backlog and self.aggregator.events == self._events_drawn:
+            return
+        deadline = started + self.frame_seconds * self.frame_budget
+        with span('live.frame'):
+            while self.backlog:
+                self.target.update(self.backlog.popleft())
+                self.stats['bars'] += 1
+                if time.perf_counter() >= deadline:
+                    break
+            if not self.backlog and self.aggregator.open_bar is not None:
+                self.target.preview(dict(self.aggregator.open_bar))
+                self._events_drawn = self.aggregator.events
+        self.stats['frames'] += 1
+
+    def _consume(self) -> None:
+        next_frame = time.perf_counter()
+        while not self._stop.is_set():
+            self.frame()
+            if self.finished and not self.backlog:
+                return
+            next_frame = max(next_frame + self.frame_seconds, time.perf_counter())
+            time.sleep(max(next_frame - time.perf_counter(), 0.0))
+
+    def start(self, background: bool = True) -> 'LiveFeed':
+        """
+        Start reading the source; the frame loop runs on a second thread, or in
+        the calling thread until the source ends when `background` is False.
+        """
+        producer = threading.Thread(target=self._produce, name='live-source', daemon=True)
+        producer.start()
+        self._threads = [producer]
+        if not background:
+            self._consume()
+            return self
+        consumer = threading.Thread(target=self._consume, name='live-frames', daemon=True)
+        consumer.start()
+        self._threads.append(consumer)
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
@@ -0,0 +1,207 @@
+"""
+Chart pushes serialised ahead of time.
+
+`Line.set` and `Chart.set` format a frame (epoch-second times, bar interval)
+and serialise it with the library's indented, pure-Python `json.dumps` on the
+calling thread, which is most of the cost of drawing a symbol. A
+`SeriesPayload` does the same formatting and a compact serialisation up front,
+e.g. on the prefetch thread; `set_line` and `set_bars` then only run the script
+and record the state the library's `update` relies on.
+
+That state (`data`/`candle_data`, `_last_bar`, `_interval`, `offset`) is not
+public API. `restore_state` is the only place that writes it: it refuses to run
+against any lightweight_charts but the pinned `LIBRARY_VERSION`, or a series
+without those attributes, and tests/test_payload.py checks it against `set`.
+"""
+
+import json
+from functools import lru_cache
+from importlib import metadata
+import pandas as pd
+
+
+# the lightweight_charts release whose private series state `restore_state` writes (see lib/requirements.txt)
+LIBRARY_VERSION = '2.1'
+
+STATE_ATTRIBUTES = ('_last_bar', '_interval', 'offset')
+
+
+def records_json(frame: pd.DataFrame) -> str:
+    """
+    `lightweight_charts.util.js_data` without indentation: one object per row,
+    None/NaN fields dropped.
+    """
+    records = frame.to_dict(orient='records')
+    return json.dumps([{k: v for k, v in record.items() if v is not None and not pd.isna(v)} for record in records], separators=(',', ':'))
+
+
+def bar_interval(time: pd.Series) -> tuple[float, float]:
+    """
+    The interval and offset, in seconds, `update` snaps new bars to: the most
+    common spacing of `time`, and the first non-zero time-of-day unit shorter than it
+    (e.g. 3600 for hourly bars stamped at :30 is 1800).
+    """
+    spacing = time.diff().value_counts()
+    if spacing.empty:
+        return 1, 0
+    interval = spacing.index[0].total_seconds()
+    units = (
+        pd.Timedelta(microseconds=time.dt.microsecond.value_counts().index[0]),
+        pd.Timedelta(seconds=time.dt.second.value_counts().index[0]),
+        pd.Timedelta(minutes=time.dt.minute.value_counts().index[0]),
+        pd.Timedelta(hours=time.dt.hour.value_counts().index[0]),
+        pd.Timedelta(days=time.dt.day.value_counts().index[0]),
+    )
+    for unit in units:
+        unit = unit.total_seconds()
+        if unit:
+            return interval, unit if unit < interval else 0
+    return interval, 0
+
+
+def chart_frame(frame: pd.DataFrame, name: str | None = None) -> pd.DataFrame:
+    """
+    `frame` in the data format `set` sends: a `time` column of epoch seconds
+    (from `time`, `date` or the index) and lower-case columns, the line `name`
+    sent as `value`.
+    """
+    frame = frame.copy()
+    if 'time' not in frame.columns and 'date' not in frame.columns:
+        frame.columns = [col if col == name else str(col).lower() for col in frame.columns]
+    if 'date' in frame.columns:
+        frame = frame.rename(columns={'date': 'time'})
+    elif 'time' not in frame.columns:
+        frame['time'] = frame.index
+    frame['time'] = pd.to_datetime(frame['time'])
+    if name:
+        frame = frame[['time', name]].rename(columns={name: 'value'})
+    return frame
+
+
+class SeriesPayload:
+    """
+    A frame formatted the way `set` formats it, plus its serialised points.
+
+    Payloads of adjacent windows are joined with `concat` and cut back with
+    `head` without serialising again: the points are kept as one JSON body per
+    joined piece.
+
+    :param name: Line name: its column is sent as `value` and the frame's other
+        columns (the sibling lines of a shared indicator frame) are left out.
+    """
+
+    def __init__(self, frame: pd.DataFrame | None, name: str | None = None):
+        self.frame = None
+        self.interval, self.offset = 1, 0
+        # JSON bodies (the points without the brackets) and row counts of the joined pieces
+        self.bodies, self.rows = [''], [0]
+        if frame is None or frame.empty:
+            return
+        frame = chart_frame(frame, name)
+        self.interval, self.offset = bar_interval(frame['time'])
+        frame['time'] = frame['time'].astype('datetime64[ns]').astype('int64') // 10 ** 9
+        self.frame = frame
+        self.bodies, self.rows = [records_json(frame)[1:-1]], [len(frame)]
+
+    @property
+    def json(self) -> str:
+        return f"[{','.join(body for body in self.bodies if body)}]"
+
+    @property
+    def nbytes(self) -> int:
+        frame_bytes = 0 if self.frame is None else int(self.frame.memory_usage(index=True, deep=False).sum())
+        return frame_bytes + sum(len(body) for body in self.bodies)
+
+    @classmethod
+    def _joined(cls, frames: list[pd.DataFrame], bodies: list[str], rows: list[int], interval: float, offset: float) -> 'SeriesPayload':
+        payload = cls(None)
+        frames = [frame for frame in frames if frame is not None]
+        payload.frame = pd.concat(frames, ignore_index=True) if frames else None
+        payload.bodies, payload.rows = bodies, rows
+        payload.interval, payload.offset = interval, offset
+        return payload
+
+    def concat(self, other: 'SeriesPayload') -> 'SeriesPayload':
+        """
+        The points of this payload followed by those of `other`, which must start after it ends.
+        """
+        # the interval detected on the longer piece stands for both
+        longest = self if sum(self.rows) >= sum(other.rows) else other
+        return self._joined([self.frame, other.frame], self.bodies + other.bodies, self.rows + other.rows, longest.interval, longest.offset)
+
+    def head(self, pieces: int) -> 'SeriesPayload':
+        """
+        The points of the first `pieces` joined pieces.
+        """
+        n_rows = sum(self.rows[:pieces])
+        frame = None if self.frame is None or not n_rows else self.frame.iloc[:n_rows]
+        return self._joined([frame], self.bodies[:pieces], self.rows[:pieces], self.interval, self.offset)
+
+
+@lru_cache(maxsize=1)
+def _library_version() -> str:
+    return metadata.version('lightweight-charts')
+
+
+def restore_state(series, data_attribute: str, payload: 'SeriesPayload') -> None:
+    """
+    Record on a lightweight_charts series what its `set` would have, so its
+    `update` carries on from a payload pushed with `set_line` or `set_bars`.
+
+    :param data_attribute: `data` for a line, `candle_data` for the chart's candles.
+    :raises RuntimeError: For a lightweight_charts version other than `LIBRARY_VERSION`,
+        or a series without the expected state attributes.
+    """
+    version = _library_version()
+    if version != LIBRARY_VERSION:
+        raise RuntimeError(f'Chart payloads write the series state of lightweight_charts {LIBRARY_VERSION}, found {version}')
+    missing = [name for name in (data_attribute, *STATE_ATTRIBUTES) if not hasattr(series, name)]
+    if missing:
+        raise RuntimeError(f'{type(series).__name__} has no {missing}; chart payloads need lightweight_charts {LIBRARY_VERSION}')
+    # `update` appends to and overwrites the data in place, so the cached frame is copied
+    setattr(series, data_attribute, payload.frame.copy())
+    series._last_bar = payload.frame.iloc[-1]
+    series._interval, series.offset = payload.interval, payload.offset
+
+
+def set_line(line, payload: SeriesPayload) -> None:
+    """
+    `line.set(frame)` with the formatting and serialisation already done.
+    """
+    if payload.frame is None:
+        line.set(None)
+        return
+    restore_state(line, 'data', payload)
+    line.run_script(f'{line.id}.series.setData({payload.json}); ')
+
+
+def volume_frame(bars: pd.DataFrame, up_color: str, down_color: str) -> pd.DataFrame:
+    """
+    The volume histogram points `Chart.set` derives from the bars.
+    """
+    volume = bars[['time', 'volume']].rename(columns={'volume': 'value'})
+    volume['color'] = down_color
+    volume.loc[bars['close'] > bars['open'], 'color'] = up_color
+    return volume
+
+
+def set_bars(chart, bars: SeriesPayload, volume: SeriesPayload | None = None, keep_drawings: bool = False) -> None:
+    """
+    `chart.set(bars, keep_drawings)` with the candles and volume already formatted and serialised.
+    """
+    if bars.frame is None:
+        chart.set(None)
+        return
+    restore_state(chart, 'candle_data', bars)
+    chart.run_script(f'{chart.id}.series.setData({bars.json})')
+    if volume is not None:
+        chart.run_script(f'{chart.id}.volumeSeries.setData({volume.json})')
+    # set autoScale to true in case the user has dragged the price scale
+    chart.run_script(f'''
+            if (!{chart.id}.chart.priceScale("right").options.autoScale)
+                {chart.id}.chart.priceScale("right").applyOptions({{autoScale: true}})
+        ''')
+    if keep_drawings:
+        chart.run_script(f'{chart.id}.toolBox?._drawingTool.repositionOnTime()')
+    else:
+        chart.run_script(f"{chart.id}.toolBox?.clearDrawings()")
@@ -2,10 +2,26 @@ import os
 import pandas as pd
 import numpy as np
 from lightweight_charts import Chart
-import yfinance as yf
+from lightweight_charts.widgets import StaticLWC
 import datetime
 from dateutil.relativedelta import relativedelta
 from src.trading_funcs.charting.indicators import StockIndicators
+from src.trading_funcs.charting.decimation import Decimator
+from src.trading_funcs.charting.payload import SeriesPayload, set_bars, set_line, volume_frame
+from src.trading_funcs.charting.prefetch import DatasetCache, PreparedDataset, Prefetcher
+from src.trading_funcs.charting.viewport import HistoryWindow
+from src.trading_funcs.charting.live import LiveFeed
+from src.trading_funcs.data.providers import DataProvider, YahooProvider, preprocess_stock_data
+from src.trading_funcs.indicators.features import FeatureCache
+from src.trading_funcs.data.store import BarStore
+from src.trading_funcs.data.bars import Bars
+from src.trading_funcs.data.live import ReplaySource
+from src.trading_funcs.data.manifest import CacheManifest
+from src.trading_funcs.data.resample import Resampler, asof_join
+from src.trading_funcs.data.store import to_epoch_seconds
+from src.trading_funcs.indicators.compute import compute_indicators
+from src.settings.consts import load_config
+from src.utils.instrumentation import span, timed
 from src.utils.logs import set_up_log
 
 
@@ -13,68 +29,223 @@ logger = set_up_log(__name__)
 
 
 class StockChart():
-    def __init__(self, stock_code: str, stock_data_path: str, start_date: str, end_date: str, interval: str = '1d', save_flag: bool = True):
+    """
+    :param chart: Chart to draw on (default a webview `Chart`). A static chart such
+        as `ReportChart` gets the same bars, volume and indicator lines, but no
+        search box, timeframe switcher or callbacks, which need a live window.
+
+    Symbols and timeframes are shown from prepared datasets (bars, indicator
+    lines and overlay computed, decimated and serialised off the UI thread),
+    kept in an LRU of `render.dataset_cache_mb`; `prefetch` prepares symbols in
+    the background so that switching to them only pushes to the chart.
+    """
+
+    def __init__(self, stock_code: str, stock_data_path: str, start_date: str, end_date: str, interval: str = '1d', save_flag: bool = True, provider: DataProvider = None, chart=None):
         self.stock_code = stock_code
+        self.provider = provider or YahooProvider(batch_size=1)
         self.stock_data_path = stock_data_path
         self.start_date = start_date
         self.end_date = end_date
         self.interval = interval
         self.save_flag = save_flag
-        self.chart = Chart(toolbox=True)
+        render_config = load_config().get('render', {})
+        self.point_budget = render_config.get('point_budget')
+        self.initial_bars = render_config.get('initial_bars')
+        self.chunk_bars = render_config.get('chunk_bars')
+        self.offscreen_bars = render_config.get('offscreen_bars')
+        self.history = None
+        # last pushed dataset, so an indicator toggled on later is drawn on the same bars
+        self._dataset = None
+        self.datasets = DatasetCache(max_bytes=render_config.get('dataset_cache_mb', 256) * 2**20)
+        self.prefetcher = Prefetcher(self.prepare_symbol, self.datasets, max_workers=render_config.get('prefetch_workers', 1))
+        self.overlay_timeframe = render_config.get('overlay_timeframe')
+        self.bar_store = BarStore(os.path.join(stock_data_path, 'bars'))
+        self.manifest = CacheManifest(os.path.join(stock_data_path, 'bars', 'manifest.sqlite'))
+        # only `interval` bars are stored; the other timeframes are resampled from them
+        self.resampler = Resampler(self.bar_store, interval, max_bytes=render_config.get('resample_cache_mb', 64) * 2**20)
+        self.timeframe = interval
+        self.chart = chart if chart is not None else Chart(toolbox=True)
+        self.interactive = not isinstance(self.chart, StaticLWC)
         self._set_chart_styles()
         self.stock_indicators = StockIndicators(chart=self.chart)
+        if self.interactive:
+            self._add_indicator_toggles()
+        self.overlay_lines = {
+            name: self.chart.create_line(name=f'{name} {self.overlay_timeframe}', color=load_config().get('colour').get('overlay'), width=1, price_line=False, price_label=False)
+            for name in render_config.get('overlay_lines', [])
+        } if self.overlay_timeframe else {}
         
     def _set_chart_styles(self):
         self.chart.layout(background_color='#131722', font_family='Trebuchet MS', font_size=16)
-        self.chart.volume_config(up_color='#2962ffcb', down_color='#e91e63cb')
+        colours = load_config().get('colour')
+        # kept here too: prepared volume payloads are coloured off the UI thread
+        self.volume_colors = (colours.get('volume_up'), colours.get('volume_down'))
+        self.chart.volume_config(up_color=self.volume_colors[0], down_color=self.volume_colors[1])
         self.chart.name = self.stock_code
         self.chart.legend(visible=True, font_family='Trebuchet MS', ohlc=True, percent=True)
+        if not self.interactive:
+            return
         self.chart.events.search += self.on_search
+        self.chart.events.range_change += self.on_range_change
         self.chart.topbar.textbox('symbol', self.stock_code)
+        self.chart.topbar.switcher('timeframe', self.resampler.timeframes, default=self.timeframe, func=self.on_timeframe_selection)
         self.chart.horizontal_line(200, func=self.on_horizontal_line_move)
         
-    def contains_excel_file(self, path: str, filename: str) -> bool:
-        if not os.path.isdir(path):
-            logger.info("Invalid directory path.")
-            return False
+    def _add_indicator_toggles(self) -> None:
+        for key in self.stock_indicators.specs:
+            self.chart.topbar.button(f'indicator {key}', self._indicator_label(key), func=lambda chart, key=key: self.toggle_indicator(key))
 
-        for root, dirs, files in os.walk(path):
-            for file in files:
-                if filename.lower() == file.lower():
-                    return True
+    def _indicator_label(self, key: str) -> str:
+        label = self.stock_indicators.specs[key].label
+        return f'✓ {label}' if key in self.stock_indicators else label
 
-        logger.info("No Excel files found.")
-        return False
+    def toggle_indicator(self, key: str) -> None:
+        """
+        Switch a configured indicator on (built and drawn on the plotted bars,
+        with more warm-up bars loaded when it needs them) or off (its line series
+        removed from the chart).
+        """
+        if key in self.stock_indicators:
+            self.stock_indicators.disable(key)
+        else:
+            indicator = self.stock_indicators.enable(key)
+            if self._dataset is not None:
+                self._draw_indicator(key, indicator, self._dataset)
+        if self.interactive:
+            self.chart.topbar[f'indicator {key}'].set(self._indicator_label(key))
 
-    def download_yf_data(self, stock_code: str) -> pd.DataFrame:
+    @timed('fetch')
+    def download_bars(self, stock_code: str, start_date: str = None, end_date: str = None) -> pd.DataFrame:
         """
-        Download stock data from Yahoo Finance.
+        Download stock data from the chart's provider (Yahoo Finance by default).
         
         :param stock_code: Stock ticker symbol.
-        :param start_date: Start date for the data in 'YYYY-MM-DD' format.
-        :param end_date: End date for the data in 'YYYY-MM-DD' format.
-        :param interval: Data interval (default is '1d').
+        :param start_date: Start date for the data in 'YYYY-MM-DD' format (default: the chart's start date).
+        :param end_date: End date for the data in 'YYYY-MM-DD' format (default: the chart's end date).
         :return: DataFrame with stock data.
         """
 
-        data = yf.download([stock_code], start=self.start_date, end=self.end_date, interval=self.interval)
-        data = self.preprocess_stock_data(data)
+        start_date = start_date or self.start_date
+        end_date = end_date or self.end_date
+        data = self.provider.fetch([stock_code], start_date, end_date, self.interval).get(stock_code, pd.DataFrame())
         if self.save_flag:
-            logger.info(f"saving path: {self.stock_data_path}/{stock_code}_{self.end_date}.csv")
-            data.to_csv(f"{self.stock_data_path}/{stock_code}_{self.end_date}.csv")
+            if not data.empty:
+                logger.info(f"saving {stock_code} ({self.interval}) {start_date}..{end_date} to {self.bar_store.root}")
+                rows = self.bar_store.merge(stock_code, self.interval, data)
+                # the range is recorded only once its bars are in the store
+                self.manifest.record(stock_code, self.interval, start_date, end_date, rows)
+                # resampled timeframes and prepared datasets of the symbol no longer match the store
+                self.resampler.invalidate(stock_code)
+                self.datasets.discard(stock_code)
+            elif self._is_closed_gap(stock_code, start_date, end_date):
+                # a past range next to the stored bars without any bar is a weekend or
+                # holiday; recording it keeps it from being fetched again
+                self.manifest.record(stock_code, self.interval, start_date, end_date, self.bar_store.meta(stock_code, self.interval)['rows'])
         return data
 
+    def _is_closed_gap(self, stock_code: str, start_date: str, end_date: str) -> bool:
+        """
+        Whether an empty download of [start_date, end_date) can be trusted as a
+        no-trading gap: it borders the cached range of a symbol already in the
+        store and has ended, so its bars cannot still be on their way.
+        """
+        cached = self.manifest.get(stock_code, self.interval)
+        if cached is None or not self.bar_store.exists(stock_code, self.interval):
+            return False
+        adjacent = end_date == cached[0] or start_date == cached[1]
+        return adjacent and end_date <= datetime.date.today().isoformat()
+
+    def export_csv(self, stock_code: str) -> str:
+        """
+        Export the stored bars of a symbol to the legacy `{stock_code}_{end_date}.csv` snapshot.
+        """
+        file_path = f"{self.stock_data_path}/{stock_code}_{self.end_date}.csv"
+        self.bar_store.export_csv(stock_code, self.interval, file_path)
+        return file_path
+
+    def _import_legacy_csv(self, stock_code: str) -> None:
+        # exact path check instead of walking the data directory
+        file_path = f"{self.stock_data_path}/{stock_code}_{self.end_date}.csv"
+        if not os.path.isfile(file_path):
+            return
+        self.bar_store.import_csv(file_path, stock_code, self.interval)
+        meta = self.bar_store.meta(stock_code, self.interval)
+        first_date = pd.to_datetime(meta['start'], unit='s').strftime('%Y-%m-%d')
+        self.manifest.record(stock_code, self.interval, first_date, self.end_date, meta['rows'])
+
+    def _fill_cache(self, stock_code: str) -> bool:
+        """
+        Download the missing head/tail of the requested range into the bar store.
+
+        :return: True when the range can be served from the store.
+        """
+        if self.manifest.get(stock_code, self.interval) is None:
+            self._import_legacy_csv(stock_code)
+
+        gaps = self.manifest.missing(stock_code, self.interval, self.start_date, self.end_date)
+        if gaps and not self.save_flag:
+            return False
+
+        for gap_start, gap_end in gaps:
+            logger.info(f'Fetching "{stock_code}" {gap_start}..{gap_end} from {type(self.provider).__name__}')
+            self.download_bars(stock_code=stock_code, start_date=gap_start, end_date=gap_end)
+        return self.bar_store.exists(stock_code, self.interval)
+
     def get_bar_data(self, stock_code: str) -> pd.DataFrame:
         """    Get bar data for a given stock symbol.
+        Cached ranges are served from the bar store; only the missing head/tail
+        of the requested range is downloaded and merged in.
+
         :param symbol: Stock ticker symbol.
         :return: DataFrame with stock data or an empty DataFrame if no data is found
         """
 
-        if self.contains_excel_file(self.stock_data_path, f"{stock_code}_{self.end_date}.csv") is False:
-            logger.info(f'No data for "{stock_code}" download it from Yahoo Finance')
-            return self.download_yf_data(stock_code=stock_code)
-        logger.info(f'Get data for "{stock_code}" from {self.stock_data_path}')
-        return pd.read_csv(f'{self.stock_data_path}/{stock_code}_{self.end_date}.csv')
+        if not self._fill_cache(stock_code):
+            if self.save_flag:
+                return pd.DataFrame()
+            logger.info(f'No cached data for "{stock_code}" download it from {type(self.provider).__name__}')
+            return self.download_bars(stock_code=stock_code)
+
+        logger.info(f'Get data for "{stock_code}" from {self.bar_store.root}')
+        return self.bar_store.load_frame(stock_code, self.interval, start=self.start_date, end=self.end_date)
+
+    def get_history(self, stock_code: str, timeframe: str | None = None) -> HistoryWindow | None:
+        """
+        Open a lazily loaded window over the stored bars, starting with the most recent `initial_bars`.
+
+        :param stock_code: Stock ticker symbol.
+        :param timeframe: Bar timeframe (default the chart's current one).
+        :return: The window, or None when the bars cannot be served from the store.
+        """
+        if not self._fill_cache(stock_code):
+            return None
+        history = self._history_window(self.resampler.load(stock_code, timeframe or self.timeframe, start=self.start_date, end=self.end_date))
+        return history if len(history) else None
+
+    def _history_window(self, arrays: dict[str, np.ndarray]) -> HistoryWindow:
+        warmup = self.stock_indicators.warmup
+        return HistoryWindow(arrays, initial_bars=self.initial_bars, chunk_bars=self.chunk_bars, warmup=warmup)
+
+    def replay(self, speed: float, bars: int, max_fps: float = 30) -> LiveFeed | None:
+        """
+        Streaming mode on stored data: plot the history except its last `bars`
+        bars, then replay those as ticks at `speed` times real time through a
+        LiveFeed, which builds the open bar and updates it in place.
+        Scrolling back or switching timeframe re-plots from the store and drops
+        the replayed bars.
+
+        :return: The started feed, or None when the symbol cannot be served from the store.
+        """
+        if not self._fill_cache(self.stock_code):
+            return None
+        arrays = self.resampler.load(self.stock_code, self.timeframe, start=self.start_date, end=self.end_date)
+        split = max(arrays['time'].shape[0] - bars, 1)
+        history = self._history_window({col: values[:split] for col, values in arrays.items()})
+        # the truncated window is shown but not cached as the symbol's dataset
+        data, skip = history.frame()
+        self.show(self.prepare(data, skip=skip, history=history))
+        source = ReplaySource(Bars.from_arrays({col: values[split:] for col, values in arrays.items()}), self.timeframe, speed=speed)
+        return LiveFeed(source, self, self.timeframe, max_fps=max_fps).start()
 
     # twist the stock data for downstream processing
     def preprocess_stock_data(self, data: pd.DataFrame) -> pd.DataFrame:
@@ -84,65 +255,289 @@ class StockChart():
         :param data: DataFrame with stock data.
         :return: Preprocessed DataFrame.
         """
-        data = data.reset_index()
-        data.columns = data.columns.droplevel(1)
-        data.rename(columns={
-            'Date': 'time',
-            'Open': 'open',
-            'High': 'high',
-            'Low': 'low',
-            'Close': 'close',
-            'Volume': 'volume'
-        }, inplace=True)
-        return data
+        return preprocess_stock_data(data)
 
+    @timed('symbol_switch')
     def on_search(self, chart, searched_string):  # Called when the user searches.
-        self.stock_code = searched_string
-        new_data = self.get_bar_data(stock_code=searched_string)
-        if new_data.empty:
+        # a cached or prefetched symbol only needs the chart push
+        dataset = self.prefetcher.get(searched_string, self.timeframe)
+        if dataset is None:
             return
+        self.stock_code = searched_string
         chart.topbar['symbol'].set(searched_string)
-        chart.set(new_data, True)
-        # self.chart = Chart(toolbox=True)
-        self.plot(data=new_data)
+        self.show(dataset)
 
-    def on_timeframe_selection(self, chart):  # Called when the user changes the timeframe.
-        new_data = self.get_bar_data(stock_code=stock_code)
-        if new_data.empty:
+    def prefetch(self, symbols: list[str]) -> None:
+        """
+        Prepare symbols (e.g. the rest of the watchlist) in the current timeframe
+        on the background worker, so switching to them is only a chart push.
+        """
+        self.prefetcher.prefetch(symbols, self.timeframe)
+
+    def on_range_change(self, chart, bars_before: float, bars_after: float):
+        """
+        Prepend the next chunk of history once the left edge of the loaded bars
+        comes into view (or append bars trimmed on the right once the right edge
+        does), and drop chunks more than `render.offscreen_bars` right of the screen.
+        `bars_before` and `bars_after` count drawn points, i.e. buckets of a
+        decimated dataset, so they are converted to bars first.
+        """
+        dataset = self._dataset
+        if self.history is None or dataset is None or dataset.history is not self.history:
+            return
+        margin = self.history.chunk_bars // 4
+        before = dataset.decimator.raw_bars(bars_before)
+        after = dataset.decimator.raw_bars(bars_after, from_end=True)
+        with span('history_extend'):
+            if before <= margin and not self.history.exhausted:
+                self._extend_history(prepend=True)
+            elif after <= margin and not self.history.at_end:
+                self._extend_history(prepend=False)
+            elif self.offscreen_bars and after > self.offscreen_bars:
+                self._trim_history(after - self.offscreen_bars)
+
+    def _extend_history(self, prepend: bool = True) -> None:
+        """
+        Load the next chunk before (or after) the drawn window, prepare only that
+        chunk on its warm-up bars and join it to the drawn dataset.
+        """
+        history, dataset = self.history, self._dataset
+        lo, hi = history.lo, history.hi
+        added = history.extend() if prepend else history.extend_right()
+        if not added:
+            return
+        data, skip = history.frame(history.lo, lo) if prepend else history.frame(hi, history.hi)
+        # the chunk gets its share of the budget, as if the whole window was decimated at once
+        budget = -(-self.point_budget * added // len(history)) if self.point_budget else None
+        chunk = self.prepare(data, skip=skip, history=history, symbol=dataset.symbol, timeframe=dataset.timeframe, budget=budget)
+        joined = chunk.concat(dataset) if prepend else dataset.concat(chunk)
+        self.datasets.put(joined)
+        # prepended points move the bars on screen to the right, so the visible range follows them
+        self.push(joined, keep_drawings=True, shift=chunk.decimator.n_points if prepend else 0)
+
+    def _trim_history(self, bars: int) -> None:
+        """
+        Drop up to `bars` bars from the right of the drawn window, in whole joined
+        chunks, so nothing is prepared or serialised again.
+        """
+        dataset = self._dataset
+        kept, dropped = len(dataset.pieces), 0
+        while kept > 1 and dropped + dataset.pieces[kept - 1] <= bars:
+            kept -= 1
+            dropped += dataset.pieces[kept]
+        if not dropped:
             return
-        chart.set(new_data, True)
-        self.plot(data=new_data)
+        self.history.trim_right(dropped)
+        trimmed = dataset.head(kept)
+        self.datasets.put(trimmed)
+        self.push(trimmed, keep_drawings=True)
 
+    def _restore_live_edge(self) -> None:
+        # live bars continue the stored history, so bars trimmed off the right are loaded back first
+        while self.history is not None and not self.history.at_end and self._dataset is not None and self._dataset.history is self.history:
+            self._extend_history(prepend=False)
+
+    @timed('timeframe_switch')
     def on_timeframe_selection(self, chart):  # Called when the user changes the timeframe.
-        new_data = self.get_bar_data(stock_code=stock_code)
-        if new_data.empty:
+        self.timeframe = chart.topbar['timeframe'].value
+        # served from the dataset cache, or the bar store and the resampling cache, no download
+        dataset = self.prefetcher.get(self.stock_code, self.timeframe)
+        if dataset is None:
             return
-        chart.set(new_data, True)
+        self.show(dataset, keep_drawings=True)
 
     def on_horizontal_line_move(self, line):
         logger.info(f'Horizontal line moved to: {line.price}')
 
 
-    def plot(self, data: pd.DataFrame = None):
+    @property
+    def indicators(self) -> list:
+        return self.stock_indicators.all
+
+    def prepare_symbol(self, symbol: str, timeframe: str | None = None) -> PreparedDataset | None:
+        """
+        Load a symbol (downloading what the store misses) and prepare its dataset
+        without touching the chart. Runs on the prefetch worker, or on the UI
+        thread when a switch misses the cache.
+
+        :return: The dataset, or None when there are no bars.
+        """
+        timeframe = timeframe or self.timeframe
+        history = self.get_history(stock_code=symbol, timeframe=timeframe)
+        if history is not None:
+            data, skip = history.frame()
+        elif timeframe == self.interval:
+            data, skip = self.get_bar_data(stock_code=symbol), 0
+        else:
+            return None
+        if data.empty:
+            return None
+        return self.prepare(data, skip=skip, history=history, symbol=symbol, timeframe=timeframe)
+
+    def prepare(self, data: pd.DataFrame, skip: int = 0, history: HistoryWindow | None = None, symbol: str | None = None, timeframe: str | None = None, budget: int | None = None) -> PreparedDataset:
+        """
+        Compute what is drawn for the bars (every enabled indicator, the overlay
+        and the decimated bars) and serialise it for the chart, without touching the chart.
+
+        :param skip: Leading warm-up rows used for the indicators but not drawn.
+        :param budget: Point budget of the bars (default `render.point_budget`).
+        """
+        symbol = symbol or self.stock_code
+        timeframe = timeframe or self.timeframe
+        # one feature cache per dataset: shared rolling primitives are computed once
+        features = FeatureCache(data)
+        # indicators are computed on every bar; only what is drawn is decimated
+        decimator = Decimator(len(data), budget or self.point_budget, skip=skip)
+
+        # the UI thread may toggle indicators while a dataset is prepared in the background
+        lines = {key: self._prepare_indicator(indicator, data, features, decimator) for key, indicator in list(self.stock_indicators.active.items())}
+        with span('indicator.overlay'):
+            overlay = self._prepare_overlay(symbol, timeframe, data, decimator)
+        with span('chart.serialise'):
+            bars = decimator.bars(data)
+            volume = SeriesPayload(volume_frame(bars, *self.volume_colors)) if 'volume' in bars else None
+            return PreparedDataset(symbol, timeframe, data, skip, history, decimator, SeriesPayload(bars), volume, lines, overlay)
+
+    @staticmethod
+    def _prepare_indicator(indicator, data: pd.DataFrame, features: FeatureCache, decimator: Decimator) -> dict[str, SeriesPayload]:
+        with span(f'indicator.{type(indicator).__name__}'):
+            frames = indicator.prepare(data, features=features, decimator=decimator)
+        with span('chart.serialise'):
+            return {line_name: SeriesPayload(frame, line_name) for line_name, frame in frames.items()}
+
+    def push(self, dataset: PreparedDataset, keep_drawings: bool = False, shift: int = 0):
+        """
+        Draw a prepared dataset: the bars and every indicator line are pushed once.
+
+        :param shift: Points added in front of the drawn ones, by which the visible range is moved.
+        """
+        self._dataset = dataset
+        for key, indicator in self.stock_indicators.active.items():
+            self._draw_indicator(key, indicator, dataset)
+        with span('chart.push'):
+            for line_name, line in self.overlay_lines.items():
+                set_line(line, dataset.overlay.get(line_name, SeriesPayload(None)))
+            set_bars(self.chart, dataset.bars, dataset.volume, keep_drawings=keep_drawings)
+        # after bars were prepended, keep the same bars on screen
+        self._shift_visible_range(shift)
+        return self.chart
+
+    def show(self, dataset: PreparedDataset, keep_drawings: bool = False):
+        """
+        Make a prepared dataset (and its history window) the active one and draw it.
+        """
+        self.history = dataset.history
+        return self.push(dataset, keep_drawings=keep_drawings)
+
+    def _draw_indicator(self, key: str, indicator, dataset: PreparedDataset) -> None:
+        payloads = dataset.lines.get(key)
+        if payloads is None:
+            # enabled after the dataset was prepared, possibly on fewer warm-up bars than it needs
+            self._reload_warmup(dataset)
+            payloads = dataset.lines[key] = self._prepare_indicator(indicator, dataset.data, FeatureCache(dataset.data), dataset.decimator)
+        indicator.prime(dataset.data)
+        with span('chart.push'):
+            for line_name, line in indicator.lines.items():
+                set_line(line, payloads[line_name])
+
+    def _reload_warmup(self, dataset: PreparedDataset) -> None:
+        """
+        Raise the warm-up of a dataset's history window to what the enabled
+        indicators need, and reload its bars with that many warm-up rows in front.
+        The drawn bars, and so the payloads already prepared, stay the same.
+        """
+        history = dataset.history
+        warmup = self.stock_indicators.warmup
+        if history is None or history.warmup >= warmup:
+            return
+        history.warmup = warmup
+        data, skip = history.frame(history.lo, history.lo + sum(dataset.pieces))
+        dataset.data, dataset.skip, dataset.decimator = data, skip, dataset.decimator.with_skip(skip)
+
+    def plot(self, data: pd.DataFrame = None, skip: int = 0, keep_drawings: bool = False):
+        """
+        :param skip: Leading warm-up rows used for the indicators but not drawn.
+        """
         
         if data is None:
             logger.info(f'No data available for {self.stock_code}')
             return
+        return self.push(self.prepare(data, skip=skip), keep_drawings=keep_drawings)
+
+    def plot_history(self, history: HistoryWindow = None, keep_drawings: bool = False):
+        """
+        Plot the current window of a lazily loaded history (and make it the active one).
+        The dataset replaces the cached one of the symbol, e.g. after more history was loaded.
+        """
+        if history is not None:
+            self.history = history
+        data, skip = self.history.frame()
+        dataset = self.prepare(data, skip=skip, history=self.history)
+        self.datasets.put(dataset)
+        return self.push(dataset, keep_drawings=keep_drawings)
+
+    def _prepare_overlay(self, symbol: str, timeframe: str, data: pd.DataFrame, decimator: Decimator) -> dict[str, SeriesPayload]:
+        """
+        The configured higher-timeframe indicator lines for a lower-timeframe chart.
+        Each bar shows the value of the last higher-timeframe bar completed by its close.
+
+        :return: Payloads keyed by line name; none when the overlay does not apply (the lines are cleared).
+        """
+        if not self.overlay_lines:
+            return {}
+        overlay_seconds = self.resampler.seconds(self.overlay_timeframe)
+        seconds = self.resampler.seconds(timeframe)
+        if overlay_seconds <= seconds or not self.bar_store.exists(symbol, self.interval):
+            return {}
+
+        higher = self.resampler.load(symbol, self.overlay_timeframe)
+        values = compute_indicators(higher['high'], higher['low'], higher['close'])
+        close_time = to_epoch_seconds(data['time']) + seconds
+        higher_close_time = higher['time'] + overlay_seconds
+        overlay = pd.DataFrame({'time': data['time']})
+        for name, line in self.overlay_lines.items():
+            overlay[line.name] = asof_join(close_time, higher_close_time, values[name])
+        overlay = decimator.lines(overlay)
+        return {name: SeriesPayload(overlay[['time', line.name]].dropna(), line.name) for name, line in self.overlay_lines.items()}
+
+    def _shift_visible_range(self, bars: int) -> None:
+        if not bars:
+            return
+        time_scale = f'{self.chart.id}.chart.timeScale()'
+        self.chart.run_script(f'''
+            {{
+                let range = {time_scale}.getVisibleLogicalRange()
+                if (range) {time_scale}.setVisibleLogicalRange({{from: range.from + {bars}, to: range.to + {bars}}})
+            }}
+        ''')
+
+    @staticmethod
+    def _bar_series(bar: pd.Series | dict) -> pd.Series:
+        # live bars arrive as dicts with epoch-second times
+        if isinstance(bar, pd.Series):
+            return bar
+        return pd.Series({**bar, 'time': pd.to_datetime(bar['time'], unit='s')})
+
+    def update(self, bar: pd.Series | dict) -> None:
+        """
+        Append one new (closed) bar without re-plotting the history.
         
-        indicators = [
-            self.stock_indicators.sma,
-            self.stock_indicators.stochastic_oscillator,
-            self.stock_indicators.rsi,
-            self.stock_indicators.donchian_channels,
-            self.stock_indicators.bollinger_bands
-        ]
-
-        # using for loop to add all indicators
-        for indicator in indicators:
-            indicator.create(data=data)
-
-        self.chart.set(data)
-        return self.chart
+        :param bar: Series with time, open, high, low, close and volume.
+        """
+        self._restore_live_edge()
+        bar = self._bar_series(bar)
+        self.chart.update(bar)
+        self.stock_indicators.update(bar)
+
+    def preview(self, bar: pd.Series | dict) -> None:
+        """
+        Draw the still-open bar in place (same time as the last bar) and the
+        indicator points it would produce, without committing it to the indicators.
+        """
+        self._restore_live_edge()
+        bar = self._bar_series(bar)
+        self.chart.update(bar)
+        self.stock_indicators.preview(bar)
 
     
 # Example usage
@@ -170,6 +565,9 @@ if __name__ == "__main__":
         interval=interval,
         save_flag=save_flag
     )
-    data = stock_chart.get_bar_data(stock_code=stock_code)
-    chart_plot = stock_chart.plot(data=data)
+    history = stock_chart.get_history(stock_code=stock_code)
+    if history is None:
+        chart_plot = stock_chart.plot(data=stock_chart.get_bar_data(stock_code=stock_code))
+    else:
+        chart_plot = stock_chart.plot_history(history)
     chart_plot.show(block=True)  # This will open the chart in a web browser
\ No newline at end of file
@@ -0,0 +1,242 @@
+"""
+Prepared chart datasets for instant symbol switching.
+
+Preparing a symbol for the chart (filling the bar store, possibly with a
+download, loading or resampling the history window, computing every indicator,
+decimating and serialising bars and lines) is done by a background `Prefetcher`.
+Its results go into a `DatasetCache`, an LRU with a memory cap, so switching to
+a recently viewed or prefetched symbol only pushes the prepared payloads.
+
+    prefetcher = Prefetcher(stock_chart.prepare_symbol, DatasetCache(256 * 2**20))
+    prefetcher.prefetch(['MSFT', 'TSM'], '1d')    # returns at once
+    dataset = prefetcher.get('MSFT', '1d')         # cached, awaited or prepared now
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterable, TYPE_CHECKING
+import pandas as pd
+from src.trading_funcs.charting.payload import SeriesPayload
+from src.utils.logs import set_up_log
+
+if TYPE_CHECKING:
+    from src.trading_funcs.charting.decimation import Decimator
+    from src.trading_funcs.charting.viewport import HistoryWindow
+
+
+logger = set_up_log(__name__)
+
+
+class PreparedDataset:
+    """
+    Everything `StockChart.push` draws for one symbol and timeframe, formatted and serialised.
+
+    :param data: Bars the indicators were computed on (including warm-up rows).
+    :param skip: Leading warm-up rows of `data` that are not drawn.
+    :param history: The lazily loaded window `data` came from, or None for bars not served from the store.
+    :param bars: Decimated candles, and `volume` their volume histogram.
+    :param lines: Indicator line payloads, keyed by indicator key and then by line name.
+    :param overlay: Higher-timeframe overlay payloads keyed by line name.
+
+    Datasets of adjacent windows are joined with `concat` and cut back with
+    `head`; `pieces` holds the drawn bars of every joined piece.
+    """
+
+    def __init__(self, symbol: str, timeframe: str, data: pd.DataFrame, skip: int, history: 'HistoryWindow | None', decimator: 'Decimator', bars: SeriesPayload, volume: SeriesPayload | None, lines: dict[str, dict[str, SeriesPayload]], overlay: dict[str, SeriesPayload] | None = None):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.data = data
+        self.skip = skip
+        self.history = history
+        self.decimator = decimator
+        self.bars = bars
+        self.volume = volume
+        self.lines = lines
+        self.overlay = overlay or {}
+        self.pieces = [len(data) - skip]
+
+    @property
+    def key(self) -> tuple[str, str]:
+        return self.symbol, self.timeframe
+
+    def concat(self, other: 'PreparedDataset') -> 'PreparedDataset':
+        """
+        This dataset followed by `other`, prepared on the bars right after it,
+        without recomputing either. The warm-up rows of `other` overlap these
+        bars and are dropped; lines prepared on one side only are left out (they
+        are prepared on the joined data when drawn).
+        """
+        data = pd.concat([self.data, other.data.iloc[other.skip:]], ignore_index=True)
+        lines = {
+            key: {name: payload.concat(other.lines[key][name]) for name, payload in payloads.items()}
+            for key, payloads in self.lines.items() if key in other.lines and other.lines[key].keys() == payloads.keys()
+        }
+        overlay = {name: payload.concat(other.overlay[name]) for name, payload in self.overlay.items() if name in other.overlay}
+        volume = None if self.volume is None or other.volume is None else self.volume.concat(other.volume)
+        joined = PreparedDataset(
+            self.symbol, self.timeframe, data, self.skip, other.history or self.history, self.decimator.concat(other.decimator),
+            self.bars.concat(other.bars), volume, lines, overlay
+        )
+        joined.pieces = self.pieces + other.pieces
+        return joined
+
+    def head(self, pieces: int) -> 'PreparedDataset':
+        """
+        The dataset of the first `pieces` joined pieces.
+        """
+        n_bars = sum(self.pieces[:pieces])
+
+        def cut(payloads: dict[str, SeriesPayload]) -> dict[str, SeriesPayload] | None:
+            # payloads prepared after the join hold a single piece and cannot be cut
+            if any(len(payload.rows) != len(self.pieces) for payload in payloads.values()):
+                return None
+            return {name: payload.head(pieces) for name, payload in payloads.items()}
+
+        lines = {key: cut(payloads) for key, payloads in self.lines.items()}
+        dataset = PreparedDataset(
+            self.symbol, self.timeframe, self.data.iloc[:self.skip + n_bars], self.skip, self.history, self.decimator.head(n_bars),
+            self.bars.head(pieces), None if self.volume is None else self.volume.head(pieces),
+            {key: payloads for key, payloads in lines.items() if payloads is not None}, cut(self.overlay)
+        )
+        dataset.pieces = self.pieces[:pieces]
+        return dataset
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Approximate memory held by the dataset. The history's arrays are not
+        counted: they are views of the store or of the resampling cache.
+        """
+        payloads = [self.bars, self.volume, *self.overlay.values(), *(payload for payloads in self.lines.values() for payload in payloads.values())]
+        return int(self.data.memory_usage(index=True, deep=False).sum()) + sum(payload.nbytes for payload in payloads if payload is not None)
+
+
+class DatasetCache:
+    """
+    Least-recently-used prepared datasets keyed by (symbol, timeframe), evicted
+    once their total size exceeds `max_bytes`. The most recently stored dataset
+    is always kept, even when it alone is over the cap. Thread-safe.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        self._items: OrderedDict[tuple[str, str], tuple[PreparedDataset, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: tuple[str, str]) -> bool:
+        return key in self._items
+
+    def get(self, key: tuple[str, str]) -> PreparedDataset | None:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.stats['misses'] += 1
+                return None
+            self._items.move_to_end(key)
+            self.stats['hits'] += 1
+            return item[0]
+
+    def put(self, dataset: PreparedDataset) -> None:
+        size = dataset.nbytes
+        with self._lock:
+            previous = self._items.pop(dataset.key, None)
+            if previous is not None:
+                self.nbytes -= previous[1]
+            self._items[dataset.key] = (dataset, size)
+            self.nbytes += size
+            while self.nbytes > self.max_bytes and len(self._items) > 1:
+                key, (_, evicted) = self._items.popitem(last=False)
+                self.nbytes -= evicted
+                self.stats['evictions'] += 1
+                logger.debug(f'Evicted the prepared dataset of {key} ({evicted / 2**20:.1f} MB)')
+
+    def discard(self, symbol: str) -> None:
+        """
+        Drop every timeframe of a symbol, e.g. after new bars were merged into the store.
+        """
+        with self._lock:
+            for key in [key for key in self._items if key[0] == symbol]:
+                self.nbytes -= self._items.pop(key)[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.nbytes = 0
+
+
+class Prefetcher:
+    """
+    Prepares datasets on background threads into a DatasetCache.
+
+    :param prepare: Builds the dataset of (symbol, timeframe), or returns None when
+        there are no bars. It must not touch the chart, which belongs to the UI thread.
+    :param max_workers: Preparing threads. Most of the work is NumPy/pandas or
+        network I/O, which release the GIL, but one worker already keeps the UI responsive.
+    """
+
+    def __init__(self, prepare: Callable[[str, str], PreparedDataset | None], cache: DatasetCache, max_workers: int = 1):
+        self.prepare = prepare
+        self.cache = cache
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='prefetch')
+        self._pending: dict[tuple[str, str], Future] = {}
+        self._lock = threading.Lock()
+
+    def prefetch(self, symbols: Iterable[str], timeframe: str) -> list[Future]:
+        """
+        Queue the symbols that are neither cached nor already queued; returns at once.
+        """
+        futures = []
+        with self._lock:
+            for symbol in dict.fromkeys(symbols):
+                key = (symbol, timeframe)
+                if key in self.cache or key in self._pending:
+                    continue
+                future = self._pending[key] = self._pool.submit(self._run, key)
+                futures.append(future)
+        return futures
+
+    def _run(self, key: tuple[str, str]) -> PreparedDataset | None:
+        try:
+            dataset = self.prepare(*key)
+            if dataset is not None:
+                self.cache.put(dataset)
+            return dataset
+        except Exception as e:
+            logger.error(f'Preparing {key} failed: {e}')
+            return None
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def get(self, symbol: str, timeframe: str) -> PreparedDataset | None:
+        """
+        The prepared dataset of a symbol: from the cache, from its running
+        background job, or prepared on the calling thread (a queued job that has
+        not started is cancelled rather than waited for behind the others).
+        """
+        key = (symbol, timeframe)
+        dataset = self.cache.get(key)
+        if dataset is not None:
+            return dataset
+        with self._lock:
+            future = self._pending.get(key)
+            if future is not None and future.cancel():
+                self._pending.pop(key, None)
+                future = None
+        if future is not None:
+            dataset = future.result()
+            if dataset is not None:
+                return dataset
+        dataset = self.prepare(symbol, timeframe)
+        if dataset is not None:
+            self.cache.put(dataset)
+        return dataset
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._pool.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,158 @@
+"""
+Static HTML output for StockChart, without a webview.
+
+    chart = ReportChart()
+    stock_chart = StockChart('AAPL', './src/data', start_date, end_date, chart=chart)
+    stock_chart.plot(data)
+    chart.write('AAPL.html', title='AAPL 1d')
+
+ReportChart is a lightweight_charts StaticLWC: every script the chart, its lines
+and the indicators would send to the browser is appended to one page, which
+runs the same way when opened later. `setData` payloads are re-encoded before
+they are written: columns instead of one JSON object per point, values rounded
+to `precision` significant digits of each column's largest value (a chart
+cannot show more), times as deltas and repeated strings (volume colours) as
+indices into a palette. That is several times smaller than the indented
+records the library emits.
+"""
+
+import html
+import json
+import os
+import re
+import shutil
+from functools import lru_cache
+import numpy as np
+from lightweight_charts import abstract
+from lightweight_charts.widgets import StaticLWC
+
+
+ASSETS = ('styles.css', 'lightweight-charts.js', 'bundle.js')
+
+_SET_DATA = re.compile(r'^(?P<target>[\w.]+)\.setData\((?P<data>\[.*\])\)\s*;?\s*$', re.DOTALL)
+
+# rebuilds the point objects from the columns written by `compact_points`
+_DECODER = '''
+function _points(c) {
+    const keys = Object.keys(c), n = c.time.length, points = new Array(n);
+    for (const key of keys) if (c[key] && c[key].palette) c[key] = c[key].index.map(i => c[key].palette[i]);
+    for (let i = 0, t = 0; i < n; i++) {
+        t += c.time[i];
+        const point = {time: t};
+        for (const key of keys) if (key !== 'time' && c[key][i] !== null) point[key] = c[key][i];
+        points[i] = point;
+    }
+    return points;
+}
+'''
+
+
+def _splice(page: str, fragment: str, replacement: str) -> str:
+    # the library's markup is matched exactly, so a changed index.html must not pass silently
+    if fragment not in page:
+        raise RuntimeError(f'{abstract.INDEX} has no {fragment!r}; the report page cannot be built from it')
+    return page.replace(fragment, replacement, 1)
+
+
+@lru_cache(maxsize=2)
+def _page(inline_assets: bool) -> str:
+    """
+    The library's index.html, up to an open <script> tag, with the CSS and JS
+    inlined, or referring to the asset files next to the page.
+    """
+    js_dir = os.path.dirname(abstract.INDEX)
+    with open(abstract.INDEX, 'r', encoding='utf-8') as f:
+        page = f.read()
+    if inline_assets:
+        assets = {}
+        for name in ASSETS:
+            with open(os.path.join(js_dir, name), 'r', encoding='utf-8') as f:
+                assets[name] = f.read()
+        page = _splice(page, '<link rel="stylesheet" href="styles.css">', f"<style>{assets['styles.css']}</style>")
+        page = _splice(page, ' src="./lightweight-charts.js">', f">{assets['lightweight-charts.js']}")
+        page = _splice(page, ' src="./bundle.js">', f">{assets['bundle.js']}")
+    return _splice(page, '</body>\n</html>', f'<script>{_DECODER}')
+
+
+def copy_assets(output_path: str) -> None:
+    """
+    Copy the library's CSS/JS next to pages written with `inline_assets=False`.
+    """
+    js_dir = os.path.dirname(abstract.INDEX)
+    for name in ASSETS:
+        shutil.copyfile(os.path.join(js_dir, name), os.path.join(output_path, name))
+
+
+def _round(values: list, precision: int) -> list:
+    array = np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+    finite = np.isfinite(array)
+    if finite.any():
+        magnitude = np.max(np.abs(array[finite]))
+        decimals = max(precision - int(np.floor(np.log10(magnitude))) - 1, 0) if magnitude > 0 else 0
+        array = np.round(array, decimals)
+    integral = finite.all() and np.all(array == np.round(array))
+    return [None if not ok else (int(value) if integral else float(value)) for value, ok in zip(array.tolist(), finite.tolist())]
+
+
+def compact_points(points: list[dict], precision: int = 6) -> str:
+    """
+    Encode the point objects of a `setData` call as columns for `_points()` in the page.
+    """
+    keys = list(dict.fromkeys(key for point in points for key in point))
+    columns = {key: [point.get(key) for point in points] for key in keys}
+    time = np.asarray(columns.pop('time'), dtype=np.int64)
+    encoded = {'time': np.diff(time, prepend=0).tolist()}
+    for key, values in columns.items():
+        present = [value for value in values if value is not None]
+        if present and all(isinstance(value, str) for value in present):
+            palette = list(dict.fromkeys(present))
+            lookup = {value: i for i, value in enumerate(palette)}
+            encoded[key] = {'palette': palette, 'index': [lookup.get(value) for value in values]}
+        else:
+            encoded[key] = _round(values, precision)
+    return json.dumps(encoded, separators=(',', ':'))
+
+
+class ReportChart(StaticLWC):
+    """
+    A chart rendered into a standalone HTML page instead of a window.
+
+    :param inline_assets: Embed the library CSS/JS (~215 kB) in every page. When
+        False, pages load them from the same directory (see `copy_assets`), which
+        keeps a large batch of reports small.
+    :param precision: Significant digits kept, relative to the largest value of each
+        price, volume or indicator column.
+    """
+
+    def __init__(self, width=None, height=None, inner_width=1, inner_height=1, scale_candles_only: bool = False, toolbox: bool = False, autosize: bool = True, inline_assets: bool = True, precision: int = 6):
+        self.precision = precision
+        # scripts sent while StaticLWC builds the chart, replayed after its page is swapped out
+        self._pending = []
+        super().__init__(width, height, inner_width, inner_height, scale_candles_only, toolbox, autosize)
+        # StaticLWC always inlines the assets into its page; ours is built once per
+        # process, with the assets inlined or linked, and carries the point decoder
+        self._html = _page(inline_assets) + ''.join(f'\n{script}' for script in self._pending)
+        self._pending = None
+
+    def run_script(self, script: str, run_last: bool = False):
+        match = _SET_DATA.match(script)
+        if match is not None:
+            points = json.loads(match['data'])
+            if points:
+                script = f"{match['target']}.setData(_points({compact_points(points, self.precision)}))"
+        if self._pending is not None and not run_last:
+            self._pending.append(script)
+            return
+        super().run_script(script, run_last)
+
+    def html(self, title: str | None = None) -> str:
+        self.load()
+        page = f'{self._html}</script></body></html>'
+        if title is not None:
+            page = _splice(page, '<title>lightweight-charts-python</title>', f'<title>{html.escape(title)}</title>')
+        return page
+
+    def write(self, file_path: str, title: str | None = None) -> str:
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(self.html(title))
+        return file_path
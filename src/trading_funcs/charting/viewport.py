@@ -0,0 +1,87 @@
+"""
+Viewport-driven history loading.
+
+The chart opens on the most recent bars only; older bars are pulled from the
+memory-mapped bar store in chunks as the user scrolls left or zooms out. Every
+chunk is loaded together with enough earlier bars to warm the indicators up, so
+the values at the left edge match a full-history computation, and only the new
+chunk is prepared: it is joined to what is already drawn. Bars that end up far
+to the right of the screen are dropped and loaded again when scrolled back to.
+"""
+
+import numpy as np
+import pandas as pd
+from src.trading_funcs.data.store import BarStore
+from src.utils.instrumentation import timed
+
+
+class HistoryWindow:
+    """
+    A window [lo, hi) over bar column arrays that grows to the left, and is
+    trimmed and grown again on the right.
+
+    The arrays are typically memory-mapped from the bar store (or resampled from
+    it); only the window, plus `warmup` bars before it, is copied into a DataFrame.
+
+    :param initial_bars: Bars shown when the chart opens (default: everything).
+    :param chunk_bars: Bars added per `extend` call.
+    :param warmup: Bars loaded before the window to seed the indicators.
+    """
+
+    def __init__(self, arrays: dict[str, np.ndarray], initial_bars: int | None = None, chunk_bars: int | None = None, warmup: int = 0):
+        self.arrays = arrays
+        self.n_rows = self.arrays['time'].shape[0]
+        self.hi = self.n_rows
+        self.lo = max(0, self.n_rows - initial_bars) if initial_bars else 0
+        self.chunk_bars = chunk_bars or initial_bars or self.n_rows
+        self.warmup = warmup
+
+    def __len__(self) -> int:
+        return self.hi - self.lo
+
+    @property
+    def exhausted(self) -> bool:
+        return self.lo == 0
+
+    @property
+    def at_end(self) -> bool:
+        return self.hi == self.n_rows
+
+    @timed('parse')
+    def frame(self, lo: int | None = None, hi: int | None = None) -> tuple[pd.DataFrame, int]:
+        """
+        Bars of the window, or of rows [lo, hi), with the warm-up bars in front.
+
+        :return: The DataFrame and the number of leading warm-up rows not meant to be drawn.
+        """
+        lo = self.lo if lo is None else lo
+        hi = self.hi if hi is None else hi
+        first = max(0, lo - self.warmup)
+        data = BarStore.to_frame({col: values[first:hi] for col, values in self.arrays.items()})
+        return data, lo - first
+
+    def extend(self, bars: int | None = None) -> int:
+        """
+        Move the left edge back by `bars` (default one chunk).
+
+        :return: Number of bars added; 0 once the start of the stored history is reached.
+        """
+        new_lo = max(0, self.lo - (bars or self.chunk_bars))
+        added, self.lo = self.lo - new_lo, new_lo
+        return added
+
+    def extend_right(self, bars: int | None = None) -> int:
+        """
+        Move the right edge forward by `bars` (default one chunk), after `trim_right`.
+
+        :return: Number of bars added; 0 at the end of the stored history.
+        """
+        new_hi = min(self.n_rows, self.hi + (bars or self.chunk_bars))
+        added, self.hi = new_hi - self.hi, new_hi
+        return added
+
+    def trim_right(self, bars: int) -> None:
+        """
+        Move the right edge back by `bars`, e.g. for bars far off-screen.
+        """
+        self.hi = max(self.lo, self.hi - bars)
@@ -0,0 +1,38 @@
+from src.utils.lazy import lazy_exports
+
+# submodules are imported on first attribute access, not with the package
+_EXPORTS = {
+    'DataProvider': 'src.trading_funcs.data.providers',
+    'YahooProvider': 'src.trading_funcs.data.providers',
+    'LocalFileProvider': 'src.trading_funcs.data.providers',
+    'ReplayProvider': 'src.trading_funcs.data.providers',
+    'AsyncFetcher': 'src.trading_funcs.data.fetcher',
+    'preprocess_stock_data': 'src.trading_funcs.data.providers',
+    'BarStore': 'src.trading_funcs.data.store',
+    'Bars': 'src.trading_funcs.data.bars',
+    'Panel': 'src.trading_funcs.data.panel',
+    'BarAggregator': 'src.trading_funcs.data.live',
+    'ReplaySource': 'src.trading_funcs.data.live',
+    'CacheManifest': 'src.trading_funcs.data.manifest',
+    'Resampler': 'src.trading_funcs.data.resample',
+    'resample_bars': 'src.trading_funcs.data.resample'
+}
+
+__all__ = [
+    'DataProvider',
+    'YahooProvider',
+    'LocalFileProvider',
+    'ReplayProvider',
+    'AsyncFetcher',
+    'preprocess_stock_data',
+    'BarStore',
+    'Bars',
+    'Panel',
+    'BarAggregator',
+    'ReplaySource',
+    'CacheManifest',
+    'Resampler',
+    'resample_bars'
+]
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
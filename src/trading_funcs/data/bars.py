@@ -0,0 +1,107 @@
+from typing import TYPE_CHECKING
+import numpy as np
+from src.trading_funcs.data.store import PRICE_COLUMNS, BarStore, to_epoch_seconds
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class Bars:
+    """
+    Compact OHLCV container: one contiguous NumPy array per column, `time` as
+    int64 epoch seconds (UTC) and prices as float64 or float32.
+
+    Slicing returns a `Bars` of views on the same memory, so windows, tails and
+    memory-mapped store loads are never copied. `bars['close']` returns the
+    column array, which lets a `Bars` stand in for the column dicts taken by the
+    compute layer and `FeatureCache`; `bars[i]` returns one bar as a dict, the
+    shape `IndicatorBase.update` expects. Columns that were not loaded are None.
+    """
+
+    __slots__ = ('time', 'open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, time, open=None, high=None, low=None, close=None, volume=None, dtype: str = 'float64'):
+        dtype = np.dtype(dtype)
+        self.time = np.ascontiguousarray(time, dtype=np.int64)
+        for col, values in zip(PRICE_COLUMNS, (open, high, low, close, volume)):
+            if values is not None:
+                values = np.ascontiguousarray(values, dtype=dtype)
+                if values.shape != self.time.shape:
+                    raise ValueError(f'Column "{col}" has {values.shape[0]} rows, expected {self.time.shape[0]}.')
+            setattr(self, col, values)
+
+    @classmethod
+    def _view(cls, columns: dict[str, np.ndarray | None]) -> 'Bars':
+        # wrap arrays that are already typed and contiguous (or views), without conversion
+        bars = cls.__new__(cls)
+        for col in cls.__slots__:
+            setattr(bars, col, columns.get(col))
+        return bars
+
+    @classmethod
+    def from_arrays(cls, arrays: dict[str, np.ndarray], dtype: str = 'float64') -> 'Bars':
+        """
+        Build from a column dict such as `BarStore.load` returns; arrays already
+        of the right dtype (including memory maps) are wrapped, not copied.
+        """
+        return cls(**{col: arrays.get(col) for col in cls.__slots__}, dtype=dtype)
+
+    @classmethod
+    def from_frame(cls, data: 'pd.DataFrame', dtype: str = 'float64') -> 'Bars':
+        """
+        Convert a bar DataFrame (any `time` representation `pd.to_datetime` parses).
+        """
+        prices = {col: data[col].to_numpy() for col in PRICE_COLUMNS if col in data}
+        return cls(to_epoch_seconds(data['time']), **prices, dtype=dtype)
+
+    def to_frame(self) -> 'pd.DataFrame':
+        """
+        Copy into a DataFrame with a datetime `time` column, for the chart.
+        """
+        return BarStore.to_frame(self.columns())
+
+    def columns(self) -> dict[str, np.ndarray]:
+        """
+        The loaded columns as a dict of arrays (no copies).
+        """
+        return {col: values for col in self.__slots__ if (values := getattr(self, col)) is not None}
+
+    @property
+    def dtype(self) -> np.dtype | None:
+        prices = [getattr(self, col) for col in PRICE_COLUMNS if getattr(self, col) is not None]
+        return prices[0].dtype if prices else None
+
+    @property
+    def nbytes(self) -> int:
+        return sum(values.nbytes for values in self.columns().values())
+
+    def astype(self, dtype: str) -> 'Bars':
+        """
+        Copy with prices in another float dtype (`self` when it already matches).
+        """
+        if self.dtype == np.dtype(dtype):
+            return self
+        return Bars.from_arrays(self.columns(), dtype=dtype)
+
+    def tail(self, n: int) -> 'Bars':
+        return self[max(len(self) - n, 0):]
+
+    def __len__(self) -> int:
+        return self.time.shape[0]
+
+    def __contains__(self, col: str) -> bool:
+        return col in self.__slots__ and getattr(self, col) is not None
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            if key not in self:
+                raise KeyError(key)
+            return getattr(self, key)
+        if isinstance(key, slice):
+            if key.step not in (None, 1):
+                raise ValueError('Bars slices must be contiguous (step 1).')
+            return Bars._view({col: values[key] for col, values in self.columns().items()})
+        return {col: values[key].item() for col, values in self.columns().items()}
+
+    def __repr__(self) -> str:
+        return f'Bars(rows={len(self)}, columns={list(self.columns())}, dtype={self.dtype})'
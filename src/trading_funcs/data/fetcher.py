@@ -0,0 +1,215 @@
+"""
+Asynchronous fetching on top of any `DataProvider`.
+
+Provider calls run as asyncio tasks. A semaphore bounds how many are in flight
+and an optional rate limit spaces out their starts. Failed or timed-out calls are
+retried with exponential backoff. Concurrent requests for a symbol that is
+already being fetched wait on the same call instead of issuing a new one.
+
+Blocking providers run on the fetcher's own bounded thread pool. A thread
+cannot be stopped, so a call that times out keeps running in the background
+until the provider returns; it keeps its thread slot until then, which bounds
+the threads a stalled provider can pile up to `max_threads`.
+"""
+
+import asyncio
+import random
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import AsyncIterator
+import pandas as pd
+from src.trading_funcs.data.providers import DataProvider
+from src.utils.instrumentation import span
+from src.utils.logs import set_up_log
+
+
+logger = set_up_log(__name__)
+
+
+class RateLimiter:
+    """
+    Space out call starts to at most `rate` per second (no limit when `rate` is None).
+    """
+
+    def __init__(self, rate: float | None = None):
+        self.interval = 1 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class AsyncFetcher:
+    """
+    Fetch bars for many symbols concurrently through a provider.
+
+    :param provider: Any DataProvider. Providers that override `fetch_async`
+        are awaited directly; blocking ones run `fetch` on the fetcher's threads.
+    :param max_concurrency: Provider calls in flight at once.
+    :param max_threads: Threads running blocking provider calls at once, including
+        timed-out calls that are still running (default `max_concurrency`).
+    :param rate_limit: Provider calls started per second (default unlimited).
+    :param retries: Extra attempts after a failed or timed-out call.
+    :param backoff: Delay before the first retry; doubles per attempt, with jitter.
+    :param timeout: Seconds before a single call is abandoned and retried. An
+        abandoned blocking call is not interrupted: it finishes in the background.
+    """
+
+    def __init__(self, provider: DataProvider, max_concurrency: int = 8, rate_limit: float | None = None, retries: int = 3, backoff: float = 0.5, timeout: float | None = 30.0, max_threads: int | None = None):
+        self.provider = provider
+        self.max_concurrency = max_concurrency
+        self.max_threads = max_threads or max_concurrency
+        self.rate_limit = rate_limit
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.blocking = type(provider).fetch_async is DataProvider.fetch_async
+        self._executor = None
+        self._loop = None
+        self._semaphore = None
+        self._threads = None
+        self._limiter = None
+        self._in_flight = {}
+        self._tasks = set()
+
+    def _bind(self) -> asyncio.AbstractEventLoop:
+        # asyncio primitives belong to a loop, so they are (re)created for the running one
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._threads = asyncio.Semaphore(self.max_threads)
+            self._limiter = RateLimiter(self.rate_limit)
+            self._in_flight = {}
+        return loop
+
+    async def _call(self, symbols: list[str], start_date: str, end_date: str, interval: str) -> dict[str, pd.DataFrame]:
+        for attempt in range(self.retries + 1):
+            async with self._semaphore:
+                await self._limiter.wait()
+                try:
+                    with span('fetch'):
+                        return await self._provider_call(symbols, start_date, end_date, interval)
+                except Exception as e:
+                    if attempt == self.retries:
+                        raise
+                    error = e
+            delay = self.backoff * 2 ** attempt * (1 + random.random())
+            logger.info(f'Fetching {symbols} failed ({error!r}), retrying in {delay:.2f}s')
+            await asyncio.sleep(delay)
+
+    async def _provider_call(self, symbols: list[str], start_date: str, end_date: str, interval: str) -> dict[str, pd.DataFrame]:
+        if not self.blocking:
+            return await asyncio.wait_for(self.provider.fetch_async(symbols, start_date, end_date, interval), timeout=self.timeout)
+
+        # the timeout starts once a thread is free, not while waiting for one
+        await self._threads.acquire()
+        try:
+            future = self._thread_pool().submit(self.provider.fetch, symbols, start_date, end_date, interval)
+        except BaseException:
+            self._threads.release()
+            raise
+        # the slot is freed when the thread is done, not when the call is abandoned
+        future.add_done_callback(self._release_thread(asyncio.get_running_loop(), self._threads))
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout)
+
+    def _thread_pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_threads, thread_name_prefix='fetch')
+        return self._executor
+
+    @staticmethod
+    def _release_thread(loop: asyncio.AbstractEventLoop, threads: asyncio.Semaphore):
+        def release(future: Future) -> None:
+            # runs on the provider's thread; the loop may be gone by the time a stalled call returns
+            try:
+                loop.call_soon_threadsafe(threads.release)
+            except RuntimeError:
+                pass
+        return release
+
+    def close(self, wait: bool = False) -> None:
+        """
+        Shut the thread pool down. Calls still running finish in the background unless `wait` is set.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+    def __enter__(self) -> 'AsyncFetcher':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    async def _fetch_batch(self, batch: list[str], futures: dict[str, asyncio.Future], start_date: str, end_date: str, interval: str) -> None:
+        try:
+            bars = await self._call(batch, start_date, end_date, interval)
+        except Exception as e:
+            for symbol in batch:
+                futures[symbol].set_exception(e)
+        else:
+            for symbol in batch:
+                futures[symbol].set_result(bars.get(symbol))
+        finally:
+            for symbol in batch:
+                self._in_flight.pop((symbol, start_date, end_date, interval), None)
+
+    def _request(self, symbols: list[str], start_date: str, end_date: str, interval: str) -> dict[str, asyncio.Future]:
+        """
+        A future per symbol; symbols already in flight join the existing call,
+        the rest are batched into new provider calls.
+        """
+        loop = self._bind()
+        futures, new = {}, {}
+        for symbol in dict.fromkeys(symbols):
+            key = (symbol, start_date, end_date, interval)
+            if key not in self._in_flight:
+                self._in_flight[key] = new[symbol] = loop.create_future()
+            futures[symbol] = self._in_flight[key]
+
+        for batch in self.provider.batches(list(new)):
+            task = loop.create_task(self._fetch_batch(batch, new, start_date, end_date, interval))
+            # the loop only keeps weak references to tasks
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return futures
+
+    async def fetch(self, symbols: list[str], start_date: str, end_date: str, interval: str = '1d') -> dict[str, pd.DataFrame]:
+        """
+        Fetch all symbols; symbols without data, or whose calls failed, are left out.
+        """
+        result = {}
+        async for symbol, data in self.stream(symbols, start_date, end_date, interval):
+            result[symbol] = data
+        return result
+
+    @staticmethod
+    async def _wait(symbol: str, future: asyncio.Future) -> tuple[str, pd.DataFrame | None, Exception | None]:
+        # shielded: a cancelled consumer must not cancel a call other requests share
+        try:
+            return symbol, await asyncio.shield(future), None
+        except Exception as e:
+            return symbol, None, e
+
+    async def stream(self, symbols: list[str], start_date: str, end_date: str, interval: str = '1d') -> AsyncIterator[tuple[str, pd.DataFrame]]:
+        """
+        Yield (symbol, bars) as soon as each symbol's call completes.
+        """
+        futures = self._request(symbols, start_date, end_date, interval)
+        for waiter in asyncio.as_completed([self._wait(symbol, future) for symbol, future in futures.items()]):
+            symbol, data, error = await waiter
+            if error is not None:
+                logger.error(f'Fetching "{symbol}" failed: {error}')
+            elif data is None:
+                logger.info(f'No data returned for "{symbol}"')
+            else:
+                yield symbol, data
@@ -0,0 +1,162 @@
+"""
+Live bar building: trades (or quotes) are aggregated into bars of one interval,
+and stored bars can be replayed as a tick stream at any speed.
+
+Events travel as chunks `(time, price, size)` of equal-length NumPy arrays, time
+in epoch seconds. A live feed may send chunks of one event; replay sends
+`chunk_size` events at a time, so aggregation stays vectorised under load.
+"""
+
+import time as clock
+from typing import Iterator
+import numpy as np
+from src.trading_funcs.data.bars import Bars
+from src.trading_funcs.data.resample import INTERVAL_SECONDS, WEEK_ORIGIN, aggregate_bars
+
+
+class BarAggregator:
+    """
+    Aggregate ticks into bars of `interval`, aligned like `resample_bars`.
+
+    The newest bar stays open and is updated in place by every tick inside its
+    bucket; a tick in a later bucket closes it. Ticks older than the open bar are
+    counted in `late` and dropped.
+    """
+
+    def __init__(self, interval: str):
+        self.interval = interval
+        self.seconds = INTERVAL_SECONDS[interval]
+        self.origin = WEEK_ORIGIN if self.seconds % 604800 == 0 else 0
+        self.open_bar = None
+        self.events = 0
+        self.late = 0
+
+    def _bucket_start(self, time):
+        return (time - self.origin) // self.seconds * self.seconds + self.origin
+
+    def add(self, time: float, price: float, size: float = 0.0) -> dict | None:
+        """
+        Add one tick.
+
+        :return: The bar it closed, if any.
+        """
+        self.events += 1
+        start = int(self._bucket_start(time))
+        bar = self.open_bar
+        if bar is not None and start == bar['time']:
+            bar['high'] = max(bar['high'], price)
+            bar['low'] = min(bar['low'], price)
+            bar['close'] = price
+            bar['volume'] += size
+            return None
+        if bar is not None and start < bar['time']:
+            self.late += 1
+            return None
+        self.open_bar = {'time': start, 'open': price, 'high': price, 'low': price, 'close': price, 'volume': size}
+        return bar
+
+    def add_many(self, time: np.ndarray, price: np.ndarray, size: np.ndarray | None = None) -> list[dict]:
+        """
+        Add a time-ordered chunk of ticks.
+
+        :return: The bars closed by the chunk, oldest first.
+        """
+        time = np.asarray(time)
+        if time.shape[0] == 0:
+            return []
+        price = np.asarray(price, dtype=np.float64)
+        size = np.zeros(time.shape[0]) if size is None else np.asarray(size, dtype=np.float64)
+        self.events += time.shape[0]
+
+        start = self._bucket_start(time.astype(np.int64))
+        floor = np.maximum.accumulate(start)
+        if self.open_bar is not None:
+            floor = np.maximum(floor, self.open_bar['time'])
+        on_time = start >= floor
+        if not on_time.all():
+            self.late += int((~on_time).sum())
+            start, price, size = start[on_time], price[on_time], size[on_time]
+            if start.shape[0] == 0:
+                return []
+
+        group_starts = np.concatenate(([0], np.flatnonzero(np.diff(start)) + 1))
+        groups = aggregate_bars({'time': start, 'open': price, 'high': price, 'low': price, 'close': price, 'volume': size}, group_starts)
+        bars = [dict(zip(groups, values)) for values in zip(*(column.tolist() for column in groups.values()))]
+
+        bar = self.open_bar
+        if bar is not None and bars[0]['time'] == bar['time']:
+            first = bars.pop(0)
+            bar['high'] = max(bar['high'], first['high'])
+            bar['low'] = min(bar['low'], first['low'])
+            bar['close'] = first['close']
+            bar['volume'] += first['volume']
+        if not bars:
+            return []
+        self.open_bar = bars.pop()
+        return bars if bar is None else [bar, *bars]
+
+    def flush(self) -> dict | None:
+        """
+        Close and return the open bar, e.g. when the stream ends.
+        """
+        bar, self.open_bar = self.open_bar, None
+        return bar
+
+
+class ReplaySource:
+    """
+    Replay stored bars as a tick stream: every bar becomes open, low/high (in the
+    order the bar most likely traded) and close ticks inside its interval, with
+    the volume split between them.
+
+    :param speed: Replay speed as a multiple of real time (60 = one minute of
+        market time per second); 0 replays as fast as the consumer accepts.
+    :param chunk_size: Ticks per yielded chunk.
+    """
+
+    def __init__(self, bars: Bars, interval: str, speed: float = 1.0, chunk_size: int = 1024):
+        self.bars = bars
+        self.seconds = INTERVAL_SECONDS[interval]
+        self.speed = speed
+        self.chunk_size = chunk_size
+
+    @classmethod
+    def from_store(cls, bar_store, symbol: str, interval: str, start=None, end=None, **kwargs) -> 'ReplaySource':
+        return cls(bar_store.load_bars(symbol, interval, start=start, end=end), interval, **kwargs)
+
+    def ticks(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        All replay ticks as (time, price, size) arrays, four per bar.
+        """
+        bars = self.bars
+        close = np.asarray(bars.close, dtype=np.float64)
+        open_ = close if bars.open is None else np.asarray(bars.open, dtype=np.float64)
+        high = close if bars.high is None else np.asarray(bars.high, dtype=np.float64)
+        low = close if bars.low is None else np.asarray(bars.low, dtype=np.float64)
+        # a bar that closed up most likely made its low first
+        rising = close >= open_
+        price = np.column_stack((open_, np.where(rising, low, high), np.where(rising, high, low), close))
+        offsets = np.array([0.0, 0.25, 0.5, 0.75]) * self.seconds
+        time = bars.time[:, None] + offsets
+        volume = np.zeros(len(bars)) if bars.volume is None else np.asarray(bars.volume, dtype=np.float64)
+        size = np.repeat(volume[:, None] / 4, 4, axis=1)
+        return time.ravel(), price.ravel(), size.ravel()
+
+    def __iter__(self) -> Iterator[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        time, price, size = self.ticks()
+        if time.shape[0] == 0:
+            return
+        started, first = clock.perf_counter(), time[0]
+        lo, n_ticks = 0, time.shape[0]
+        while lo < n_ticks:
+            hi = min(lo + self.chunk_size, n_ticks)
+            if self.speed:
+                # hand out only the ticks that are due, and wait when none are
+                now = first + (clock.perf_counter() - started) * self.speed
+                due = int(np.searchsorted(time, now, side='right'))
+                if due <= lo:
+                    clock.sleep((time[lo] - now) / self.speed)
+                    continue
+                hi = min(hi, due)
+            yield time[lo:hi], price[lo:hi], size[lo:hi]
+            lo = hi
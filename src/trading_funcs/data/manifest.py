@@ -0,0 +1,88 @@
+import os
+import sqlite3
+import threading
+import datetime
+
+
+class CacheManifest:
+    """
+    Records which date range of each symbol/interval is already in the bar store.
+
+    Coverage is kept in an in-memory dict for O(1) lookups and written through to
+    a SQLite file, so it survives restarts without scanning the data directory.
+    Dates are 'YYYY-MM-DD' strings; `end` is exclusive, as in `yf.download`.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS coverage ('
+            'symbol TEXT NOT NULL, interval TEXT NOT NULL, start TEXT NOT NULL, end TEXT NOT NULL, '
+            'rows INTEGER NOT NULL, updated_at TEXT NOT NULL, PRIMARY KEY (symbol, interval))'
+        )
+        self._conn.commit()
+        self._index = {
+            (symbol, interval): (start, end)
+            for symbol, interval, start, end in self._conn.execute('SELECT symbol, interval, start, end FROM coverage')
+        }
+
+    def get(self, symbol: str, interval: str) -> tuple[str, str] | None:
+        return self._index.get((symbol.upper(), interval))
+
+    def covers(self, symbol: str, interval: str, start: str, end: str) -> bool:
+        return not self.missing(symbol, interval, start, end)
+
+    def missing(self, symbol: str, interval: str, start: str, end: str) -> list[tuple[str, str]]:
+        """
+        Ranges that still have to be fetched to serve [start, end).
+
+        :return: An empty list when the cached range is a superset, otherwise the
+            head and/or tail gaps, or the whole range when nothing is cached.
+        """
+        cached = self.get(symbol, interval)
+        if cached is None:
+            return [(start, end)]
+
+        # gaps are measured from the cached edges, so coverage always stays contiguous
+        gaps = []
+        if start < cached[0]:
+            gaps.append((start, cached[0]))
+        if end > cached[1]:
+            gaps.append((cached[1], end))
+        return gaps
+
+    def record(self, symbol: str, interval: str, start: str, end: str, rows: int) -> None:
+        """
+        Extend the covered range of a symbol/interval with [start, end).
+
+        A range that neither overlaps nor touches the covered one only updates
+        the row count: widening over it would mark the dates in between as
+        covered, and they would never be fetched. `missing` keeps reporting them.
+        """
+        key = (symbol.upper(), interval)
+        with self._lock:
+            cached = self._index.get(key)
+            if cached is not None:
+                if start > cached[1] or end < cached[0]:
+                    start, end = cached
+                else:
+                    start, end = min(start, cached[0]), max(end, cached[1])
+            self._index[key] = (start, end)
+            self._conn.execute(
+                'INSERT OR REPLACE INTO coverage (symbol, interval, start, end, rows, updated_at) VALUES (?, ?, ?, ?, ?, ?)',
+                (*key, start, end, rows, datetime.datetime.now().isoformat(timespec='seconds'))
+            )
+            self._conn.commit()
+
+    def remove(self, symbol: str, interval: str) -> None:
+        key = (symbol.upper(), interval)
+        with self._lock:
+            self._index.pop(key, None)
+            self._conn.execute('DELETE FROM coverage WHERE symbol = ? AND interval = ?', key)
+            self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
@@ -0,0 +1,101 @@
+import numpy as np
+from src.trading_funcs.data.bars import Bars
+from src.trading_funcs.data.store import BarStore
+from src.utils.instrumentation import timed
+from src.utils.logs import set_up_log
+
+
+logger = set_up_log(__name__)
+
+
+class Panel:
+    """
+    A universe of symbols on one shared time axis: every price column is a
+    (symbols, bars) array, NaN where a symbol has no bar at that time (not yet
+    listed, halted, or missing from the source).
+
+    Rows feed straight into the compute layer, whose kernels run along the last
+    axis, so indicators for the whole universe come from one call.
+    """
+
+    def __init__(self, symbols: list[str], time: np.ndarray, columns: dict[str, np.ndarray]):
+        self.symbols = list(symbols)
+        self.time = np.asarray(time, dtype=np.int64)
+        self.columns = columns
+        for col, values in columns.items():
+            if values.shape != (len(self.symbols), self.time.shape[0]):
+                raise ValueError(f'Column "{col}" has shape {values.shape}, expected {(len(self.symbols), self.time.shape[0])}.')
+
+    @classmethod
+    def from_bars(cls, bars: dict[str, Bars], columns: tuple[str, ...] = ('open', 'high', 'low', 'close', 'volume'), dtype: str = 'float64') -> 'Panel':
+        """
+        Align per-symbol bars on the union of their times.
+        """
+        symbols = list(bars)
+        times = [bars[symbol].time for symbol in symbols]
+        if not times:
+            return cls([], np.empty(0, dtype=np.int64), {col: np.empty((0, 0), dtype=dtype) for col in columns})
+        # daily bars of one market usually share the same axis; skip the union then
+        if all(np.array_equal(time, times[0]) for time in times[1:]):
+            time = np.asarray(times[0], dtype=np.int64)
+            positions = [None] * len(symbols)
+        else:
+            time = np.unique(np.concatenate(times))
+            positions = [np.searchsorted(time, symbol_time) for symbol_time in times]
+
+        panel = {}
+        for col in columns:
+            values = np.full((len(symbols), time.shape[0]), np.nan, dtype=dtype)
+            for row, symbol in enumerate(symbols):
+                if col not in bars[symbol]:
+                    continue
+                if positions[row] is None:
+                    values[row] = bars[symbol][col]
+                else:
+                    values[row, positions[row]] = bars[symbol][col]
+            panel[col] = values
+        return cls(symbols, time, panel)
+
+    @classmethod
+    @timed('parse')
+    def from_store(cls, bar_store: BarStore, symbols: list[str], interval: str, start=None, end=None, columns: tuple[str, ...] = ('open', 'high', 'low', 'close', 'volume'), dtype: str = 'float64') -> 'Panel':
+        """
+        Load a universe from the bar store; symbols without stored bars are skipped and logged.
+        """
+        bars, missing = {}, []
+        for symbol in symbols:
+            symbol = symbol.upper()
+            meta = bar_store.meta(symbol, interval)
+            if meta is None:
+                missing.append(symbol)
+                continue
+            stored = [col for col in columns if col in meta['columns']]
+            # copied into the panel anyway; mapping thousands of files would exhaust descriptors
+            bars[symbol] = bar_store.load_bars(symbol, interval, columns=stored, start=start, end=end, mmap=False)
+        if missing:
+            logger.info(f'No stored {interval} bars for {len(missing)} symbols: {missing[:10]}{"..." if len(missing) > 10 else ""}')
+        return cls.from_bars(bars, columns=columns, dtype=dtype)
+
+    def save(self, file_path: str) -> None:
+        """
+        Write the aligned panel to one `.npz` file. Loading it back is a handful
+        of reads, against one read per symbol and column from the bar store.
+        """
+        np.savez(file_path, symbols=np.array(self.symbols, dtype=str), time=self.time, **self.columns)
+
+    @classmethod
+    @timed('parse')
+    def load(cls, file_path: str) -> 'Panel':
+        with np.load(file_path, allow_pickle=False) as data:
+            columns = {col: data[col] for col in data.files if col not in ('symbols', 'time')}
+            return cls(data['symbols'].tolist(), data['time'], columns)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __getitem__(self, col: str) -> np.ndarray:
+        return self.columns[col]
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return len(self.symbols), self.time.shape[0]
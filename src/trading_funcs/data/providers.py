@@ -0,0 +1,177 @@
+import os
+import glob
+import time
+import random
+import asyncio
+import pandas as pd
+from src.utils.instrumentation import span, timed
+from src.utils.logs import set_up_log
+
+
+logger = set_up_log(__name__)
+
+COLUMN_NAMES = {
+    'Date': 'time',
+    'Datetime': 'time',
+    'Open': 'open',
+    'High': 'high',
+    'Low': 'low',
+    'Close': 'close',
+    'Volume': 'volume'
+}
+
+# the `{end_date}` of a snapshot file name, as a glob
+SNAPSHOT_DATE = '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]'
+
+
+@timed('preprocess')
+def preprocess_stock_data(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Preprocess stock data to have a consistent format.
+
+    :param data: DataFrame with stock data, indexed by date, as returned by yfinance for one ticker.
+    :return: Preprocessed DataFrame with time, open, high, low, close and volume columns.
+    """
+    data = data.reset_index()
+    if isinstance(data.columns, pd.MultiIndex):
+        data.columns = data.columns.droplevel(1)
+    data = data.rename(columns=COLUMN_NAMES)
+    return data.dropna(subset=['open', 'high', 'low', 'close'], how='all').reset_index(drop=True)
+
+
+class DataProvider:
+    """
+    Base class for bar data providers.
+    A provider fetches a batch of symbols in one call and returns one preprocessed
+    DataFrame per symbol; symbols without data are left out of the result.
+    """
+
+    # how many symbols a single provider call may carry
+    batch_size: int = 1
+
+    def fetch(self, symbols: list[str], start_date: str, end_date: str, interval: str = '1d') -> dict[str, pd.DataFrame]:
+        """
+        Fetch bar data for a batch of symbols.
+        This method should be implemented by subclasses.
+        """
+        raise NotImplementedError("Subclasses should implement this method.")
+
+    async def fetch_async(self, symbols: list[str], start_date: str, end_date: str, interval: str = '1d') -> dict[str, pd.DataFrame]:
+        """
+        Awaitable `fetch`; blocking providers run in a worker thread.
+        """
+        return await asyncio.to_thread(self.fetch, symbols, start_date, end_date, interval)
+
+    def batches(self, symbols: list[str]) -> list[list[str]]:
+        return [symbols[i:i + self.batch_size] for i in range(0, len(symbols), self.batch_size)]
+
+
+class YahooProvider(DataProvider):
+    """
+    Yahoo Finance provider; one `yf.download` call per batch of symbols.
+
+    :param timeout: Per-request timeout in seconds.
+    :param session: HTTP session shared by every call, so connections are reused
+        (default: the session yfinance keeps for the process).
+    """
+
+    def __init__(self, batch_size: int = 100, threads: bool = True, timeout: float = 10, session=None):
+        self.batch_size = batch_size
+        self.threads = threads
+        self.timeout = timeout
+        self.session = session
+
+    def fetch(self, symbols: list[str], start_date: str, end_date: str, interval: str = '1d') -> dict[str, pd.DataFrame]:
+        import yfinance as yf
+
+        data = yf.download(
+            symbols,
+            start=start_date,
+            end=end_date,
+            interval=interval,
+            group_by='ticker',
+            threads=self.threads,
+            progress=False,
+            timeout=self.timeout,
+            session=self.session
+        )
+        if data is None or data.empty:
+            return {}
+
+        result = {}
+        for symbol in symbols:
+            if symbol not in data.columns.get_level_values(0):
+                logger.info(f'No data returned for "{symbol}"')
+                continue
+            frame = preprocess_stock_data(data[symbol])
+            if not frame.empty:
+                result[symbol] = frame
+        return result
+
+
+class LocalFileProvider(DataProvider):
+    """
+    Offline stand-in for a remote provider, reading `{symbol}_{end_date}.csv` snapshots
+    from a directory (the files written by `StockChart.export_csv`).
+    The newest snapshot of each symbol is used and trimmed to the requested range.
+    """
+
+    def __init__(self, path: str, batch_size: int = 100):
+        self.path = path
+        self.batch_size = batch_size
+
+    def _latest_file(self, symbol: str) -> str | None:
+        # dated snapshots only: other `{symbol}_*.csv` files, such as the
+        # pipeline's `{symbol}_{interval}_indicators.csv`, may share the directory
+        pattern = os.path.join(glob.escape(self.path), f'{glob.escape(symbol)}_{SNAPSHOT_DATE}*.csv')
+        files = sorted(path for path in glob.glob(pattern) if not path.endswith('_indicators.csv'))
+        return files[-1] if files else None
+
+    def fetch(self, symbols: list[str], start_date: str, end_date: str, interval: str = '1d') -> dict[str, pd.DataFrame]:
+        result = {}
+        for symbol in symbols:
+            file_path = self._latest_file(symbol)
+            if file_path is None:
+                logger.info(f'No local data for "{symbol}" in {self.path}')
+                continue
+            with span('parse'):
+                # the row index `to_csv` writes is unnamed; bars are matched by their `time` column
+                data = pd.read_csv(file_path, usecols=lambda col: not col.startswith('Unnamed'))
+            time = pd.to_datetime(data['time'])
+            data = data[(time >= start_date) & (time < end_date)].reset_index(drop=True)
+            if not data.empty:
+                result[symbol] = data
+        return result
+
+
+class ReplayProvider(DataProvider):
+    """
+    Replay another provider (typically a LocalFileProvider) with simulated network
+    behaviour, for offline testing of the fetch path.
+
+    :param latency: Seconds every call takes, on top of the source's own time.
+    :param jitter: Extra random delay of up to this many seconds per call.
+    :param failure_rate: Probability that a call raises ConnectionError.
+    """
+
+    def __init__(self, source: DataProvider, latency: float = 0.1, jitter: float = 0.0, failure_rate: float = 0.0, seed: int | None = None):
+        self.source = source
+        self.batch_size = source.batch_size
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+
+    def _delay(self) -> float:
+        if self._random.random() < self.failure_rate:
+            raise ConnectionError('Simulated provider failure')
+        return self.latency + self._random.uniform(0, self.jitter)
+
+    def fetch(self, symbols: list[str], start_date: str, end_date: str, interval: str = '1d') -> dict[str, pd.DataFrame]:
+        time.sleep(self._delay())
+        return self.source.fetch(symbols, start_date, end_date, interval)
+
+    async def fetch_async(self, symbols: list[str], start_date: str, end_date: str, interval: str = '1d') -> dict[str, pd.DataFrame]:
+        # the wait does not hold a thread, so many replayed calls can overlap
+        await asyncio.sleep(self._delay())
+        return self.source.fetch(symbols, start_date, end_date, interval)
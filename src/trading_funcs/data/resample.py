@@ -0,0 +1,180 @@
+"""
+Vectorised OHLCV resampling from the finest stored bars.
+
+Only the base interval is downloaded and stored; coarser timeframes are derived
+with `reduceat` over bucket boundaries and cached per (symbol, timeframe) until
+the base partition changes.
+"""
+
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from src.trading_funcs.data.store import BarStore
+from src.utils.instrumentation import span
+
+
+# seconds per bar, keyed by chart timeframe and by yfinance interval
+INTERVAL_SECONDS = {
+    '1m': 60, '2m': 120, '5m': 300, '15m': 900, '30m': 1800,
+    '60m': 3600, '90m': 5400, '1h': 3600, '4h': 14400,
+    '1d': 86400, '5d': 432000, '1w': 604800, '1wk': 604800
+}
+
+TIMEFRAMES = ('1m', '5m', '15m', '1h', '4h', '1d', '1w')
+
+# weekly buckets start on Monday; 1970-01-01 was a Thursday
+WEEK_ORIGIN = 4 * 86400
+
+
+def aggregate_bars(columns: dict[str, np.ndarray], starts: np.ndarray) -> dict[str, np.ndarray]:
+    """
+    Aggregate consecutive rows into bars: first time/open, max high, min low, last close, summed volume.
+
+    :param starts: Sorted first row of every output bar; a bar runs until the next start.
+    """
+    n_rows = columns['time'].shape[0]
+    ends = np.append(starts[1:], n_rows) - 1
+    result = {'time': columns['time'][starts]}
+    if 'open' in columns:
+        result['open'] = np.asarray(columns['open'])[starts]
+    if 'high' in columns:
+        result['high'] = np.fmax.reduceat(np.asarray(columns['high'], dtype=np.float64), starts)
+    if 'low' in columns:
+        result['low'] = np.fmin.reduceat(np.asarray(columns['low'], dtype=np.float64), starts)
+    if 'close' in columns:
+        result['close'] = np.asarray(columns['close'])[ends]
+    if 'volume' in columns:
+        result['volume'] = np.add.reduceat(np.asarray(columns['volume'], dtype=np.float64), starts)
+    return result
+
+
+def resample_bars(columns: dict[str, np.ndarray], seconds: int) -> dict[str, np.ndarray]:
+    """
+    Resample time-sorted bars (int64 epoch-second `time`) to `seconds`-long bars.
+    Buckets are aligned to the epoch (UTC), weekly buckets to Monday; bars are
+    stamped with the bucket start and empty buckets are skipped.
+    """
+    time = np.asarray(columns['time'], dtype=np.int64)
+    if time.shape[0] == 0:
+        return {col: np.asarray(values)[:0] for col, values in columns.items()}
+
+    origin = WEEK_ORIGIN if seconds % 604800 == 0 else 0
+    buckets = (time - origin) // seconds
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(buckets)) + 1))
+    result = aggregate_bars(columns, starts)
+    result['time'] = buckets[starts] * seconds + origin
+    return result
+
+
+def asof_join(time: np.ndarray, other_time: np.ndarray, other_values: np.ndarray) -> np.ndarray:
+    """
+    For every `time`, the last `other_values` entry with `other_time <= time` (NaN before the first one).
+    Pass bar close times on both sides to only use higher-timeframe bars that have completed.
+    """
+    index = np.searchsorted(other_time, time, side='right') - 1
+    result = np.asarray(other_values, dtype=np.float64)[np.maximum(index, 0)]
+    result[index < 0] = np.nan
+    return result
+
+
+class Resampler:
+    """
+    Serve any timeframe at or above the base interval from the bar store.
+
+    Resampled arrays are cached per (symbol, timeframe) together with the
+    `version` of the base partition they were built from; any write to the
+    partition (a merge, even one that only corrects the last bar) bumps it, and
+    the next `load` rebuilds the timeframe. The least recently used timeframes
+    are evicted once the cache holds more than `max_bytes`; the most recent one
+    is always kept. Thread-safe.
+    """
+
+    def __init__(self, bar_store: BarStore, base_interval: str, max_bytes: int = 64 * 2**20):
+        self.bar_store = bar_store
+        self.base_interval = base_interval
+        self.base_seconds = INTERVAL_SECONDS[base_interval]
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._cache: OrderedDict[tuple[str, str], tuple[tuple, dict[str, np.ndarray], int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def timeframes(self) -> tuple[str, ...]:
+        """
+        Base interval first, then every standard timeframe it can be resampled to.
+        """
+        coarser = tuple(
+            timeframe for timeframe in TIMEFRAMES
+            if INTERVAL_SECONDS[timeframe] > self.base_seconds and INTERVAL_SECONDS[timeframe] % self.base_seconds == 0
+        )
+        return (self.base_interval, *coarser)
+
+    def seconds(self, timeframe: str) -> int:
+        return INTERVAL_SECONDS[timeframe]
+
+    def invalidate(self, symbol: str) -> None:
+        """
+        Drop every cached timeframe of a symbol.
+        """
+        with self._lock:
+            for key in [key for key in self._cache if key[0] == symbol.upper()]:
+                self.nbytes -= self._cache.pop(key)[2]
+
+    def _cached(self, key: tuple[str, str], version: tuple) -> dict[str, np.ndarray] | None:
+        with self._lock:
+            item = self._cache.get(key)
+            if item is None or item[0] != version:
+                return None
+            self._cache.move_to_end(key)
+            return item[1]
+
+    def _put(self, key: tuple[str, str], version: tuple, bars: dict[str, np.ndarray]) -> None:
+        size = sum(values.nbytes for values in bars.values())
+        with self._lock:
+            previous = self._cache.pop(key, None)
+            if previous is not None:
+                self.nbytes -= previous[2]
+            self._cache[key] = (version, bars, size)
+            self.nbytes += size
+            while self.nbytes > self.max_bytes and len(self._cache) > 1:
+                self.nbytes -= self._cache.popitem(last=False)[1][2]
+
+    def load(self, symbol: str, timeframe: str, start=None, end=None) -> dict[str, np.ndarray]:
+        """
+        Bars of `symbol` at `timeframe`, optionally limited to [start, end).
+        """
+        if timeframe == self.base_interval:
+            return self.bar_store.load(symbol, self.base_interval, start=start, end=end)
+
+        seconds = self.seconds(timeframe)
+        if seconds < self.base_seconds or seconds % self.base_seconds:
+            raise ValueError(f'Cannot derive {timeframe} bars from {self.base_interval} bars')
+
+        meta = self.bar_store.meta(symbol, self.base_interval)
+        if meta is None:
+            raise FileNotFoundError(f'No stored bars for "{symbol}" ({self.base_interval}) in {self.bar_store.root}')
+
+        key = (symbol.upper(), timeframe)
+        # partitions written before the version counter fall back to their shape
+        version = (meta.get('version'), meta['rows'], meta['end'])
+        bars = self._cached(key, version)
+        if bars is None:
+            with span('resample'):
+                bars = resample_bars(self.bar_store.load(symbol, self.base_interval), seconds)
+            for values in bars.values():
+                values.flags.writeable = False
+            self._put(key, version, bars)
+
+        if start is None and end is None:
+            return bars
+        time = bars['time']
+        lo = 0 if start is None else np.searchsorted(time, self._bucket(start, seconds), side='left')
+        hi = time.shape[0] if end is None else np.searchsorted(time, pd.Timestamp(end).timestamp(), side='left')
+        return {col: values[lo:hi] for col, values in bars.items()}
+
+    @staticmethod
+    def _bucket(timestamp, seconds: int) -> int:
+        # start of the bucket holding `timestamp`, so a partial first bucket is kept
+        origin = WEEK_ORIGIN if seconds % 604800 == 0 else 0
+        return (int(pd.Timestamp(timestamp).timestamp()) - origin) // seconds * seconds + origin
@@ -0,0 +1,361 @@
+import os
+import json
+import shutil
+from typing import Iterator, TYPE_CHECKING
+import numpy as np
+from src.utils.instrumentation import timed
+from src.utils.logs import set_up_log
+
+
+# pandas is imported inside the DataFrame/CSV methods only, so array-only
+# readers (headless workers) start without it
+if TYPE_CHECKING:
+    import pandas as pd
+    from src.trading_funcs.data.bars import Bars
+
+logger = set_up_log(__name__)
+
+PRICE_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+def to_epoch_seconds(time: 'pd.Series') -> np.ndarray:
+    """
+    Convert a time column (strings, datetimes, tz-aware or not) to int64 epoch seconds (UTC).
+    """
+    import pandas as pd
+
+    time = pd.to_datetime(time)
+    if time.dt.tz is not None:
+        time = time.dt.tz_convert('UTC').dt.tz_localize(None)
+    return time.to_numpy().astype('datetime64[s]').astype(np.int64)
+
+
+class BarStore:
+    """
+    Columnar binary store for bar data, partitioned by symbol and interval.
+
+    Every column lives in its own `.npy` file under `{root}/{symbol}/{interval}/`:
+    `time` as int64 epoch seconds and the price columns as float64. Loads are
+    memory-mapped, so only the requested columns (and the touched pages) are read.
+    Histories larger than memory are read with `iter_blocks` and written with
+    `writer`, one block at a time. CSV stays available through `import_csv`/`export_csv`.
+    """
+
+    def __init__(self, root: str, dtype: str = 'float64'):
+        self.root = root
+        self.dtype = np.dtype(dtype)
+
+    def _partition(self, symbol: str, interval: str) -> str:
+        return os.path.join(self.root, symbol.upper(), interval)
+
+    def _meta_path(self, symbol: str, interval: str) -> str:
+        return os.path.join(self._partition(symbol, interval), 'meta.json')
+
+    def exists(self, symbol: str, interval: str) -> bool:
+        return os.path.isfile(self._meta_path(symbol, interval))
+
+    def meta(self, symbol: str, interval: str) -> dict | None:
+        if not self.exists(symbol, interval):
+            return None
+        with open(self._meta_path(symbol, interval), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def to_columns(self, data: 'pd.DataFrame') -> dict[str, np.ndarray]:
+        """
+        Convert a bar DataFrame to typed, time-sorted column arrays.
+        """
+        columns = {'time': to_epoch_seconds(data['time'])}
+        for col in PRICE_COLUMNS:
+            if col in data:
+                columns[col] = data[col].to_numpy(dtype=self.dtype)
+        order = np.argsort(columns['time'], kind='stable')
+        if not np.all(order == np.arange(order.shape[0])):
+            columns = {col: values[order] for col, values in columns.items()}
+        return columns
+
+    def write(self, symbol: str, interval: str, data: 'pd.DataFrame | dict[str, np.ndarray]', **extra_meta) -> None:
+        """
+        Replace the partition with the given bars.
+        `extra_meta` is stored alongside the row count, time range and write
+        `version` (bumped on every write) in `meta.json`.
+        Columns are written to a temporary directory first and swapped in, so
+        readers never see a half-written partition.
+        """
+        columns = data if isinstance(data, dict) else self.to_columns(data)
+        tmp_partition = self._tmp_partition(symbol, interval)
+        for col, values in columns.items():
+            np.save(os.path.join(tmp_partition, f'{col}.npy'), np.ascontiguousarray(values))
+        time = columns['time']
+        self._write_meta(tmp_partition, symbol, interval, list(columns), time.shape[0], time[0] if time.shape[0] else None, time[-1] if time.shape[0] else None, extra_meta)
+        self._swap_in(symbol, interval, tmp_partition)
+
+    def _tmp_partition(self, symbol: str, interval: str) -> str:
+        tmp_partition = f'{self._partition(symbol, interval)}.tmp'
+        shutil.rmtree(tmp_partition, ignore_errors=True)
+        os.makedirs(tmp_partition)
+        return tmp_partition
+
+    def _write_meta(self, directory: str, symbol: str, interval: str, columns: list[str], rows: int, start, end, extra_meta: dict) -> None:
+        previous = self.meta(symbol, interval) or {}
+        meta = {
+            'symbol': symbol.upper(),
+            'interval': interval,
+            'rows': int(rows),
+            'columns': columns,
+            'start': None if start is None else int(start),
+            'end': None if end is None else int(end),
+            **extra_meta,
+            # bumped on every write, so readers can tell a rewrite that kept the rows and range
+            'version': previous.get('version', 0) + 1
+        }
+        with open(os.path.join(directory, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+
+    def _swap_in(self, symbol: str, interval: str, tmp_partition: str) -> None:
+        partition = self._partition(symbol, interval)
+        old_partition = f'{partition}.old'
+        if os.path.isdir(partition):
+            shutil.rmtree(old_partition, ignore_errors=True)
+            os.replace(partition, old_partition)
+        os.replace(tmp_partition, partition)
+        shutil.rmtree(old_partition, ignore_errors=True)
+
+    def writer(self, symbol: str, interval: str, **extra_meta) -> 'PartitionWriter':
+        """
+        Replace the partition with bars appended block by block, e.g. a history
+        that does not fit in memory:
+
+            with store.writer('AAPL', '1s') as writer:
+                for block in blocks:
+                    writer.append(block)    # dict of column arrays, in time order
+        """
+        return PartitionWriter(self, symbol, interval, extra_meta)
+
+    def merge(self, symbol: str, interval: str, data: 'pd.DataFrame', **extra_meta) -> int:
+        """
+        Merge bars into the partition, before, after or over the stored range.
+        New bars replace stored bars inside their time span, so re-fetching the
+        last (possibly partial) bar is safe.
+
+        :return: Number of rows in the partition afterwards.
+        """
+        new = self.to_columns(data)
+        if not self.exists(symbol, interval):
+            self.write(symbol, interval, new, **extra_meta)
+            return new['time'].shape[0]
+        if new['time'].shape[0] == 0:
+            return self.meta(symbol, interval)['rows']
+
+        old = self.load(symbol, interval, mmap=False)
+        keep = (old['time'] < new['time'][0]) | (old['time'] > new['time'][-1])
+        before = keep & (old['time'] < new['time'][0])
+        after = keep & ~before
+        merged = {}
+        for col in old:
+            new_values = new[col] if col in new else np.full(new['time'].shape[0], np.nan, dtype=old[col].dtype)
+            merged[col] = np.concatenate((old[col][before], new_values, old[col][after]))
+        self.write(symbol, interval, merged, **extra_meta)
+        return merged['time'].shape[0]
+
+    def load(self, symbol: str, interval: str, columns: list[str] | None = None, start=None, end=None, mmap: bool = True) -> dict[str, np.ndarray]:
+        """
+        Load column arrays for one symbol/interval.
+
+        :param columns: Columns to load (default all); `time` is always included.
+        :param start: Optional inclusive start (anything `pd.Timestamp` accepts).
+        :param end: Optional exclusive end.
+        :param mmap: Memory-map the files instead of reading them into RAM.
+        :return: Dict of column name to array (read-only views when memory-mapped).
+        """
+        meta = self.meta(symbol, interval)
+        if meta is None:
+            raise FileNotFoundError(f'No stored bars for "{symbol}" ({interval}) in {self.root}')
+
+        partition = self._partition(symbol, interval)
+        columns = meta['columns'] if columns is None else ['time', *[col for col in columns if col != 'time']]
+        mmap_mode = 'r' if mmap else None
+        result = {col: np.load(os.path.join(partition, f'{col}.npy'), mmap_mode=mmap_mode) for col in columns}
+
+        if start is not None or end is not None:
+            lo, hi = _time_range(result['time'], start, end)
+            result = {col: values[lo:hi] for col, values in result.items()}
+        return result
+
+    def iter_blocks(self, symbol: str, interval: str, block_rows: int, columns: list[str] | None = None, start=None, end=None) -> Iterator[dict[str, np.ndarray]]:
+        """
+        Read column arrays in consecutive blocks of `block_rows` bars. Blocks are
+        read from the files into fresh arrays rather than mapped, so memory stays
+        at one block however long the history is.
+
+        :param columns: Columns to read (default all); `time` is always included.
+        :param start: Optional inclusive start (anything `pd.Timestamp` accepts).
+        :param end: Optional exclusive end.
+        """
+        meta = self.meta(symbol, interval)
+        if meta is None:
+            raise FileNotFoundError(f'No stored bars for "{symbol}" ({interval}) in {self.root}')
+
+        partition = self._partition(symbol, interval)
+        columns = meta['columns'] if columns is None else ['time', *[col for col in columns if col != 'time']]
+        layouts = {col: _column_layout(os.path.join(partition, f'{col}.npy')) for col in columns}
+        lo, hi = 0, meta['rows']
+        if start is not None or end is not None:
+            # the range is searched on the memory-mapped times, and the map released again
+            lo, hi = _time_range(self.load(symbol, interval, columns=['time'])['time'], start, end)
+
+        for first in range(lo, hi, block_rows):
+            count = min(block_rows, hi - first)
+            yield {
+                col: np.fromfile(path, dtype=dtype, count=count, offset=offset + first * dtype.itemsize)
+                for col, (path, dtype, offset) in layouts.items()
+            }
+
+    @timed('parse')
+    def load_frame(self, symbol: str, interval: str, columns: list[str] | None = None, start=None, end=None) -> 'pd.DataFrame':
+        """
+        Load bars as a DataFrame with a datetime `time` column, ready for the chart.
+        """
+        return self.to_frame(self.load(symbol, interval, columns=columns, start=start, end=end))
+
+    def load_bars(self, symbol: str, interval: str, columns: list[str] | None = None, start=None, end=None, dtype: str | None = None, mmap: bool = True) -> 'Bars':
+        """
+        Load bars as a `Bars` container. Without `dtype` (or with the stored one)
+        the columns stay memory-mapped views; float32 halves the price memory.
+        Each mapped column holds a file descriptor open, so pass `mmap=False`
+        when loading thousands of symbols at once.
+        """
+        from src.trading_funcs.data.bars import Bars
+
+        arrays = self.load(symbol, interval, columns=columns, start=start, end=end, mmap=mmap)
+        return Bars.from_arrays(arrays, dtype=self.dtype if dtype is None else dtype)
+
+    @staticmethod
+    def to_frame(arrays: dict[str, np.ndarray]) -> 'pd.DataFrame':
+        """
+        Copy column arrays (or a slice of them) into a DataFrame with a datetime `time` column.
+        """
+        import pandas as pd
+
+        data = pd.DataFrame({col: np.asarray(values) for col, values in arrays.items()})
+        # nanosecond resolution: lightweight_charts converts with `astype('int64') // 10 ** 9`,
+        # and pandas >= 3 would otherwise keep the second resolution of `unit='s'`
+        data['time'] = pd.to_datetime(data['time'], unit='s').astype('datetime64[ns]')
+        return data
+
+    def import_csv(self, file_path: str, symbol: str, interval: str, chunk_rows: int | None = None, **extra_meta) -> None:
+        """
+        :param chunk_rows: Parse and write the file this many rows at a time, for
+            files larger than memory; the rows must then be in time order.
+        """
+        import pandas as pd
+
+        if chunk_rows:
+            with self.writer(symbol, interval, **extra_meta) as writer:
+                for chunk in pd.read_csv(file_path, chunksize=chunk_rows):
+                    writer.append(self.to_columns(chunk))
+        else:
+            data = pd.read_csv(file_path)
+            data = data.loc[:, ~data.columns.str.startswith('Unnamed')]
+            self.write(symbol, interval, data, **extra_meta)
+        logger.info(f'Imported {file_path} into {self._partition(symbol, interval)}')
+
+    def export_csv(self, symbol: str, interval: str, file_path: str) -> None:
+        self.load_frame(symbol, interval).to_csv(file_path)
+
+
+def _time_range(time: np.ndarray, start=None, end=None) -> tuple[int, int]:
+    # rows from an inclusive start to an exclusive end
+    import pandas as pd
+
+    lo = 0 if start is None else int(np.searchsorted(time, pd.Timestamp(start).timestamp(), side='left'))
+    hi = time.shape[0] if end is None else int(np.searchsorted(time, pd.Timestamp(end).timestamp(), side='left'))
+    return lo, hi
+
+
+def _column_layout(path: str) -> tuple[str, np.dtype, int]:
+    # file, dtype and data offset of a 1-d `.npy` column, without mapping it
+    with open(path, 'rb') as f:
+        major, _ = np.lib.format.read_magic(f)
+        read_header = np.lib.format.read_array_header_1_0 if major == 1 else np.lib.format.read_array_header_2_0
+        _, _, dtype = read_header(f)
+        return path, dtype, f.tell()
+
+
+class PartitionWriter:
+    """
+    Writes a partition block by block (see `BarStore.writer`).
+
+    Each column is appended to its `.npy` file in a temporary directory behind a
+    header that is rewritten with the final row count on `close`, and the
+    partition is then swapped in like `BarStore.write` does, so readers never see
+    a partial one. The first block fixes the columns and their dtypes; blocks
+    must arrive in time order.
+    """
+
+    def __init__(self, store: BarStore, symbol: str, interval: str, extra_meta: dict | None = None):
+        self.store = store
+        self.symbol = symbol
+        self.interval = interval
+        self.extra_meta = extra_meta or {}
+        self.rows = 0
+        self.start = self.end = None
+        self._tmp_partition = store._tmp_partition(symbol, interval)
+        self._files = {}
+        self._dtypes = {}
+        self._data_offset = 0
+
+    @staticmethod
+    def _header(dtype: np.dtype, rows: int) -> dict:
+        return {'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': False, 'shape': (rows,)}
+
+    def append(self, columns: dict[str, np.ndarray]) -> None:
+        time = np.asarray(columns['time'])
+        if time.shape[0] == 0:
+            return
+        if self.end is not None and time[0] < self.end:
+            raise ValueError(f'Blocks of "{self.symbol}" ({self.interval}) must be appended in time order')
+        if not self._files:
+            for col, values in columns.items():
+                self._dtypes[col] = np.asarray(values).dtype
+                f = self._files[col] = open(os.path.join(self._tmp_partition, f'{col}.npy'), 'wb')
+                np.lib.format.write_array_header_1_0(f, self._header(self._dtypes[col], 0))
+                self._data_offset = f.tell()
+        for col, f in self._files.items():
+            np.ascontiguousarray(columns[col], dtype=self._dtypes[col]).tofile(f)
+        self.start = time[0] if self.start is None else self.start
+        self.end = time[-1]
+        self.rows += time.shape[0]
+
+    def close(self) -> int:
+        """
+        Finish the files and swap the partition in.
+
+        :return: Number of rows written.
+        """
+        if not self._files:
+            self.abort()
+            raise ValueError(f'No bars were appended for "{self.symbol}" ({self.interval})')
+        for col, f in self._files.items():
+            f.seek(0)
+            # numpy pads the header for a growing row count, so its length does not change
+            np.lib.format.write_array_header_1_0(f, self._header(self._dtypes[col], self.rows))
+            if f.tell() != self._data_offset:
+                raise ValueError(f'The header of {col}.npy changed length')
+            f.close()
+        self.store._write_meta(self._tmp_partition, self.symbol, self.interval, list(self._files), self.rows, self.start, self.end, self.extra_meta)
+        self.store._swap_in(self.symbol, self.interval, self._tmp_partition)
+        return self.rows
+
+    def abort(self) -> None:
+        for f in self._files.values():
+            f.close()
+        shutil.rmtree(self._tmp_partition, ignore_errors=True)
+
+    def __enter__(self) -> 'PartitionWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
@@ -1,13 +1,36 @@
-from src.trading_funcs.indicators.sma import SMA
-from src.trading_funcs.indicators.stochastic_oscillator import StochasticOscillator
-from src.trading_funcs.indicators.rsi import RSI
-from src.trading_funcs.indicators.donchian_channels import DonchianChannels
-from src.trading_funcs.indicators.bollinger_bands import BollingerBands
+from src.utils.lazy import lazy_exports
+
+# submodules are imported on first attribute access, not with the package
+_EXPORTS = {
+    'SMA': 'src.trading_funcs.indicators.sma',
+    'StochasticOscillator': 'src.trading_funcs.indicators.stochastic_oscillator',
+    'RSI': 'src.trading_funcs.indicators.rsi',
+    'DonchianChannels': 'src.trading_funcs.indicators.donchian_channels',
+    'BollingerBands': 'src.trading_funcs.indicators.bollinger_bands',
+    'EMA': 'src.trading_funcs.indicators.ema',
+    'MACD': 'src.trading_funcs.indicators.macd',
+    'ATR': 'src.trading_funcs.indicators.atr',
+    'ADX': 'src.trading_funcs.indicators.adx',
+    'compute_indicators': 'src.trading_funcs.indicators.compute',
+    'compute_chunked': 'src.trading_funcs.indicators.chunked',
+    'IndicatorSpec': 'src.trading_funcs.indicators.registry',
+    'register': 'src.trading_funcs.indicators.registry'
+}
 
 __all__ = [
-    SMA,
-    StochasticOscillator,
-    RSI,
-    DonchianChannels,
-    BollingerBands
-]
\ No newline at end of file
+    'SMA',
+    'StochasticOscillator',
+    'RSI',
+    'DonchianChannels',
+    'BollingerBands',
+    'EMA',
+    'MACD',
+    'ATR',
+    'ADX',
+    'compute_indicators',
+    'compute_chunked',
+    'IndicatorSpec',
+    'register'
+]
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
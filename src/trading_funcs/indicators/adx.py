@@ -0,0 +1,70 @@
+from typing import Optional, TYPE_CHECKING
+import numpy as np
+import pandas as pd
+from src.trading_funcs.indicators import compute
+from src.trading_funcs.indicators.kernels import settling_bars
+from src.trading_funcs.indicators.streaming import ADXState
+from src.trading_funcs.indicators.base import IndicatorBase
+from src.trading_funcs.indicators.features import FeatureCache
+
+if TYPE_CHECKING:
+    from lightweight_charts import Chart
+    from src.trading_funcs.charting.decimation import Decimator
+
+
+class ADX(IndicatorBase):
+    """
+    Average Directional Index (ADX) indicator class.
+    This class calculates the ADX and the +DI/-DI lines based on the provided DataFrame.
+
+    :param period: Bars of Wilder smoothing, applied to the directional movement and again to DX.
+    """
+
+    stream_columns = ('high', 'low', 'close')
+
+    def __init__(self, chart: Optional['Chart'] = None, name: str = "ADX", period: int = 14):
+        self.period = int(period)
+        # DX settles with the smoothed movements, then ADX with DX
+        self.warmup = 2 * settling_bars(1.0 / self.period, self.period) + 1
+        super().__init__(name, chart)
+        self.adx_line = self.create_line(name='ADX', color=self.color.get('adx_line'), width=1, price_line=False, price_label=False, price_scale_id='adx')
+        self.plus_di_line = self.create_line(name='+DI', color=self.color.get('adx_plus_di'), width=1, price_line=False, price_label=False, price_scale_id='adx')
+        self.minus_di_line = self.create_line(name='-DI', color=self.color.get('adx_minus_di'), width=1, price_line=False, price_label=False, price_scale_id='adx')
+        self.place_scale('adx')
+
+    @staticmethod
+    def compute(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14, features: Optional[FeatureCache] = None) -> dict[str, np.ndarray]:
+        return compute.adx(high, low, close, period, features=features)
+
+    def reset_stream(self) -> None:
+        self.adx_state = ADXState(period=self.period)
+
+    def stream_update(self, high: float, low: float, close: float) -> dict[str, float]:
+        result = self.adx_state.update(high, low, close)
+        return {
+            'ADX': self.fill_point(result['adx']),
+            '+DI': self.fill_point(result['plus_di']),
+            '-DI': self.fill_point(result['minus_di'])
+        }
+
+    def calculate_indicator_df(self, df: pd.DataFrame, period=None, features: Optional[FeatureCache] = None) -> pd.DataFrame:
+        """
+        Calculate the ADX DataFrame based on the provided DataFrame.
+        """
+
+        features = features if features is not None else FeatureCache(df)
+        period = self.period if period is None else period
+        result = self.compute(features.column('high'), features.column('low'), features.column('close'), period=period, features=features)
+        return pd.DataFrame({
+            'time': df['time'],
+            'ADX': result['adx'],
+            '+DI': result['plus_di'],
+            '-DI': result['minus_di']
+        }, index=df.index).fillna(0)
+
+    def prepare(self, data: pd.DataFrame, features: Optional[FeatureCache] = None, decimator: Optional['Decimator'] = None) -> dict[str, pd.DataFrame]:
+        """
+        Compute the frames of the ADX, +DI and -DI lines, keyed by line name.
+        """
+        adx_data = self.display(self.calculate_indicator_df(data, features=features), decimator)
+        return dict.fromkeys(('ADX', '+DI', '-DI'), adx_data)
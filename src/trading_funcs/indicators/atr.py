@@ -0,0 +1,60 @@
+from typing import Optional, TYPE_CHECKING
+import numpy as np
+import pandas as pd
+from src.trading_funcs.indicators import compute
+from src.trading_funcs.indicators.kernels import settling_bars
+from src.trading_funcs.indicators.streaming import ATRState
+from src.trading_funcs.indicators.base import IndicatorBase
+from src.trading_funcs.indicators.features import FeatureCache
+
+if TYPE_CHECKING:
+    from lightweight_charts import Chart
+    from src.trading_funcs.charting.decimation import Decimator
+
+
+class ATR(IndicatorBase):
+    """
+    Average True Range (ATR) indicator class.
+    This class calculates the ATR based on the provided DataFrame.
+
+    :param period: Bars of Wilder smoothing of the true range; the line is named after `name`.
+    """
+
+    stream_columns = ('high', 'low', 'close')
+
+    def __init__(self, chart: Optional['Chart'] = None, name: str = "ATR", period: int = 14):
+        self.period = int(period)
+        # one more bar for the previous close of the first true range
+        self.warmup = settling_bars(1.0 / self.period, self.period) + 1
+        super().__init__(name, chart)
+        self.atr_line = self.create_line(name=self.name, color=self.color.get('atr_line'), width=1, price_line=False, price_label=False, price_scale_id='atr')
+        self.place_scale('atr')
+
+    @staticmethod
+    def compute(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14, features: Optional[FeatureCache] = None) -> dict[str, np.ndarray]:
+        return compute.atr(high, low, close, period, features=features)
+
+    def reset_stream(self) -> None:
+        self.atr_state = ATRState(period=self.period)
+
+    def stream_update(self, high: float, low: float, close: float) -> dict[str, float]:
+        return {self.name: self.fill_point(self.atr_state.update(high, low, close)['atr'])}
+
+    def calculate_indicator_df(self, df: pd.DataFrame, period=None, features: Optional[FeatureCache] = None) -> pd.DataFrame:
+        """
+        Calculate the ATR DataFrame based on the provided DataFrame.
+        """
+
+        features = features if features is not None else FeatureCache(df)
+        period = self.period if period is None else period
+        result = self.compute(features.column('high'), features.column('low'), features.column('close'), period=period, features=features)
+        return pd.DataFrame({
+            'time': df['time'],
+            self.name: result['atr']
+        }, index=df.index).fillna(0)
+
+    def prepare(self, data: pd.DataFrame, features: Optional[FeatureCache] = None, decimator: Optional['Decimator'] = None) -> dict[str, pd.DataFrame]:
+        """
+        Compute the frames of the ATR line, keyed by line name.
+        """
+        return {self.name: self.display(self.calculate_indicator_df(data, features=features), decimator)}
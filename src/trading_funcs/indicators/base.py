@@ -1,27 +1,192 @@
+import copy
+import math
+from typing import Optional, TYPE_CHECKING
+import numpy as np
 import pandas as pd
-from src.settings.consts import indicator_config
+from src.settings.consts import load_config
+from src.utils.instrumentation import span
+
+if TYPE_CHECKING:
+    from lightweight_charts import Chart
+    from src.trading_funcs.charting.decimation import Decimator
+
+# lightweight_charts' own default, for lines without a colour in the config
+DEFAULT_LINE_COLOUR = 'rgba(214, 237, 255, 0.6)'
 
 
 class IndicatorBase:
     """
     Base class for all indicators.
     This class should be inherited by all indicator classes.
+
+    The numbers come from `compute`, a pure NumPy function with no Chart dependency,
+    so indicators can run headless. When a chart is given, the subclass also
+    renders its lines on it.
     """
 
-    def __init__(self, name: str):
+    # price columns fed to `stream_update`, and how many trailing bars prime the streaming state
+    stream_columns: tuple[str, ...] = ('close',)
+    warmup: int = 0
+
+    def __init__(self, name: str, chart: Optional['Chart'] = None):
         self.name = name
-        self.color = indicator_config.get('colour')
+        self.chart = chart
+        self.color = load_config().get('colour')
+        self.lines = {}
+        self.levels = []
+        self.reset_stream()
+
+    @property
+    def headless(self) -> bool:
+        return self.chart is None
+
+    @staticmethod
+    def compute(*arrays: np.ndarray, **params) -> dict[str, np.ndarray]:
+        """
+        Compute the indicator arrays from NumPy input arrays.
+        This method should be implemented by subclasses.
+        """
+        raise NotImplementedError("Subclasses should implement this method.")
 
-    def calculate_indicator_df(df: pd.DataFrame) -> pd.DataFrame:
+    def calculate_indicator_df(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Calculate the indicator DataFrame based on the provided DataFrame.
         This method should be implemented by subclasses.
         """
         raise NotImplementedError("Subclasses should implement this method.")
 
-    def create(self, data):
+    def create_line(self, **kwargs):
+        """
+        Create a line series on the chart, or nothing when running headless.
+        """
+        if self.headless:
+            return None
+        line = self.chart.create_line(**kwargs)
+        self.lines[kwargs['name']] = line
+        return line
+
+    def create_level(self, price: float, color: str):
+        """
+        Draw a constant level once as a horizontal line instead of a per-bar series.
+        """
+        if self.headless:
+            return None
+        level = self.chart.horizontal_line(price, color=color, width=1, axis_label_visible=False)
+        self.levels.append(level)
+        return level
+
+    def place_scale(self, price_scale_id: str, top: float = 0.8, bottom: float = 0.0) -> None:
+        """
+        Confine the lines on their own price scale (values in price units that
+        cannot share the shifted oscillator scale) to a band of the chart, the
+        bottom fifth by default.
+        """
+        if self.headless:
+            return
+        self.chart.run_script(f'{self.chart.id}.chart.priceScale("{price_scale_id}").applyOptions({{scaleMargins: {{top: {top}, bottom: {bottom}}}}})')
+
+    def remove(self) -> None:
+        """
+        Delete the line series and levels of this indicator from the chart.
+        """
+        for line in self.lines.values():
+            line.delete()
+        for level in self.levels:
+            level.delete()
+        self.lines, self.levels = {}, []
+
+    @staticmethod
+    def display(data: pd.DataFrame, decimator: Optional['Decimator'] = None) -> pd.DataFrame:
+        """
+        The frame actually pushed to the chart: reduced to the point budget when a decimator is active.
+        """
+        return data if decimator is None else decimator.lines(data)
+
+    def prepare(self, data, features=None, decimator=None) -> dict[str, pd.DataFrame]:
         """
-        Calculate the indicator value based on the provided data.
+        Calculate the frames drawn by each line, keyed by line name.
+        `features` is an optional FeatureCache shared with the other indicators of the same data,
+        `decimator` an optional Decimator that reduces what is pushed to the chart.
+        It touches neither the chart nor the streaming state, so it can run on a worker thread.
         This method should be implemented by subclasses.
         """
-        raise NotImplementedError("Subclasses should implement this method.")
\ No newline at end of file
+        raise NotImplementedError("Subclasses should implement this method.")
+
+    def draw(self, frames: dict[str, pd.DataFrame]) -> None:
+        """
+        Push frames returned by `prepare` to the line series.
+        """
+        if self.headless:
+            return
+        with span('chart.push'):
+            for line_name, line in self.lines.items():
+                line.set(frames[line_name])
+
+    def create(self, data, features=None, decimator=None):
+        """
+        Calculate the indicator on the data, rebuild the streaming state and draw the lines.
+        """
+        frames = self.prepare(data, features=features, decimator=None if self.headless else decimator)
+        self.prime(data)
+        self.draw(frames)
+
+    def reset_stream(self) -> None:
+        """
+        Reset the streaming state used by `update`.
+        This method should be implemented by subclasses.
+        """
+        raise NotImplementedError("Subclasses should implement this method.")
+
+    def stream_update(self, *values: float) -> dict[str, float]:
+        """
+        Feed one bar's `stream_columns` values into the streaming state and
+        return the new point of every line, keyed by line name.
+        This method should be implemented by subclasses.
+        """
+        raise NotImplementedError("Subclasses should implement this method.")
+
+    @staticmethod
+    def fill_point(value: float) -> float:
+        """
+        Streaming counterpart of the `fillna(0)` applied to the indicator DataFrames.
+        """
+        return 0.0 if math.isnan(value) else value
+
+    def prime(self, data: pd.DataFrame) -> None:
+        """
+        Rebuild the streaming state from the last `warmup` bars of the data.
+        """
+        self.reset_stream()
+        for values in data[list(self.stream_columns)].tail(self.warmup).to_numpy(dtype=np.float64):
+            self.stream_update(*values)
+
+    def update(self, bar: pd.Series) -> dict[str, float]:
+        """
+        Push one new bar: O(1) state update, then only the new point goes to each line.
+        """
+        points = self.stream_update(*(float(bar[col]) for col in self.stream_columns))
+        self._push_points(bar['time'], points)
+        return points
+
+    def preview(self, bar: pd.Series) -> dict[str, float]:
+        """
+        Show the points of a bar that is still open, without committing it: the
+        update runs on copies of the streaming states (the `*_state` attributes
+        set by `reset_stream`), so the next `update` or `preview` starts from the
+        last closed bar again.
+        """
+        committed = {name: state for name, state in vars(self).items() if name.endswith('_state')}
+        for name, state in committed.items():
+            setattr(self, name, copy.deepcopy(state))
+        try:
+            points = self.stream_update(*(float(bar[col]) for col in self.stream_columns))
+        finally:
+            vars(self).update(committed)
+        self._push_points(bar['time'], points)
+        return points
+
+    def _push_points(self, time, points: dict[str, float]) -> None:
+        if self.headless:
+            return
+        for line_name, value in points.items():
+            self.lines[line_name].update(pd.Series({'time': time, line_name: value}))
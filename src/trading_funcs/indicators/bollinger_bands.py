@@ -1,46 +1,66 @@
-from typing import Any
+from typing import Optional, TYPE_CHECKING
+import numpy as np
 import pandas as pd
-from lightweight_charts import Chart
+from src.trading_funcs.indicators import compute
+from src.trading_funcs.indicators.streaming import BollingerBandsState
 from src.trading_funcs.indicators.base import IndicatorBase
+from src.trading_funcs.indicators.features import FeatureCache
+
+if TYPE_CHECKING:
+    from lightweight_charts import Chart
+    from src.trading_funcs.charting.decimation import Decimator
 
 
 class BollingerBands(IndicatorBase):
     """
     Bollinger bands indicator class.
     This class calculates the Bollinger bands based on the provided DataFrame.
+
+    :param period: Window of the mean and standard deviation; lines are named '<Upper|Mean|Lower> Bollinger <period>'.
+    :param num_std_dev: Band width in standard deviations.
     """
 
-    def __init__(self, chart: Chart, name: str = "Bollinger bands"):
-        super().__init__(name)
-        self.chart = chart
-        self.bollinger20_upper_line = chart.create_line(name='Upper Bollinger 20', color=self.color.get('bollinger_upper'), width=1, price_line=False, price_label=False)
-        self.bollinger20_lower_line = chart.create_line(name='Lower Bollinger 20', color=self.color.get('bollinger_lower'), width=1, price_line=False, price_label=False)
-        self.bollinger20_mean_line = chart.create_line(name='Mean Bollinger 20', color=self.color.get('bollinger_mean'), width=1, price_line=False, price_label=False)
+    def __init__(self, chart: Optional['Chart'] = None, name: str = "Bollinger bands", period: int = 20, num_std_dev: float = 2):
+        self.period = int(period)
+        self.num_std_dev = num_std_dev
+        self.warmup = self.period
+        super().__init__(name, chart)
+        self.upper_line = self.create_line(name=f'Upper Bollinger {self.period}', color=self.color.get('bollinger_upper'), width=1, price_line=False, price_label=False)
+        self.lower_line = self.create_line(name=f'Lower Bollinger {self.period}', color=self.color.get('bollinger_lower'), width=1, price_line=False, price_label=False)
+        self.mean_line = self.create_line(name=f'Mean Bollinger {self.period}', color=self.color.get('bollinger_mean'), width=1, price_line=False, price_label=False)
+
+    @staticmethod
+    def compute(close: np.ndarray, period: int = 20, num_std_dev: int = 2, features: Optional[FeatureCache] = None) -> dict[str, np.ndarray]:
+        return compute.bollinger_bands(close, period, num_std_dev, features=features)
+
+    def reset_stream(self) -> None:
+        self.bollinger_state = BollingerBandsState(period=self.period, num_std_dev=self.num_std_dev)
 
-    def calculate_indicator_df(self, df: pd.DataFrame, period: int = 20, num_std_dev: int = 2) -> pd.DataFrame:
+    def stream_update(self, close: float) -> dict[str, float]:
+        result = self.bollinger_state.update(close)
+        return {
+            f'Upper Bollinger {self.period}': self.fill_point(result['upper']),
+            f'Mean Bollinger {self.period}': self.fill_point(result['mean']),
+            f'Lower Bollinger {self.period}': self.fill_point(result['lower'])
+        }
+
+    def calculate_indicator_df(self, df: pd.DataFrame, period: int = 20, num_std_dev: int = 2, features: Optional[FeatureCache] = None) -> pd.DataFrame:
         """
         Calculate the Bollinger bands DataFrame based on the provided DataFrame.
         """
         
-        sma = df['close'].rolling(window=period).mean()
-        rolling_std = df['close'].rolling(window=period).std()
-        upper_band = sma + (rolling_std * num_std_dev)
-        lower_band = sma - (rolling_std * num_std_dev)     
-
+        features = features if features is not None else FeatureCache(df)
+        result = self.compute(features.column('close'), period=period, num_std_dev=num_std_dev, features=features)
         return pd.DataFrame({
             'time': df['time'],
-            f'Upper Bollinger {period}': upper_band.fillna(0),
-            f'Mean Bollinger {period}': sma.fillna(0),
-            f'Lower Bollinger {period}': lower_band.fillna(0)
-        })
+            f'Upper Bollinger {period}': result['upper'],
+            f'Mean Bollinger {period}': result['mean'],
+            f'Lower Bollinger {period}': result['lower']
+        }, index=df.index).fillna(0)
     
-    def create(self, data: pd.DataFrame) -> None:
+    def prepare(self, data: pd.DataFrame, features: Optional[FeatureCache] = None, decimator: Optional['Decimator'] = None) -> dict[str, pd.DataFrame]:
         """
-        Create the Bollinger bands indicator on the provided chart.
-        This method should be implemented by subclasses.
+        Compute the frames of the Bollinger bands, keyed by line name.
         """
-        
-        bollinger20_data = self.calculate_indicator_df(data, period=20, num_std_dev=2) 
-        self.bollinger20_upper_line.set(bollinger20_data)
-        self.bollinger20_lower_line.set(bollinger20_data)
-        self.bollinger20_mean_line.set(bollinger20_data)
\ No newline at end of file
+        bollinger_data = self.display(self.calculate_indicator_df(data, period=self.period, num_std_dev=self.num_std_dev, features=features), decimator)
+        return dict.fromkeys((f'Upper Bollinger {self.period}', f'Lower Bollinger {self.period}', f'Mean Bollinger {self.period}'), bollinger_data)
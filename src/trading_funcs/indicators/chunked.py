@@ -0,0 +1,78 @@
+"""
+Out-of-core indicator computation: `compute_indicators` over a history that
+arrives in blocks (e.g. from `BarStore.iter_blocks`), so only one block and a
+few bars before it are in memory at a time, however long the history.
+
+State is carried across block boundaries in two ways. Rolling windows get a
+halo: the last `INDICATOR_LOOKBACK` bars of the previous blocks are computed
+again in front of each block, so every window inside the block is complete.
+Exponential averages depend on the whole history, so they carry their running
+state (`kernels.ewm_mean_carry`) from block to block instead. The lines equal
+those of one in-memory `compute_indicators` call up to rounding.
+
+    blocks = store.iter_blocks('AAPL', '1s', 1_000_000, columns=['high', 'low', 'close'])
+    with BarStore('./lines').writer('AAPL', '1s') as writer:
+        for lines in compute_chunked(blocks):
+            writer.append(lines)
+"""
+
+from typing import Iterable, Iterator
+import numpy as np
+from src.trading_funcs.indicators import kernels
+from src.trading_funcs.indicators.compute import INDICATOR_LOOKBACK, compute_indicators
+from src.trading_funcs.indicators.features import FeatureCache
+
+
+class CarriedFeatures(FeatureCache):
+    """
+    FeatureCache of one block preceded by `halo` bars of the blocks before it.
+
+    Rolling primitives are computed over the halo as usual. Exponential ones run
+    over the block only, continuing from the states the previous block left in
+    `states` (keyed like the cache and updated in place); their halo bars are NaN.
+    """
+
+    # smoothing factor of the exponential operations for a window
+    ALPHAS = {
+        'ema': lambda window: 2.0 / (window + 1),
+        'wilder': lambda window: 1.0 / window
+    }
+
+    def __init__(self, halo: int, states: dict, **columns: np.ndarray):
+        super().__init__(**columns)
+        self.halo = halo
+        self.states = states
+
+    def _compute(self, column: str, operation: str, window: int) -> np.ndarray:
+        if operation not in self.ALPHAS:
+            return super()._compute(column, operation, window)
+        key = (column, operation, window)
+        values = self.column(column)
+        out = np.full(values.shape, np.nan)
+        out[..., self.halo:], self.states[key] = kernels.ewm_mean_carry(values[..., self.halo:], self.ALPHAS[operation](window), window, self.states.get(key))
+        return out
+
+
+def compute_chunked(blocks: Iterable[dict[str, np.ndarray]], halo: int = INDICATOR_LOOKBACK, dtype: str = 'float64') -> Iterator[dict[str, np.ndarray]]:
+    """
+    `compute_indicators` block by block, along the last axis.
+
+    :param blocks: Consecutive bars as dicts with `time`, `high`, `low` and `close` arrays.
+    :param halo: Bars of the previous blocks every block is computed with; at
+        least the lookback of the rolling lines.
+    :return: Per block, its `time` and one array per line (in `dtype`), ready for `PartitionWriter.append`.
+    """
+    states = {}
+    tail = None
+    for block in blocks:
+        n = block['time'].shape[0]
+        if n == 0:
+            continue
+        columns = {col: kernels.as_float_array(block[col]) for col in ('high', 'low', 'close')}
+        if tail is not None:
+            columns = {col: np.concatenate((tail[col], values), axis=-1) for col, values in columns.items()}
+        lead = columns['close'].shape[-1] - n
+        lines = compute_indicators(columns['high'], columns['low'], columns['close'], features=CarriedFeatures(lead, states, **columns))
+        yield {'time': block['time'], **{name: np.ascontiguousarray(values[..., lead:], dtype=dtype) for name, values in lines.items()}}
+        # copies, so the block itself is released
+        tail = {col: values[..., max(values.shape[-1] - halo, 0):].copy() for col, values in columns.items()}
@@ -0,0 +1,282 @@
+"""
+Headless compute layer for the indicators.
+
+Every function takes NumPy arrays and returns NumPy arrays (or a dict of them),
+so batch jobs can compute indicators without importing lightweight_charts or
+building a Chart. Warm-up bars are NaN, matching pandas `rolling()` with the
+default `min_periods`. Inputs may also be (symbols, bars) panels: windows run
+along the last axis, so a whole universe is computed in one call.
+
+The exponential indicators (EMA, MACD, Wilder's RSI, ATR and ADX) are seeded
+with the simple mean of their first `period` values, as in TA-Lib, and run on
+the blocked recursive-filter kernel, so they cost about as much as the rolling ones.
+"""
+
+import numpy as np
+from src.trading_funcs.indicators.features import FeatureCache
+from src.trading_funcs.indicators.kernels import (
+    as_float_array,
+    rolling_sum,
+    rolling_mean,
+    rolling_std,
+    rolling_max,
+    rolling_min,
+    rolling_sum_multi,
+    rolling_mean_multi,
+    rolling_std_multi,
+    rolling_max_multi,
+    rolling_min_multi,
+    rsi_multi
+)
+
+
+def _features(features: FeatureCache | None, **columns) -> FeatureCache:
+    # a throwaway cache when the caller does not share one
+    return features if features is not None else FeatureCache(**columns)
+
+
+def sma(close, period: int = 20, features: FeatureCache | None = None) -> dict[str, np.ndarray]:
+    features = _features(features, close=close)
+    return {'sma': features.rolling('close', 'mean', period)}
+
+
+def ema(close, period: int = 20, features: FeatureCache | None = None) -> dict[str, np.ndarray]:
+    features = _features(features, close=close)
+    return {'ema': features.rolling('close', 'ema', period)}
+
+
+def macd(close, fast: int = 12, slow: int = 26, signal: int = 9, features: FeatureCache | None = None) -> dict[str, np.ndarray]:
+    """
+    MACD line (fast EMA - slow EMA), its `signal`-bar EMA and their difference.
+    """
+
+    features = _features(features, close=close)
+    line = features.derive(f'macd_{fast}_{slow}', lambda f: f.rolling('close', 'ema', fast) - f.rolling('close', 'ema', slow))
+    signal_line = features.rolling(f'macd_{fast}_{slow}', 'ema', signal)
+    return {
+        'macd': line,
+        'signal': signal_line,
+        'histogram': line - signal_line
+    }
+
+
+def bollinger_bands(close, period: int = 20, num_std_dev: float = 2, features: FeatureCache | None = None) -> dict[str, np.ndarray]:
+    features = _features(features, close=close)
+    mean = features.rolling('close', 'mean', period)
+    std = features.rolling('close', 'std', period)
+    return {
+        'upper': mean + std * num_std_dev,
+        'mean': mean,
+        'lower': mean - std * num_std_dev
+    }
+
+
+def donchian_channels(high, low, period: int = 20, features: FeatureCache | None = None) -> dict[str, np.ndarray]:
+    features = _features(features, high=high, low=low)
+    upper = features.rolling('high', 'max', period)
+    lower = features.rolling('low', 'min', period)
+    return {
+        'upper': upper,
+        'mean': (upper + lower) / 2,
+        'lower': lower
+    }
+
+
+def _close_delta(features: FeatureCache) -> np.ndarray:
+    close = features.column('close')
+    delta = np.zeros_like(close)
+    delta[..., 1:] = np.diff(close, axis=-1)
+    return delta
+
+
+def _close_change(features: FeatureCache) -> np.ndarray:
+    # like `_close_delta`, but the first bar has no previous close
+    close = features.column('close')
+    change = np.full_like(close, np.nan)
+    change[..., 1:] = np.diff(close, axis=-1)
+    return change
+
+
+def _previous(values: np.ndarray) -> np.ndarray:
+    previous = np.full_like(values, np.nan)
+    previous[..., 1:] = values[..., :-1]
+    return previous
+
+
+def _true_range(features: FeatureCache) -> np.ndarray:
+    high, low = features.column('high'), features.column('low')
+    previous_close = _previous(features.column('close'))
+    # NaN on the first bar, which has no previous close
+    return np.maximum(high - low, np.maximum(np.abs(high - previous_close), np.abs(low - previous_close)))
+
+
+def _directional_movement(features: FeatureCache, plus: bool) -> np.ndarray:
+    # +DM (or -DM): the up (down) move when it exceeds the opposite move, else 0
+    high, low = features.column('high'), features.column('low')
+    up, down = high - _previous(high), _previous(low) - low
+    move, other = (up, down) if plus else (down, up)
+    movement = np.where((move > other) & (move > 0), move, 0.0)
+    movement[np.isnan(move)] = np.nan
+    return movement
+
+
+def rsi(close, period: int = 14, smoothing: str = 'wilder', features: FeatureCache | None = None) -> dict[str, np.ndarray]:
+    """
+    RSI (0..100 scale) from averaged gains and losses.
+
+    :param smoothing: 'wilder' (Wilder's exponential mean, as in TA-Lib; the first
+        value is on bar `period`) or 'simple' (rolling means, as in the original
+        pandas version, where the first bar counts as no change).
+    """
+
+    features = _features(features, close=close)
+    if smoothing == 'wilder':
+        change = features.derive('close_change', _close_change)
+        features.derive('advance', lambda _: np.maximum(change, 0.0))
+        features.derive('decline', lambda _: np.maximum(-change, 0.0))
+        gain = features.rolling('advance', 'wilder', period)
+        loss = features.rolling('decline', 'wilder', period)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            value = 100 * gain / (gain + loss)
+        return {'rsi': value}
+    if smoothing != 'simple':
+        raise ValueError(f'Unknown RSI smoothing "{smoothing}"; expected "wilder" or "simple"')
+
+    delta = features.derive('close_delta', _close_delta)
+    features.derive('gain', lambda _: np.where(delta > 0, delta, 0.0))
+    features.derive('loss', lambda _: np.where(delta < 0, -delta, 0.0))
+    # plain prefix sums (no centring) keep all-zero windows exactly zero
+    gain = features.rolling('gain', 'sum', period)
+    loss = features.rolling('loss', 'sum', period)
+    # 100 - 100 / (1 + gain / loss), written so that loss == 0 gives 100 without inf
+    with np.errstate(divide='ignore', invalid='ignore'):
+        value = 100 * gain / (gain + loss)
+    return {'rsi': value}
+
+
+def stochastic_oscillator(high, low, close, period: int = 14, smooth: int = 3, features: FeatureCache | None = None) -> dict[str, np.ndarray]:
+    """
+    Stochastic %K/%D (0..100 scale).
+    """
+
+    features = _features(features, high=high, low=low, close=close)
+    low_min = features.rolling('low', 'min', period)
+    high_max = features.rolling('high', 'max', period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        k_percent = 100 * ((features.column('close') - low_min) / (high_max - low_min))
+    return {
+        'k': k_percent,
+        'd': rolling_mean(k_percent, smooth)
+    }
+
+
+def atr(high, low, close, period: int = 14, features: FeatureCache | None = None) -> dict[str, np.ndarray]:
+    """
+    Average true range: Wilder's mean of the true range, first value on bar `period`.
+    """
+
+    features = _features(features, high=high, low=low, close=close)
+    features.derive('true_range', _true_range)
+    return {'atr': features.rolling('true_range', 'wilder', period)}
+
+
+def adx(high, low, close, period: int = 14, features: FeatureCache | None = None) -> dict[str, np.ndarray]:
+    """
+    Average directional index with the +DI/-DI lines (0..100 scale), Wilder's
+    smoothing throughout; the DI lines start on bar `period`, ADX on bar `2 * period - 1`.
+    """
+
+    features = _features(features, high=high, low=low, close=close)
+    features.derive('true_range', _true_range)
+    features.derive('plus_dm', lambda f: _directional_movement(f, plus=True))
+    features.derive('minus_dm', lambda f: _directional_movement(f, plus=False))
+    true_range = features.rolling('true_range', 'wilder', period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # no range at all counts as no direction rather than 0 / 0
+        plus_di = np.where(true_range == 0, 0.0, 100 * features.rolling('plus_dm', 'wilder', period) / true_range)
+        minus_di = np.where(true_range == 0, 0.0, 100 * features.rolling('minus_dm', 'wilder', period) / true_range)
+        total = plus_di + minus_di
+        dx = np.where(total == 0, 0.0, 100 * np.abs(plus_di - minus_di) / total)
+    features.derive(f'dx_{period}', lambda _: dx)
+    return {
+        'adx': features.rolling(f'dx_{period}', 'wilder', period),
+        'plus_di': plus_di,
+        'minus_di': minus_di
+    }
+
+
+# line names of `compute_indicators`, in output order
+INDICATOR_LINES = (
+    'SMA 9', 'SMA 4', '%K', '%D', 'RSI',
+    'Upper Donchian 20', 'Mean Donchian 20', 'Lower Donchian 20',
+    'Upper Bollinger 20', 'Mean Bollinger 20', 'Lower Bollinger 20',
+    'EMA 12', 'EMA 26', 'MACD', 'MACD signal', 'MACD histogram',
+    'ATR', 'ADX', '+DI', '-DI'
+)
+
+
+# earlier bars a value of `compute_indicators` spans (the 20-bar Bollinger and
+# Donchian windows), not counting the running state of its exponential averages
+INDICATOR_LOOKBACK = 19
+
+
+def allocate_lines(n_bars: int, names: tuple[str, ...] = INDICATOR_LINES, dtype: str = 'float64') -> dict[str, np.ndarray]:
+    """
+    Preallocate one NaN-filled output array per line, e.g. to reuse across
+    symbols or to hold float32 results; warm-up bars stay NaN once filled.
+    """
+    block = np.full((len(names), n_bars), np.nan, dtype=dtype)
+    return dict(zip(names, block))
+
+
+def compute_indicators(high, low, close, out: dict[str, np.ndarray] | None = None, features: FeatureCache | None = None) -> dict[str, np.ndarray]:
+    """
+    Compute the default indicator set used by StockChart in one call.
+    Intended for headless batch runs; keys are the chart line names.
+
+    :param out: Preallocated arrays (see `allocate_lines`) to write the lines into
+        instead of returning the shared feature arrays; warm-up bars are NaN.
+    :param features: A FeatureCache over the same bars to compute on, e.g. the
+        block cache of `compute_chunked`.
+    """
+
+    features = _features(features, high=high, low=low, close=close)
+    sma9 = sma(close, 9, features=features)['sma']
+    sma4 = sma(close, 4, features=features)['sma']
+    stochastic = stochastic_oscillator(high, low, close, 14, features=features)
+    rsi14 = rsi(close, 14, features=features)['rsi']
+    donchian = donchian_channels(high, low, 20, features=features)
+    bollinger = bollinger_bands(close, 20, 2, features=features)
+    ema12 = ema(close, 12, features=features)['ema']
+    ema26 = ema(close, 26, features=features)['ema']
+    macd_lines = macd(close, 12, 26, 9, features=features)
+    atr14 = atr(high, low, close, 14, features=features)['atr']
+    adx14 = adx(high, low, close, 14, features=features)
+    lines = {
+        'SMA 9': sma9,
+        'SMA 4': sma4,
+        '%K': stochastic['k'],
+        '%D': stochastic['d'],
+        'RSI': rsi14,
+        'Upper Donchian 20': donchian['upper'],
+        'Mean Donchian 20': donchian['mean'],
+        'Lower Donchian 20': donchian['lower'],
+        'Upper Bollinger 20': bollinger['upper'],
+        'Mean Bollinger 20': bollinger['mean'],
+        'Lower Bollinger 20': bollinger['lower'],
+        'EMA 12': ema12,
+        'EMA 26': ema26,
+        'MACD': macd_lines['macd'],
+        'MACD signal': macd_lines['signal'],
+        'MACD histogram': macd_lines['histogram'],
+        'ATR': atr14,
+        'ADX': adx14['adx'],
+        '+DI': adx14['plus_di'],
+        '-DI': adx14['minus_di']
+    }
+    if out is None:
+        return lines
+    for name, values in lines.items():
+        if name in out:
+            np.copyto(out[name], values, casting='same_kind')
+    return out
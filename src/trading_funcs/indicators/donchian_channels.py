@@ -1,45 +1,66 @@
-from typing import Any
+from typing import Optional, TYPE_CHECKING
+import numpy as np
 import pandas as pd
-from lightweight_charts import Chart
+from src.trading_funcs.indicators import compute
+from src.trading_funcs.indicators.streaming import DonchianChannelsState
 from src.trading_funcs.indicators.base import IndicatorBase
+from src.trading_funcs.indicators.features import FeatureCache
+
+if TYPE_CHECKING:
+    from lightweight_charts import Chart
+    from src.trading_funcs.charting.decimation import Decimator
 
 
 class DonchianChannels(IndicatorBase):
     """
     Donchian channels  indicator class.
     This class calculates the Donchian channels based on the provided DataFrame.
+
+    :param period: Window of the highest high / lowest low; lines are named '<Upper|Mean|Lower> Donchian <period>'.
     """
 
-    def __init__(self, chart: Chart, name: str = "Donchian channels"):
-        super().__init__(name)
-        self.chart = chart
-        self.donchian20_upper_line = chart.create_line(name='Upper Donchian 20', color=self.color.get('donchian_upper'), width=1, price_line=False, price_label=False)
-        self.donchian20_lower_line = chart.create_line(name='Lower Donchian 20', color=self.color.get('donchian_lower'), width=1, price_line=False, price_label=False)
-        self.donchian20_mean_line = chart.create_line(name='Mean Donchian 20', color=self.color.get('donchian_mean'), width=1, price_line=False, price_label=False)
+    stream_columns = ('high', 'low')
+
+    def __init__(self, chart: Optional['Chart'] = None, name: str = "Donchian channels", period: int = 20):
+        self.period = int(period)
+        self.warmup = self.period
+        super().__init__(name, chart)
+        self.upper_line = self.create_line(name=f'Upper Donchian {self.period}', color=self.color.get('donchian_upper'), width=1, price_line=False, price_label=False)
+        self.lower_line = self.create_line(name=f'Lower Donchian {self.period}', color=self.color.get('donchian_lower'), width=1, price_line=False, price_label=False)
+        self.mean_line = self.create_line(name=f'Mean Donchian {self.period}', color=self.color.get('donchian_mean'), width=1, price_line=False, price_label=False)
+
+    @staticmethod
+    def compute(high: np.ndarray, low: np.ndarray, period: int = 20, features: Optional[FeatureCache] = None) -> dict[str, np.ndarray]:
+        return compute.donchian_channels(high, low, period, features=features)
 
-    def calculate_indicator_df(self, df: pd.DataFrame, period: int = 20) -> pd.DataFrame:
+    def reset_stream(self) -> None:
+        self.donchian_state = DonchianChannelsState(period=self.period)
+
+    def stream_update(self, high: float, low: float) -> dict[str, float]:
+        result = self.donchian_state.update(high, low)
+        return {
+            f'Upper Donchian {self.period}': self.fill_point(result['upper']),
+            f'Mean Donchian {self.period}': self.fill_point(result['mean']),
+            f'Lower Donchian {self.period}': self.fill_point(result['lower'])
+        }
+
+    def calculate_indicator_df(self, df: pd.DataFrame, period: int = 20, features: Optional[FeatureCache] = None) -> pd.DataFrame:
         """
         Calculate the Donchian channels DataFrame based on the provided DataFrame.
         """
         
-        high = df['high'].rolling(window=period).max()
-        low = df['low'].rolling(window=period).min()
-        mean = (high + low) / 2
-
+        features = features if features is not None else FeatureCache(df)
+        result = self.compute(features.column('high'), features.column('low'), period=period, features=features)
         return pd.DataFrame({
             'time': df['time'],
-            f'Upper Donchian {period}': high.fillna(0),
-            f'Mean Donchian {period}': mean.fillna(0),
-            f'Lower Donchian {period}': low.fillna(0)
-        })
+            f'Upper Donchian {period}': result['upper'],
+            f'Mean Donchian {period}': result['mean'],
+            f'Lower Donchian {period}': result['lower']
+        }, index=df.index).fillna(0)
     
-    def create(self, data: pd.DataFrame) -> None:
+    def prepare(self, data: pd.DataFrame, features: Optional[FeatureCache] = None, decimator: Optional['Decimator'] = None) -> dict[str, pd.DataFrame]:
         """
-        Create the Donchian channels indicator on the provided chart.
-        This method should be implemented by subclasses.
+        Compute the frames of the Donchian channels, keyed by line name.
         """
-        
-        donchian20_data = self.calculate_indicator_df(data, period=20)
-        self.donchian20_upper_line.set(donchian20_data)
-        self.donchian20_lower_line.set(donchian20_data)
-        self.donchian20_mean_line.set(donchian20_data)
\ No newline at end of file
+        donchian_data = self.display(self.calculate_indicator_df(data, period=self.period, features=features), decimator)
+        return dict.fromkeys((f'Upper Donchian {self.period}', f'Lower Donchian {self.period}', f'Mean Donchian {self.period}'), donchian_data)
@@ -0,0 +1,63 @@
+from typing import Optional, TYPE_CHECKING
+import numpy as np
+import pandas as pd
+from src.trading_funcs.indicators import compute
+from src.trading_funcs.indicators.kernels import settling_bars
+from src.trading_funcs.indicators.streaming import EMAState
+from src.trading_funcs.indicators.base import DEFAULT_LINE_COLOUR, IndicatorBase
+from src.trading_funcs.indicators.features import FeatureCache
+
+if TYPE_CHECKING:
+    from lightweight_charts import Chart
+    from src.trading_funcs.charting.decimation import Decimator
+
+
+class EMA(IndicatorBase):
+    """
+    EMA indicator class.
+    This class calculates exponential moving averages based on the provided DataFrame.
+
+    :param periods: One line per period, named 'EMA <period>' and coloured by the
+        `ema<period>` colour key.
+    """
+
+    def __init__(self, chart: Optional['Chart'] = None, name: str = "EMA", periods: tuple[int, ...] = (12, 26)):
+        self.periods = tuple(int(period) for period in periods)
+        # an average primed on this many bars matches one over the whole history
+        self.warmup = max(settling_bars(2.0 / (period + 1), period) for period in self.periods)
+        super().__init__(name, chart)
+        self.ema_lines = {
+            period: self.create_line(name=f'EMA {period}', color=self.color.get(f'ema{period}', DEFAULT_LINE_COLOUR), width=1, price_label=False)
+            for period in self.periods
+        }
+
+    @staticmethod
+    def compute(close: np.ndarray, period: int = 20, features: Optional[FeatureCache] = None) -> dict[str, np.ndarray]:
+        return compute.ema(close, period, features=features)
+
+    def reset_stream(self) -> None:
+        self.ema_state = {period: EMAState(period=period) for period in self.periods}
+
+    def stream_update(self, close: float) -> dict[str, float]:
+        return {f'EMA {period}': self.fill_point(state.update(close)['ema']) for period, state in self.ema_state.items()}
+
+    def calculate_indicator_df(self, df: pd.DataFrame, period: int = 20, features: Optional[FeatureCache] = None) -> pd.DataFrame:
+        """
+        Calculate the EMA DataFrame based on the provided DataFrame.
+        """
+
+        features = features if features is not None else FeatureCache(df)
+        result = self.compute(features.column('close'), period=period, features=features)
+        return pd.DataFrame({
+            'time': df['time'],
+            f'EMA {period}': result['ema']
+        }, index=df.index).fillna(0)
+
+    def prepare(self, data: pd.DataFrame, features: Optional[FeatureCache] = None, decimator: Optional['Decimator'] = None) -> dict[str, pd.DataFrame]:
+        """
+        Compute the frames of the EMA lines, keyed by line name.
+        """
+        return {
+            f'EMA {period}': self.display(self.calculate_indicator_df(data, period=period, features=features), decimator)
+            for period in self.periods
+        }
@@ -0,0 +1,82 @@
+from typing import Callable, TYPE_CHECKING
+import numpy as np
+from src.trading_funcs.indicators import kernels
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class FeatureCache:
+    """
+    Per-dataset cache of rolling and exponential primitives shared by the indicators.
+
+    Primitives are keyed by (column, operation, window) and computed at most once,
+    e.g. the 20-bar rolling mean of `close` serves both SMA and Bollinger, and the
+    rolling max of `high` serves both Donchian and Stochastic. Columns are read
+    from the source data without modifying it; series that are not source columns
+    (RSI gains, for instance) are registered once with `derive`.
+
+    Float64 source columns are used without a copy, so they must not be modified
+    while the cache is in use: primitives already computed would not follow the
+    edit. Build a new cache for changed data.
+    """
+
+    OPERATIONS = {
+        'sum': kernels.rolling_sum,
+        'mean': kernels.rolling_mean,
+        'std': kernels.rolling_std,
+        'max': kernels.rolling_max,
+        'min': kernels.rolling_min,
+        'ema': kernels.ema,
+        'wilder': kernels.wilder_mean
+    }
+
+    def __init__(self, data: 'pd.DataFrame | dict[str, np.ndarray] | None' = None, **columns: np.ndarray):
+        self.data = {} if data is None else data
+        self._columns = {name: _frozen(kernels.as_float_array(values)) for name, values in columns.items()}
+        self._features = {}
+        self.hits = 0
+        self.misses = 0
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Source column as a float64 array, converted once.
+        """
+        if name not in self._columns:
+            values = self.data[name]
+            values = values.to_numpy(dtype=np.float64) if hasattr(values, 'to_numpy') else kernels.as_float_array(values)
+            self._columns[name] = _frozen(values)
+        return self._columns[name]
+
+    def derive(self, name: str, func: Callable[['FeatureCache'], np.ndarray]) -> np.ndarray:
+        """
+        Register (once) and return a series computed from other columns.
+        """
+        if name not in self._columns:
+            self._columns[name] = _frozen(kernels.as_float_array(func(self)))
+        return self._columns[name]
+
+    def rolling(self, column: str, operation: str, window: int) -> np.ndarray:
+        """
+        Rolling `operation` ('sum', 'mean', 'std', 'max' or 'min') of a column, or
+        its exponential mean over `window` bars ('ema' or Wilder's 'wilder').
+        """
+        key = (column, operation, window)
+        if key in self._features:
+            self.hits += 1
+            return self._features[key]
+
+        self.misses += 1
+        values = self._features[key] = _frozen(self._compute(column, operation, window))
+        return values
+
+    def _compute(self, column: str, operation: str, window: int) -> np.ndarray:
+        return self.OPERATIONS[operation](self.column(column), window)
+
+
+def _frozen(values: np.ndarray) -> np.ndarray:
+    # read-only view, since the cached arrays are shared between indicators; the
+    # array itself (possibly the caller's own column) stays writeable
+    values = values.view()
+    values.flags.writeable = False
+    return values
@@ -0,0 +1,71 @@
+from typing import Optional, TYPE_CHECKING
+import numpy as np
+import pandas as pd
+from src.trading_funcs.indicators import compute
+from src.trading_funcs.indicators.kernels import settling_bars
+from src.trading_funcs.indicators.streaming import MACDState
+from src.trading_funcs.indicators.base import IndicatorBase
+from src.trading_funcs.indicators.features import FeatureCache
+
+if TYPE_CHECKING:
+    from lightweight_charts import Chart
+    from src.trading_funcs.charting.decimation import Decimator
+
+
+class MACD(IndicatorBase):
+    """
+    Moving Average Convergence Divergence (MACD) indicator class.
+    This class calculates the MACD, signal and histogram lines based on the provided DataFrame.
+
+    :param fast: Period of the fast EMA.
+    :param slow: Period of the slow EMA.
+    :param signal: Period of the EMA of the MACD line; lines are named `name`, '<name> signal' and '<name> histogram'.
+    """
+
+    def __init__(self, chart: Optional['Chart'] = None, name: str = "MACD", fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = int(fast)
+        self.slow = int(slow)
+        self.signal = int(signal)
+        # the signal average settles once the slower of the two price averages has
+        self.warmup = max(settling_bars(2.0 / (period + 1), period) for period in (self.fast, self.slow)) + settling_bars(2.0 / (self.signal + 1), self.signal)
+        super().__init__(name, chart)
+        self.macd_line = self.create_line(name=self.name, color=self.color.get('macd_line'), width=1, price_line=False, price_label=False, price_scale_id='macd')
+        self.signal_line = self.create_line(name=f'{self.name} signal', color=self.color.get('macd_signal'), width=1, price_line=False, price_label=False, price_scale_id='macd')
+        self.histogram_line = self.create_line(name=f'{self.name} histogram', color=self.color.get('macd_histogram'), width=1, price_line=False, price_label=False, price_scale_id='macd')
+        self.place_scale('macd')
+
+    @staticmethod
+    def compute(close: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9, features: Optional[FeatureCache] = None) -> dict[str, np.ndarray]:
+        return compute.macd(close, fast, slow, signal, features=features)
+
+    def reset_stream(self) -> None:
+        self.macd_state = MACDState(fast=self.fast, slow=self.slow, signal=self.signal)
+
+    def stream_update(self, close: float) -> dict[str, float]:
+        result = self.macd_state.update(close)
+        return {
+            self.name: self.fill_point(result['macd']),
+            f'{self.name} signal': self.fill_point(result['signal']),
+            f'{self.name} histogram': self.fill_point(result['histogram'])
+        }
+
+    def calculate_indicator_df(self, df: pd.DataFrame, features: Optional[FeatureCache] = None) -> pd.DataFrame:
+        """
+        Calculate the MACD DataFrame based on the provided DataFrame.
+        """
+
+        features = features if features is not None else FeatureCache(df)
+        result = self.compute(features.column('close'), fast=self.fast, slow=self.slow, signal=self.signal, features=features)
+        return pd.DataFrame({
+            'time': df['time'],
+            self.name: result['macd'],
+            f'{self.name} signal': result['signal'],
+            f'{self.name} histogram': result['histogram']
+        }, index=df.index).fillna(0)
+
+    def prepare(self, data: pd.DataFrame, features: Optional[FeatureCache] = None, decimator: Optional['Decimator'] = None) -> dict[str, pd.DataFrame]:
+        """
+        Compute the frames of the MACD, signal and histogram lines, keyed by line name.
+        """
+        macd_data = self.display(self.calculate_indicator_df(data, features=features), decimator)
+        return dict.fromkeys((self.name, f'{self.name} signal', f'{self.name} histogram'), macd_data)
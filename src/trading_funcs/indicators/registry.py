@@ -0,0 +1,109 @@
+"""
+Indicator registry: maps the type names used in the `indicators` section of
+the YAML config to indicator classes.
+
+    indicators:
+      sma:                        # key; also the type when `type` is omitted
+        periods: [9, 4]
+      bollinger_50:
+        type: bollinger_bands
+        enabled: false            # listed (and toggleable in the UI), not built
+        period: 50
+        name: Bollinger bands 50
+      my_indicator:
+        class: my_package.my_module:MyIndicator
+
+Every other key of an entry is passed to the indicator's constructor. Built-in
+types are imported only when an enabled entry needs them; new types are added
+with `register` or a `class` path, without touching the chart.
+"""
+
+import importlib
+from src.settings.consts import load_config
+
+
+_REGISTRY: dict[str, str | type] = {
+    'sma': 'src.trading_funcs.indicators.sma:SMA',
+    'stochastic_oscillator': 'src.trading_funcs.indicators.stochastic_oscillator:StochasticOscillator',
+    'rsi': 'src.trading_funcs.indicators.rsi:RSI',
+    'donchian_channels': 'src.trading_funcs.indicators.donchian_channels:DonchianChannels',
+    'bollinger_bands': 'src.trading_funcs.indicators.bollinger_bands:BollingerBands',
+    'ema': 'src.trading_funcs.indicators.ema:EMA',
+    'macd': 'src.trading_funcs.indicators.macd:MACD',
+    'atr': 'src.trading_funcs.indicators.atr:ATR',
+    'adx': 'src.trading_funcs.indicators.adx:ADX'
+}
+
+# used when the config has no `indicators` section
+DEFAULT_INDICATORS = {key: {} for key in ('sma', 'stochastic_oscillator', 'rsi', 'donchian_channels', 'bollinger_bands')}
+
+_RESERVED = ('type', 'class', 'enabled')
+
+
+def register(type_name: str, target: str | type | None = None):
+    """
+    Register an indicator class (or a lazy 'module:Class' path) under `type_name`.
+    Without `target` it returns a class decorator.
+    """
+    if target is None:
+        def decorator(cls: type) -> type:
+            _REGISTRY[type_name] = cls
+            return cls
+        return decorator
+    _REGISTRY[type_name] = target
+    return target
+
+
+def _resolve(path: str) -> type:
+    module_name, _, class_name = path.partition(':')
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def indicator_class(type_name: str) -> type:
+    if type_name not in _REGISTRY:
+        raise KeyError(f'Unknown indicator type "{type_name}"; registered: {", ".join(_REGISTRY)}')
+    target = _REGISTRY[type_name]
+    if isinstance(target, str):
+        target = _REGISTRY[type_name] = _resolve(target)
+    return target
+
+
+class IndicatorSpec:
+    """
+    One configured indicator: its key, class and constructor parameters.
+    """
+
+    def __init__(self, key: str, type_name: str | None = None, class_path: str | None = None, enabled: bool = True, params: dict | None = None):
+        self.key = key
+        self.type_name = type_name or key
+        self.class_path = class_path
+        self.enabled = enabled
+        self.params = dict(params or {})
+
+    @classmethod
+    def from_config(cls, key: str, entry) -> 'IndicatorSpec':
+        entry = dict(entry or {})
+        params = {name: list(value) if isinstance(value, tuple) else value for name, value in entry.items() if name not in _RESERVED}
+        return cls(key, entry.get('type'), entry.get('class'), bool(entry.get('enabled', True)), params)
+
+    @property
+    def label(self) -> str:
+        return self.params.get('name', self.key)
+
+    def build(self, chart=None):
+        """
+        Construct the indicator; with a chart this creates its line series.
+        """
+        cls = _resolve(self.class_path) if self.class_path else indicator_class(self.type_name)
+        return cls(chart=chart, **self.params)
+
+
+def indicator_specs(config=None) -> list[IndicatorSpec]:
+    """
+    The configured indicators in config order (enabled or not).
+    """
+    config = load_config() if config is None else config
+    entries = config.get('indicators')
+    if entries is None:
+        entries = DEFAULT_INDICATORS
+    return [IndicatorSpec.from_config(key, entry) for key, entry in entries.items()]
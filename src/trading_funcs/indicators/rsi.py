@@ -1,52 +1,70 @@
-from typing import Any
+from typing import Optional, TYPE_CHECKING
+import numpy as np
 import pandas as pd
-from lightweight_charts import Chart
 from src.settings.consts import SHIFT_RSI_VAL
+from src.trading_funcs.indicators import compute
+from src.trading_funcs.indicators.kernels import settling_bars
+from src.trading_funcs.indicators.streaming import RSIState
 from src.trading_funcs.indicators.base import IndicatorBase
+from src.trading_funcs.indicators.features import FeatureCache
+
+if TYPE_CHECKING:
+    from lightweight_charts import Chart
+    from src.trading_funcs.charting.decimation import Decimator
 
 
 class RSI(IndicatorBase):
     """
     Relative Strength Index (RSI) indicator class.
     This class calculates the RSI based on the provided DataFrame.
+
+    :param period: Bars of gains and losses averaged; the line is named after `name`.
+    :param smoothing: 'wilder' (Wilder's exponential mean) or 'simple' (rolling means).
     """
 
-    def __init__(self, chart: Chart, name: str = "RSI"):
-        super().__init__(name)
-        self.chart = chart
-        self.rsi_line = chart.create_line(name=self.name, color=self.color.get('rsi_line'), width=1, price_line=False, price_label=False)
-        self.rsi_30_line = chart.create_line(name='RSI 30%', color=self.color.get('rsi_30'), width=1, price_line=False, price_label=False)
-        self.rsi_70_line = chart.create_line(name='RSI 70%', color=self.color.get('rsi_70'), width=1, price_line=False, price_label=False)
+    def __init__(self, chart: Optional['Chart'] = None, name: str = "RSI", period: int = 14, smoothing: str = 'wilder'):
+        self.period = int(period)
+        self.smoothing = smoothing
+        # one more bar for the first close change; Wilder's average is primed until its seed no longer counts
+        self.warmup = (settling_bars(1.0 / self.period, self.period) if smoothing == 'wilder' else self.period) + 1
+        super().__init__(name, chart)
+        self.rsi_line = self.create_line(name=self.name, color=self.color.get('rsi_line'), width=1, price_line=False, price_label=False)
+        # constant levels are horizontal lines, not per-bar series
+        self.rsi_30_level = self.create_level(70 - SHIFT_RSI_VAL, color=self.color.get('rsi_30'))
+        self.rsi_70_level = self.create_level(30 - SHIFT_RSI_VAL, color=self.color.get('rsi_70'))
+
+    @staticmethod
+    def compute(close: np.ndarray, period: int = 14, smoothing: str = 'wilder', features: Optional[FeatureCache] = None) -> dict[str, np.ndarray]:
+        return compute.rsi(close, period, smoothing, features=features)
+
+    def reset_stream(self) -> None:
+        self.rsi_state = RSIState(period=self.period, smoothing=self.smoothing)
 
-    def calculate_indicator_df(self, df: pd.DataFrame, period=14, close_col='close') -> pd.DataFrame:
+    def stream_update(self, close: float) -> dict[str, float]:
+        rsi = self.rsi_state.update(close)['rsi'] - SHIFT_RSI_VAL
+        return {self.name: self.fill_point(rsi)}
+
+    def calculate_indicator_df(self, df: pd.DataFrame, period=None, close_col='close', features: Optional[FeatureCache] = None) -> pd.DataFrame:
         """
         Calculate the RSI DataFrame based on the provided DataFrame.
         """
         
-        df['close_new'] = df[close_col]  # Adjust close prices
-        delta = df[close_col].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-
         # shift RSI down by 100 units
-        rsi = rsi - SHIFT_RSI_VAL
+        period = self.period if period is None else period
+        if features is None or close_col != 'close':
+            features = FeatureCache(close=df[close_col].to_numpy())
+        rsi = self.compute(features.column('close'), period=period, smoothing=self.smoothing, features=features)['rsi'] - SHIFT_RSI_VAL
 
         # plot 30% and 70% lines
         return pd.DataFrame({
             'time': df['time'],
-            'RSI': rsi.fillna(0),
-            'RSI 30%': [70 - SHIFT_RSI_VAL] * len(df),
-            'RSI 70%': [30 - SHIFT_RSI_VAL] * len(df)
-        })
+            self.name: rsi,
+            'RSI 30%': np.full(len(df), 70 - SHIFT_RSI_VAL),
+            'RSI 70%': np.full(len(df), 30 - SHIFT_RSI_VAL)
+        }, index=df.index).fillna(0)
 
-    def create(self, data: pd.DataFrame) -> None:
+    def prepare(self, data: pd.DataFrame, features: Optional[FeatureCache] = None, decimator: Optional['Decimator'] = None) -> dict[str, pd.DataFrame]:
         """
-        Create the RSI indicator on the provided chart.
+        Compute the frames of the RSI line, keyed by line name.
         """
-        
-        rsi_data = self.calculate_indicator_df(data)
-        self.rsi_30_line.set(rsi_data)
-        self.rsi_70_line.set(rsi_data)
-        self.rsi_line.set(rsi_data)
\ No newline at end of file
+        return {self.name: self.display(self.calculate_indicator_df(data, features=features), decimator)}
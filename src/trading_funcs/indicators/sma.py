@@ -1,39 +1,61 @@
-from typing import Any
+from typing import Optional, TYPE_CHECKING
+import numpy as np
 import pandas as pd
-from lightweight_charts import Chart
-from src.trading_funcs.indicators.base import IndicatorBase
+from src.trading_funcs.indicators import compute
+from src.trading_funcs.indicators.streaming import SMAState
+from src.trading_funcs.indicators.base import DEFAULT_LINE_COLOUR, IndicatorBase
+from src.trading_funcs.indicators.features import FeatureCache
+
+if TYPE_CHECKING:
+    from lightweight_charts import Chart
+    from src.trading_funcs.charting.decimation import Decimator
 
 
 class SMA(IndicatorBase):
     """
     SMA indicator class.
     This class calculates the SMA based on the provided DataFrame.
+
+    :param periods: One line per period, named 'SMA <period>' and coloured by the
+        `sma<period>` colour key.
     """
 
-    def __init__(self, chart: Chart, name: str = "SMA"):
-        super().__init__(name)
-        self.chart = chart
-        self.sma9_line = chart.create_line(name='SMA 9', color=self.color.get('sma9'), width=1, price_label=False)
-        self.sma4_line = chart.create_line(name='SMA 4', color=self.color.get('sma4'), width=1, price_label=False)
+    def __init__(self, chart: Optional['Chart'] = None, name: str = "SMA", periods: tuple[int, ...] = (9, 4)):
+        self.periods = tuple(int(period) for period in periods)
+        self.warmup = max(self.periods)
+        super().__init__(name, chart)
+        self.sma_lines = {
+            period: self.create_line(name=f'SMA {period}', color=self.color.get(f'sma{period}', DEFAULT_LINE_COLOUR), width=1, price_label=False)
+            for period in self.periods
+        }
+
+    @staticmethod
+    def compute(close: np.ndarray, period: int = 20, features: Optional[FeatureCache] = None) -> dict[str, np.ndarray]:
+        return compute.sma(close, period, features=features)
+
+    def reset_stream(self) -> None:
+        self.sma_state = {period: SMAState(period=period) for period in self.periods}
 
-    def calculate_indicator_df(self, df: pd.DataFrame, period: int = 20, num_std_dev: int = 2) -> pd.DataFrame:
+    def stream_update(self, close: float) -> dict[str, float]:
+        return {f'SMA {period}': self.fill_point(state.update(close)['sma']) for period, state in self.sma_state.items()}
+
+    def calculate_indicator_df(self, df: pd.DataFrame, period: int = 20, num_std_dev: int = 2, features: Optional[FeatureCache] = None) -> pd.DataFrame:
         """
         Calculate the SMA DataFrame based on the provided DataFrame.
         """
         
+        features = features if features is not None else FeatureCache(df)
+        result = self.compute(features.column('close'), period=period, features=features)
         return pd.DataFrame({
             'time': df['time'],
-            f'SMA {period}': df['close'].rolling(window=period).mean()
-        }).fillna(0)
+            f'SMA {period}': result['sma']
+        }, index=df.index).fillna(0)
         
-    def create(self, data: pd.DataFrame) -> None:
+    def prepare(self, data: pd.DataFrame, features: Optional[FeatureCache] = None, decimator: Optional['Decimator'] = None) -> dict[str, pd.DataFrame]:
         """
-        Create the SMA indicator on the provided chart.
-        This method should be implemented by subclasses.
+        Compute the frames of the SMA lines, keyed by line name.
         """
-        
-        sma9_data = self.calculate_indicator_df(data, period=9)
-        self.sma9_line.set(sma9_data, True)
-
-        sma4_data = self.calculate_indicator_df(data, period=4)
-        self.sma4_line.set(sma4_data, True)
\ No newline at end of file
+        return {
+            f'SMA {period}': self.display(self.calculate_indicator_df(data, period=period, features=features), decimator)
+            for period in self.periods
+        }
@@ -1,57 +1,78 @@
-from typing import Any
+from typing import Optional, TYPE_CHECKING
+import numpy as np
 import pandas as pd
-from lightweight_charts import Chart
 from src.settings.consts import SHIFT_STOCHASTIC_VAL
+from src.trading_funcs.indicators import compute
+from src.trading_funcs.indicators.streaming import StochasticOscillatorState
 from src.trading_funcs.indicators.base import IndicatorBase
+from src.trading_funcs.indicators.features import FeatureCache
+
+if TYPE_CHECKING:
+    from lightweight_charts import Chart
+    from src.trading_funcs.charting.decimation import Decimator
 
 
 class StochasticOscillator(IndicatorBase):
     """
     Stochastic Oscillator indicator class.
     This class calculates the Stochastic Oscillator based on the provided DataFrame.
+
+    :param period: Lookback of %K.
+    :param smooth: Bars of %K averaged into %D.
     """
 
-    def __init__(self, chart: Chart, name: str = "Stochastic Oscillator"):
-        super().__init__(name)
-        self.chart = chart
-        self.stochastic_k_line = chart.create_line(name='%K', color=self.color.get('stochastic_k_line'), width=1, price_line=False, price_label=False)
-        self.stochastic_d_line = chart.create_line(name='%D', color=self.color.get('stochastic_d_line'), width=1, price_line=False, price_label=False)
-        self.stochastic_20_line = chart.create_line(name='Stochastic 20%', color=self.color.get('stochastic_20'), width=1, price_line=False, price_label=False)
-        self.stochastic_80_line = chart.create_line(name='Stochastic 80%', color=self.color.get('stochastic_80'), width=1, price_line=False, price_label=False)
+    stream_columns = ('high', 'low', 'close')
+
+    def __init__(self, chart: Optional['Chart'] = None, name: str = "Stochastic Oscillator", period: int = 14, smooth: int = 3):
+        self.period = int(period)
+        self.smooth = int(smooth)
+        self.warmup = self.period + self.smooth - 1
+        super().__init__(name, chart)
+        self.stochastic_k_line = self.create_line(name='%K', color=self.color.get('stochastic_k_line'), width=1, price_line=False, price_label=False)
+        self.stochastic_d_line = self.create_line(name='%D', color=self.color.get('stochastic_d_line'), width=1, price_line=False, price_label=False)
+        # constant levels are horizontal lines, not per-bar series
+        self.stochastic_20_level = self.create_level(80 - SHIFT_STOCHASTIC_VAL, color=self.color.get('stochastic_20'))
+        self.stochastic_80_level = self.create_level(20 - SHIFT_STOCHASTIC_VAL, color=self.color.get('stochastic_80'))
+
+    @staticmethod
+    def compute(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14, smooth: int = 3, features: Optional[FeatureCache] = None) -> dict[str, np.ndarray]:
+        return compute.stochastic_oscillator(high, low, close, period, smooth, features=features)
 
-    def calculate_indicator_df(self, df: pd.DataFrame, period=14) -> pd.DataFrame:
+    def reset_stream(self) -> None:
+        self.stochastic_state = StochasticOscillatorState(period=self.period, smooth=self.smooth)
+
+    def stream_update(self, high: float, low: float, close: float) -> dict[str, float]:
+        result = self.stochastic_state.update(high, low, close)
+        return {
+            '%K': self.fill_point(result['k'] - SHIFT_STOCHASTIC_VAL),
+            '%D': self.fill_point(result['d'] - SHIFT_STOCHASTIC_VAL)
+        }
+
+    def calculate_indicator_df(self, df: pd.DataFrame, period=None, smooth=None, features: Optional[FeatureCache] = None) -> pd.DataFrame:
         """
         Calculate the Stochastic Oscillator DataFrame based on the provided DataFrame.
         """
         
-        df['low_new'] = df['low']
-        df['high_new'] = df['high']
-        df['close_new'] = df['close']
-        low_min = df['low_new'].rolling(window=period).min()
-        high_max = df['high_new'].rolling(window=period).max()
-        k_percent = 100 * ((df['close_new'] - low_min) / (high_max - low_min))
-        d_percent = k_percent.rolling(window=3).mean()
+        features = features if features is not None else FeatureCache(df)
+        period = self.period if period is None else period
+        smooth = self.smooth if smooth is None else smooth
+        result = self.compute(features.column('high'), features.column('low'), features.column('close'), period=period, smooth=smooth, features=features)
 
         # shift both k_percent and d_percent down by 100 units
-        k_percent = k_percent - SHIFT_STOCHASTIC_VAL
-        d_percent = d_percent - SHIFT_STOCHASTIC_VAL
+        k_percent = result['k'] - SHIFT_STOCHASTIC_VAL
+        d_percent = result['d'] - SHIFT_STOCHASTIC_VAL
 
         return pd.DataFrame({
             'time': df['time'],
-            '%K': k_percent.fillna(0),
-            '%D': d_percent.fillna(0),
-            'Stochastic 20%': [80 - SHIFT_STOCHASTIC_VAL] * len(df),
-            'Stochastic 80%': [20 - SHIFT_STOCHASTIC_VAL] * len(df)
-        })
+            '%K': k_percent,
+            '%D': d_percent,
+            'Stochastic 20%': np.full(len(df), 80 - SHIFT_STOCHASTIC_VAL),
+            'Stochastic 80%': np.full(len(df), 20 - SHIFT_STOCHASTIC_VAL)
+        }, index=df.index).fillna(0)
     
-    def create(self, data: pd.DataFrame) -> None:
+    def prepare(self, data: pd.DataFrame, features: Optional[FeatureCache] = None, decimator: Optional['Decimator'] = None) -> dict[str, pd.DataFrame]:
         """
-        Create the Stochastic Oscillator indicator on the provided chart.
-        This method should be implemented by subclasses.
+        Compute the frames of the %K and %D lines, keyed by line name.
         """
-        
-        stochastic_data = self.calculate_indicator_df(data)
-        self.stochastic_k_line.set(stochastic_data)
-        self.stochastic_d_line.set(stochastic_data)
-        self.stochastic_20_line.set(stochastic_data)
-        self.stochastic_80_line.set(stochastic_data)
\ No newline at end of file
+        stochastic_data = self.display(self.calculate_indicator_df(data, features=features), decimator)
+        return {'%K': stochastic_data, '%D': stochastic_data}
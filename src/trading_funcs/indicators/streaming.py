@@ -0,0 +1,333 @@
+"""
+Streaming (bar-by-bar) counterparts of the functions in `compute.py`.
+
+Each state object keeps only the current window (or, for the exponential
+indicators, the current average), so pushing a new bar costs O(1) (amortised
+O(1) for the min/max deques) no matter how long the history is. `update`
+returns the same keys as the matching batch function, with NaN during warm-up,
+so streamed values agree with the batch results.
+"""
+
+import math
+from collections import deque
+
+
+class RollingWindow:
+    """
+    Fixed-size window with a running sum and Welford-style mean/variance.
+    NaN values occupy a slot but make the window report NaN until they leave it.
+    The accumulators are rebuilt exactly once every `window` pushes, which bounds
+    the rounding drift of add/remove updates at an amortised O(1) cost.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque()
+        self.nan_count = 0
+        self.count = 0
+        self.total = 0.0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._pushes = 0
+
+    def _add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        delta = value - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (value - self._mean)
+
+    def _remove(self, value: float) -> None:
+        self.count -= 1
+        self.total -= value
+        if self.count == 0:
+            self.total = self._mean = self._m2 = 0.0
+            return
+        delta = value - self._mean
+        self._mean -= delta / self.count
+        self._m2 -= delta * (value - self._mean)
+
+    def push(self, value: float) -> None:
+        self.values.append(value)
+        if math.isnan(value):
+            self.nan_count += 1
+        else:
+            self._add(value)
+
+        if len(self.values) > self.window:
+            old = self.values.popleft()
+            if math.isnan(old):
+                self.nan_count -= 1
+            else:
+                self._remove(old)
+
+        self._pushes += 1
+        if self._pushes >= self.window:
+            self._resync()
+
+    def _resync(self) -> None:
+        valid = [value for value in self.values if not math.isnan(value)]
+        self._pushes = 0
+        self.count = len(valid)
+        self.total = math.fsum(valid)
+        self._mean = self.total / self.count if self.count else 0.0
+        self._m2 = math.fsum((value - self._mean) ** 2 for value in valid)
+
+    @property
+    def ready(self) -> bool:
+        return len(self.values) == self.window and self.nan_count == 0
+
+    @property
+    def sum(self) -> float:
+        return self.total if self.ready else math.nan
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.window if self.ready else math.nan
+
+    def std(self, ddof: int = 1) -> float:
+        if not self.ready or self.window <= ddof:
+            return math.nan
+        return math.sqrt(max(self._m2, 0.0) / (self.window - ddof))
+
+
+class RollingExtreme:
+    """
+    Rolling max (or min) over `window` bars with a monotonic deque.
+    """
+
+    def __init__(self, window: int, maximum: bool = True):
+        self.window = window
+        self.maximum = maximum
+        self.index = -1
+        self.last_nan = -math.inf
+        self.deque = deque()
+
+    def push(self, value: float) -> None:
+        self.index += 1
+        if math.isnan(value):
+            self.last_nan = self.index
+        else:
+            if self.maximum:
+                while self.deque and self.deque[-1][1] <= value:
+                    self.deque.pop()
+            else:
+                while self.deque and self.deque[-1][1] >= value:
+                    self.deque.pop()
+            self.deque.append((self.index, value))
+
+        while self.deque and self.deque[0][0] <= self.index - self.window:
+            self.deque.popleft()
+
+    @property
+    def value(self) -> float:
+        if self.index < self.window - 1 or self.last_nan > self.index - self.window or not self.deque:
+            return math.nan
+        return self.deque[0][1]
+
+
+class ExponentialAverage:
+    """
+    Exponential mean y = (1 - alpha) * y + alpha * x, seeded with the mean of the
+    first `window` valid values like `kernels.ewm_mean`. A NaN value reports NaN
+    and leaves the average unchanged.
+    """
+
+    def __init__(self, alpha: float, window: int):
+        self.alpha = alpha
+        self.window = window
+        self.count = 0
+        self.total = 0.0
+        self.value = math.nan
+
+    def push(self, value: float) -> float:
+        if math.isnan(value):
+            return math.nan
+        if self.count < self.window:
+            self.count += 1
+            self.total += value
+            if self.count == self.window:
+                self.value = self.total / self.window
+            return self.value
+        self.value = (1.0 - self.alpha) * self.value + self.alpha * value
+        return self.value
+
+
+def _true_range(high: float, low: float, previous_close: float | None) -> float:
+    if previous_close is None:
+        return math.nan
+    ranges = (high - low, abs(high - previous_close), abs(low - previous_close))
+    return math.nan if any(math.isnan(value) for value in ranges) else max(ranges)
+
+
+class SMAState:
+    def __init__(self, period: int = 20):
+        self.window = RollingWindow(period)
+
+    def update(self, close: float) -> dict[str, float]:
+        self.window.push(close)
+        return {'sma': self.window.mean}
+
+
+class BollingerBandsState:
+    def __init__(self, period: int = 20, num_std_dev: float = 2):
+        self.num_std_dev = num_std_dev
+        self.window = RollingWindow(period)
+
+    def update(self, close: float) -> dict[str, float]:
+        self.window.push(close)
+        mean = self.window.mean
+        std = self.window.std()
+        return {
+            'upper': mean + std * self.num_std_dev,
+            'mean': mean,
+            'lower': mean - std * self.num_std_dev
+        }
+
+
+class DonchianChannelsState:
+    def __init__(self, period: int = 20):
+        self.high_max = RollingExtreme(period, maximum=True)
+        self.low_min = RollingExtreme(period, maximum=False)
+
+    def update(self, high: float, low: float) -> dict[str, float]:
+        self.high_max.push(high)
+        self.low_min.push(low)
+        upper = self.high_max.value
+        lower = self.low_min.value
+        return {
+            'upper': upper,
+            'mean': (upper + lower) / 2,
+            'lower': lower
+        }
+
+
+class EMAState:
+    def __init__(self, period: int = 20):
+        self.average = ExponentialAverage(2.0 / (period + 1), period)
+
+    def update(self, close: float) -> dict[str, float]:
+        return {'ema': self.average.push(close)}
+
+
+class MACDState:
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = ExponentialAverage(2.0 / (fast + 1), fast)
+        self.slow = ExponentialAverage(2.0 / (slow + 1), slow)
+        self.signal = ExponentialAverage(2.0 / (signal + 1), signal)
+
+    def update(self, close: float) -> dict[str, float]:
+        line = self.fast.push(close) - self.slow.push(close)
+        signal = self.signal.push(line)
+        return {
+            'macd': line,
+            'signal': signal,
+            'histogram': line - signal
+        }
+
+
+class RSIState:
+    def __init__(self, period: int = 14, smoothing: str = 'wilder'):
+        if smoothing not in ('wilder', 'simple'):
+            raise ValueError(f'Unknown RSI smoothing "{smoothing}"; expected "wilder" or "simple"')
+        self.smoothing = smoothing
+        self.gain = ExponentialAverage(1.0 / period, period) if smoothing == 'wilder' else RollingWindow(period)
+        self.loss = ExponentialAverage(1.0 / period, period) if smoothing == 'wilder' else RollingWindow(period)
+        self.prev_close = None
+
+    def _update_wilder(self, close: float) -> dict[str, float]:
+        # the first bar has no change, and neither does a bar next to a NaN close
+        change = math.nan if self.prev_close is None else close - self.prev_close
+        self.prev_close = close
+        if math.isnan(change):
+            return {'rsi': math.nan}
+        gain = self.gain.push(max(change, 0.0))
+        loss = self.loss.push(max(-change, 0.0))
+        if math.isnan(gain) or gain + loss == 0:
+            return {'rsi': math.nan}
+        return {'rsi': 100 * gain / (gain + loss)}
+
+    def update(self, close: float) -> dict[str, float]:
+        if self.smoothing == 'wilder':
+            return self._update_wilder(close)
+        delta = 0.0 if self.prev_close is None else close - self.prev_close
+        self.prev_close = close
+        self.gain.push(delta if delta > 0 else 0.0)
+        self.loss.push(-delta if delta < 0 else 0.0)
+
+        gain, loss = self.gain.sum, self.loss.sum
+        if math.isnan(gain) or math.isnan(loss) or gain + loss == 0:
+            return {'rsi': math.nan}
+        return {'rsi': 100 * gain / (gain + loss)}
+
+
+class StochasticOscillatorState:
+    def __init__(self, period: int = 14, smooth: int = 3):
+        self.high_max = RollingExtreme(period, maximum=True)
+        self.low_min = RollingExtreme(period, maximum=False)
+        self.k_window = RollingWindow(smooth)
+
+    def update(self, high: float, low: float, close: float) -> dict[str, float]:
+        self.high_max.push(high)
+        self.low_min.push(low)
+        high_max, low_min = self.high_max.value, self.low_min.value
+
+        price_range = high_max - low_min
+        if math.isnan(price_range) or price_range == 0:
+            k_percent = math.nan
+        else:
+            k_percent = 100 * ((close - low_min) / price_range)
+        self.k_window.push(k_percent)
+        return {
+            'k': k_percent,
+            'd': self.k_window.mean
+        }
+
+
+class ATRState:
+    def __init__(self, period: int = 14):
+        self.average = ExponentialAverage(1.0 / period, period)
+        self.prev_close = None
+
+    def update(self, high: float, low: float, close: float) -> dict[str, float]:
+        true_range = _true_range(high, low, self.prev_close)
+        self.prev_close = close
+        return {'atr': self.average.push(true_range)}
+
+
+class ADXState:
+    def __init__(self, period: int = 14):
+        self.true_range = ExponentialAverage(1.0 / period, period)
+        self.plus_dm = ExponentialAverage(1.0 / period, period)
+        self.minus_dm = ExponentialAverage(1.0 / period, period)
+        self.dx = ExponentialAverage(1.0 / period, period)
+        self.prev = None
+
+    @staticmethod
+    def _movement(move: float, other: float) -> float:
+        if math.isnan(move):
+            return math.nan
+        return move if move > other and move > 0 else 0.0
+
+    def update(self, high: float, low: float, close: float) -> dict[str, float]:
+        if self.prev is None:
+            true_range = up = down = math.nan
+        else:
+            prev_high, prev_low, prev_close = self.prev
+            true_range = _true_range(high, low, prev_close)
+            up, down = high - prev_high, prev_low - low
+        self.prev = (high, low, close)
+
+        true_range = self.true_range.push(true_range)
+        plus_dm = self.plus_dm.push(self._movement(up, down))
+        minus_dm = self.minus_dm.push(self._movement(down, up))
+        # no range at all counts as no direction rather than 0 / 0
+        plus_di = 0.0 if true_range == 0 else 100 * plus_dm / true_range
+        minus_di = 0.0 if true_range == 0 else 100 * minus_dm / true_range
+        total = plus_di + minus_di
+        dx = 0.0 if total == 0 else 100 * abs(plus_di - minus_di) / total
+        return {
+            'adx': self.dx.push(dx),
+            'plus_di': plus_di,
+            'minus_di': minus_di
+        }
@@ -0,0 +1,14 @@
+from src.utils.lazy import lazy_exports
+
+# submodules are imported on first attribute access, not with the package
+_EXPORTS = {
+    'WatchlistPipeline': 'src.trading_funcs.pipeline.watchlist',
+    'ReportPipeline': 'src.trading_funcs.pipeline.report'
+}
+
+__all__ = [
+    'WatchlistPipeline',
+    'ReportPipeline'
+]
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
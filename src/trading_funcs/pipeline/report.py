@@ -0,0 +1,111 @@
+import os
+import html
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from src.trading_funcs.data.store import BarStore
+from src.utils.instrumentation import span
+from src.utils.logs import set_up_log
+
+
+logger = set_up_log(__name__)
+
+
+def render_report(symbol: str, stock_data_path: str, output_path: str, start_date: str, end_date: str, interval: str, inline_assets: bool = True) -> str | None:
+    """
+    Render one symbol's StockChart (candles, volume and every StockIndicators
+    line) from the bar store into `{symbol}_{interval}.html`.
+    Runs in a worker process, so only the output path travels back to the parent.
+
+    :return: The written file path, or None when the symbol has no stored bars.
+    """
+    # lightweight_charts and pandas are only needed in the workers
+    from src.trading_funcs.charting.plotting import StockChart
+    from src.trading_funcs.charting.report import ReportChart
+
+    chart = ReportChart(inline_assets=inline_assets)
+    stock_chart = StockChart(symbol, stock_data_path, start_date, end_date, interval=interval, save_flag=False, chart=chart)
+    if not stock_chart.bar_store.exists(symbol, interval):
+        return None
+    data = stock_chart.bar_store.load_frame(symbol, interval, start=start_date, end=end_date)
+    if data.empty:
+        return None
+    with span('report.render'):
+        stock_chart.plot(data=data)
+        chart.fit()
+        file_path = chart.write(os.path.join(output_path, f'{symbol}_{interval}.html'), title=f'{symbol} {interval}')
+    return file_path
+
+
+class ReportPipeline:
+    """
+    Nightly static reports: each symbol's chart is rendered from the bar store
+    into a standalone HTML file by a pool of worker processes, with no GUI, plus
+    an `index.html` linking them. Symbols are not fetched; refresh them first
+    (e.g. with WatchlistPipeline).
+
+    :param inline_assets: Embed the chart library in every page; when False it is
+        copied into `output_path` once and the pages refer to it.
+    """
+
+    def __init__(self, stock_data_path: str, output_path: str, start_date: str, end_date: str, interval: str = '1d', max_workers: int | None = None, inline_assets: bool = True):
+        self.stock_data_path = stock_data_path
+        self.output_path = output_path
+        self.start_date = start_date
+        self.end_date = end_date
+        self.interval = interval
+        self.max_workers = max_workers
+        self.inline_assets = inline_assets
+
+    def stored_symbols(self) -> list[str]:
+        store = BarStore(os.path.join(self.stock_data_path, 'bars'))
+        if not os.path.isdir(store.root):
+            return []
+        return sorted(symbol for symbol in os.listdir(store.root) if store.exists(symbol, self.interval))
+
+    def write_index(self, written: dict[str, str]) -> str:
+        links = '\n'.join(
+            f'<li><a href="{html.escape(os.path.basename(file_path))}">{html.escape(symbol)}</a></li>'
+            for symbol, file_path in sorted(written.items())
+        )
+        file_path = os.path.join(self.output_path, 'index.html')
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(f'<!DOCTYPE html>\n<html><head><meta charset="UTF-8"><title>Charts {self.interval} {self.end_date}</title></head>\n'
+                    f'<body><h1>Charts {self.interval} {self.start_date}..{self.end_date}</h1><ul>\n{links}\n</ul></body></html>\n')
+        return file_path
+
+    def run(self, symbols: list[str] | None = None) -> dict[str, str]:
+        """
+        Render the given symbols (default every stored symbol of the interval).
+
+        :return: Mapping of symbol to the written HTML file.
+        """
+        os.makedirs(self.output_path, exist_ok=True)
+        if symbols is None:
+            symbols = self.stored_symbols()
+        symbols = list(dict.fromkeys(symbol.strip().upper() for symbol in symbols if symbol.strip()))
+        if not self.inline_assets:
+            from src.trading_funcs.charting.report import copy_assets
+            copy_assets(self.output_path)
+        written = {}
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as workers:
+            futures = {
+                workers.submit(render_report, symbol, self.stock_data_path, self.output_path, self.start_date, self.end_date, self.interval, self.inline_assets): symbol
+                for symbol in symbols
+            }
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    file_path = future.result()
+                except Exception as e:
+                    logger.error(f'Rendering the report for "{symbol}" failed: {e}')
+                    continue
+                if file_path is not None:
+                    written[symbol] = file_path
+
+        missing = set(symbols) - set(written)
+        if missing:
+            logger.info(f'No report for {len(missing)} symbols: {sorted(missing)[:10]}{"..." if len(missing) > 10 else ""}')
+        if written:
+            self.write_index(written)
+        logger.info(f'Wrote {len(written)} reports to {self.output_path}')
+        return written
@@ -0,0 +1,85 @@
+import os
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+from src.trading_funcs.data.fetcher import AsyncFetcher
+from src.trading_funcs.data.providers import DataProvider
+from src.trading_funcs.indicators.compute import compute_indicators
+from src.utils.logs import set_up_log
+
+
+logger = set_up_log(__name__)
+
+
+def compute_and_write(symbol: str, data: pd.DataFrame, output_path: str, interval: str) -> str:
+    """
+    Compute the default indicator set for one symbol and write it next to its bars.
+    Runs in a worker process, so only the output path travels back to the parent.
+    """
+    values = compute_indicators(
+        data['high'].to_numpy(),
+        data['low'].to_numpy(),
+        data['close'].to_numpy()
+    )
+    result = pd.concat([data.reset_index(drop=True), pd.DataFrame(values)], axis=1)
+    file_path = os.path.join(output_path, f'{symbol}_{interval}_indicators.csv')
+    result.to_csv(file_path, index=False)
+    return file_path
+
+
+class WatchlistPipeline:
+    """
+    Refresh a whole watchlist: batched provider calls run concurrently through an
+    AsyncFetcher, and each symbol's indicators are computed in a process pool as
+    soon as its bars land. Results are written per symbol as they complete.
+
+    :param max_fetchers: Provider calls in flight at once.
+    :param rate_limit: Provider calls started per second (default unlimited).
+    """
+
+    def __init__(self, provider: DataProvider, output_path: str, start_date: str, end_date: str, interval: str = '1d', max_fetchers: int = 8, max_workers: int | None = None, rate_limit: float | None = None):
+        self.provider = provider
+        self.output_path = output_path
+        self.start_date = start_date
+        self.end_date = end_date
+        self.interval = interval
+        self.max_workers = max_workers
+        self.fetcher = AsyncFetcher(provider, max_concurrency=max_fetchers, rate_limit=rate_limit)
+
+    async def _submit_as_fetched(self, symbols: list[str], workers: ProcessPoolExecutor) -> dict:
+        compute_futures = {}
+        async for symbol, data in self.fetcher.stream(symbols, self.start_date, self.end_date, self.interval):
+            future = workers.submit(compute_and_write, symbol, data, self.output_path, self.interval)
+            compute_futures[future] = symbol
+        return compute_futures
+
+    def run(self, symbols: list[str]) -> dict[str, str]:
+        """
+        Run the pipeline for the given symbols.
+
+        :param symbols: Ticker symbols; duplicates are ignored.
+        :return: Mapping of symbol to the written indicator file.
+        """
+        os.makedirs(self.output_path, exist_ok=True)
+        symbols = list(dict.fromkeys(symbol.strip().upper() for symbol in symbols if symbol.strip()))
+        written = {}
+
+        try:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as workers:
+                compute_futures = asyncio.run(self._submit_as_fetched(symbols, workers))
+                for future in as_completed(compute_futures):
+                    symbol = compute_futures[future]
+                    try:
+                        written[symbol] = future.result()
+                    except Exception as e:
+                        logger.error(f'Computing indicators for "{symbol}" failed: {e}')
+                        continue
+                    logger.info(f'Wrote {written[symbol]}')
+        finally:
+            # the fetcher's threads go with the run; a later run starts new ones
+            self.fetcher.close()
+
+        missing = set(symbols) - set(written)
+        if missing:
+            logger.info(f'No data for {len(missing)} symbols: {sorted(missing)}')
+        return written
@@ -0,0 +1,16 @@
+from src.utils.lazy import lazy_exports
+
+# submodules are imported on first attribute access, not with the package
+_EXPORTS = {
+    'RollingCorrelation': 'src.trading_funcs.portfolio.correlation',
+    'bar_returns': 'src.trading_funcs.portfolio.correlation',
+    'pair_statistic': 'src.trading_funcs.portfolio.correlation'
+}
+
+__all__ = [
+    'RollingCorrelation',
+    'bar_returns',
+    'pair_statistic'
+]
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
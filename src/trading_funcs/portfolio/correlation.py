@@ -0,0 +1,343 @@
+"""
+Rolling pairwise covariance, correlation and beta of returns across a universe.
+
+    engine = RollingCorrelation.from_panel(Panel.load('universe.npz'), window=60)
+    engine.correlation()                    # (symbols, symbols) on the latest bar
+    engine.peers('AAPL', k=10)              # the 10 symbols most correlated with AAPL
+    engine.pairs('SPY', 'beta')             # every symbol's rolling beta to SPY, (symbols, bars)
+"""
+
+from typing import Iterator
+import numpy as np
+import pandas as pd
+from src.trading_funcs.data.panel import Panel
+from src.trading_funcs.indicators.kernels import rolling_sum
+from src.utils.instrumentation import span
+
+
+STATISTICS = ('correlation', 'covariance', 'beta')
+
+# elements of the (symbols, bars) temporaries of one block of `pairs` / `peer_history`
+_BLOCK_ELEMENTS = 1 << 20
+
+
+def bar_returns(close: np.ndarray, log: bool = True) -> np.ndarray:
+    """
+    Return of every bar over the previous one along the last axis. The first
+    bar, and the bars next to a missing one, are NaN: a return across a gap
+    would span several bars.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    out = np.full(close.shape, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = close[..., 1:] / close[..., :-1]
+        out[..., 1:] = np.log(ratio) if log else ratio - 1.0
+    return out
+
+
+def pair_statistic(stat: str, n, sum_x, sum_y, sum_xx, sum_yy, sum_xy, min_periods: int, ddof: int = 1, out: np.ndarray | None = None) -> np.ndarray:
+    """
+    One statistic of x against y from their sums over the bars both have; the
+    arguments broadcast against `sum_xy`. Beta is the slope of x regressed on y.
+
+    :param out: Optional array of the result's shape to write into.
+    :return: NaN where there are fewer than `min_periods` joint bars or a series is flat.
+    """
+    if stat not in STATISTICS:
+        raise ValueError(f'Unknown statistic "{stat}", expected one of {STATISTICS}.')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out = np.multiply(sum_x, sum_y / -n, out=out)
+        out += sum_xy
+        if stat == 'covariance':
+            out /= n - ddof
+        elif stat == 'correlation':
+            # divided by each side's deviation in turn, without a (symbols, symbols) temporary
+            out /= np.sqrt(_positive(sum_xx - sum_x * (sum_x / n)))
+            out /= np.sqrt(_positive(sum_yy - sum_y * (sum_y / n)))
+            np.clip(out, -1.0, 1.0, out=out)
+        else:
+            out /= _positive(sum_yy - sum_y * (sum_y / n))
+    if np.ndim(n):
+        out[np.broadcast_to(~(n >= min_periods), out.shape)] = np.nan
+    elif not n >= min_periods:
+        out[...] = np.nan
+    return out
+
+
+def _positive(variance):
+    # flat series have no correlation or beta
+    return np.where(variance > 0, variance, np.nan)
+
+
+def _top(keys: np.ndarray, k: int) -> np.ndarray:
+    """
+    Positions of the `k` largest keys along the first axis, largest first, NaNs last.
+    """
+    keys = np.where(np.isnan(keys), -np.inf, keys)
+    k = min(k, keys.shape[0])
+    if k == 0:
+        return np.empty((0,) + keys.shape[1:], dtype=np.intp)
+    best = np.argpartition(-keys, k - 1, axis=0)[:k]
+    order = np.argsort(-np.take_along_axis(keys, best, axis=0), axis=0, kind='stable')
+    return np.take_along_axis(best, order, axis=0)
+
+
+class RollingCorrelation:
+    """
+    Rolling covariance, correlation and beta of every pair of symbols over the
+    last `window` bars, at any bar of a (symbols, bars) returns array.
+
+    The window's cross-products X·Xᵀ (X: the returns with missing bars as 0) are
+    kept between queries and moved incrementally: the bars that entered the
+    window are added and those that left subtracted in one matrix product,
+    instead of summing the whole window again. Missing bars are handled with
+    masks. A pair is measured over the bars both symbols have, and the sums
+    over the bars a symbol misses are only formed for the symbols and bars with
+    gaps, so a complete universe costs no more than one matrix product.
+
+    Only the statistics asked for are computed: `peers`, `pairs` and
+    `peer_history` work on one symbol against all others, with rolling sums over
+    the bars and no (symbols, symbols) matrix, so memory stays bounded however
+    many bars are scanned.
+
+    :param returns: (symbols, bars) returns, NaN where a symbol has none.
+    :param window: Bars per window. Statistics are defined from the first full window on.
+    :param symbols: Row names, used to look symbols up.
+    :param time: Optional bar times, for labelling results.
+    :param min_periods: Joint bars a pair needs within the window (default half the window).
+    """
+
+    # bars the window may move incrementally before the cross-products are summed
+    # afresh, which bounds the rounding the additions and subtractions accumulate
+    REBUILD_BARS = 4096
+
+    def __init__(self, returns: np.ndarray, window: int, symbols: list[str] | None = None, time: np.ndarray | None = None, min_periods: int | None = None):
+        self.returns = np.asarray(returns, dtype=np.float64)
+        if self.returns.ndim != 2:
+            raise ValueError(f'Returns have shape {self.returns.shape}, expected (symbols, bars).')
+        n_symbols = self.returns.shape[0]
+        self.symbols = [str(row) for row in range(n_symbols)] if symbols is None else list(symbols)
+        if len(self.symbols) != n_symbols:
+            raise ValueError(f'{len(self.symbols)} symbols for {n_symbols} rows of returns.')
+        self.time = None if time is None else np.asarray(time)
+        if window < 2:
+            raise ValueError(f'The window must span at least 2 bars, got {window}.')
+        self.window = window
+        self.min_periods = max(2, window // 2) if min_periods is None else min_periods
+        if not 2 <= self.min_periods <= window:
+            raise ValueError(f'min_periods must be between 2 and the window ({window}), got {self.min_periods}.')
+
+        self._rows = {symbol: row for row, symbol in enumerate(self.symbols)}
+        self._missing = np.isnan(self.returns)
+        self._filled = np.where(self._missing, 0.0, self.returns)
+        # bars where at least one symbol has no return
+        self._gaps = self._missing.any(axis=0)
+        # cross-products of the bars [end - window, end)
+        self._cross = None
+        self._scratch = None
+        self._end = 0
+        self._moved = 0
+
+    @classmethod
+    def from_panel(cls, panel: Panel, window: int, column: str = 'close', log: bool = True, min_periods: int | None = None) -> 'RollingCorrelation':
+        """
+        The engine on the bar returns of a panel column (log returns by default).
+        """
+        return cls(bar_returns(panel[column], log=log), window, symbols=panel.symbols, time=panel.time, min_periods=min_periods)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    @property
+    def n_bars(self) -> int:
+        return self.returns.shape[1]
+
+    def _row(self, symbol: str) -> int:
+        if symbol not in self._rows:
+            raise KeyError(f'Unknown symbol "{symbol}".')
+        return self._rows[symbol]
+
+    def _position(self, at: int) -> int:
+        position = at + self.n_bars if at < 0 else at
+        if not 0 <= position < self.n_bars:
+            raise IndexError(f'Bar {at} is outside the {self.n_bars} bars.')
+        return position
+
+    def _cross_products(self, end: int) -> np.ndarray:
+        """
+        X·Xᵀ over the window ending before bar `end`, moved there from the last window.
+        """
+        step = end - self._end
+        if self._cross is not None and step == 0:
+            return self._cross
+        if self._cross is None or not 0 < 2 * step < self.window or self._moved + step > self.REBUILD_BARS:
+            block = self._filled[:, end - self.window:end]
+            self._cross = block @ block.T
+            self._moved = 0
+        else:
+            entered = self._filled[:, self._end:end]
+            left = self._filled[:, self._end - self.window:end - self.window]
+            if self._scratch is None:
+                self._scratch = np.empty_like(self._cross)
+            np.matmul(np.concatenate((entered, left), axis=1), np.concatenate((entered, -left), axis=1).T, out=self._scratch)
+            self._cross += self._scratch
+            self._moved += step
+        self._end = end
+        return self._cross
+
+    def _gap_pairs(self, out: np.ndarray, stat: str, start: int, end: int, totals: np.ndarray, squares: np.ndarray) -> None:
+        """
+        Recompute in place the pairs with a symbol that misses bars in [start, end),
+        over the bars both symbols have. Only those symbols' rows and columns, and
+        only the bars with gaps, enter the corrections.
+        """
+        gaps = start + np.flatnonzero(self._gaps[start:end])
+        lacking = self._missing[:, gaps].astype(np.float64)
+        rows = np.flatnonzero(lacking.any(axis=1))
+        bars = self._filled[:, gaps]
+        lacking_rows, bars_rows = lacking[rows], bars[rows]
+        counts = self.window - lacking.sum(axis=1)
+
+        # columns `rows`: every symbol (x) against a symbol with gaps (y)
+        n = counts[:, None] + counts[rows] - self.window + lacking @ lacking_rows.T
+        sum_x = totals[:, None] - bars @ lacking_rows.T
+        sum_xx = squares[:, None] - (bars * bars) @ lacking_rows.T
+        sum_y = totals[rows] - lacking @ bars_rows.T
+        sum_yy = squares[rows] - lacking @ (bars_rows * bars_rows).T
+        sum_xy = self._cross[:, rows]
+        out[:, rows] = pair_statistic(stat, n, sum_x, sum_y, sum_xx, sum_yy, sum_xy, self.min_periods)
+        # rows `rows` are the transpose, except for beta, which is not symmetric
+        if stat == 'beta':
+            out[rows, :] = pair_statistic(stat, n, sum_y, sum_x, sum_yy, sum_xx, sum_xy, self.min_periods).T
+        else:
+            out[rows, :] = out[:, rows].T
+
+    def statistic(self, stat: str = 'correlation', at: int = -1, out: np.ndarray | None = None) -> np.ndarray:
+        """
+        (symbols, symbols) matrix of `stat` over the window ending at bar `at`.
+        `beta[i, j]` is the beta of symbol i to symbol j.
+
+        :param out: Optional (symbols, symbols) float64 array to write the matrix into.
+        """
+        if stat not in STATISTICS:
+            raise ValueError(f'Unknown statistic "{stat}", expected one of {STATISTICS}.')
+        end = self._position(at) + 1
+        if end < self.window:
+            if out is None:
+                return np.full((len(self), len(self)), np.nan)
+            out[...] = np.nan
+            return out
+        with span(f'portfolio.{stat}'):
+            start = end - self.window
+            filled = self._filled[:, start:end]
+            totals = filled.sum(axis=1)
+            squares = np.einsum('ij,ij->i', filled, filled)
+            # pairs of symbols with every bar of the window, from per-symbol sums
+            out = pair_statistic(stat, float(self.window), totals[:, None], totals, squares[:, None], squares, self._cross_products(end), self.min_periods, out=out)
+            if self._gaps[start:end].any():
+                self._gap_pairs(out, stat, start, end, totals, squares)
+            return out
+
+    def covariance(self, at: int = -1) -> np.ndarray:
+        return self.statistic('covariance', at)
+
+    def correlation(self, at: int = -1) -> np.ndarray:
+        return self.statistic('correlation', at)
+
+    def beta(self, at: int = -1) -> np.ndarray:
+        return self.statistic('beta', at)
+
+    def iter(self, stat: str = 'correlation', start: int | None = None, step: int = 1, out: np.ndarray | None = None) -> Iterator[tuple[int, np.ndarray]]:
+        """
+        (bar position, matrix) of every `step`-th bar from `start` (default the
+        first full window) to the last. Each matrix is only built when the
+        iteration reaches it, and the cross-products move forward incrementally.
+
+        :param out: Optional (symbols, symbols) array every matrix is written into,
+            instead of a new one per bar (copy a matrix to keep it).
+        """
+        first = self.window - 1 if start is None else self._position(start)
+        for position in range(first, self.n_bars, step):
+            yield position, self.statistic(stat, position, out=out)
+
+    def _against(self, stat: str, column: int, rows: slice, start: int, end: int) -> np.ndarray:
+        """
+        `stat` of the `rows` symbols against the `column` symbol at the bars
+        [start, end), from rolling sums over their joint bars.
+        """
+        missing = self._missing[rows, start:end] | self._missing[column, start:end]
+        x = np.where(missing, 0.0, self._filled[rows, start:end])
+        y = np.where(missing, 0.0, self._filled[column, start:end])
+        sums = [rolling_sum(values, self.window) for values in (~missing, x, y, x * x, y * y, x * y)]
+        return pair_statistic(stat, *sums, min_periods=self.min_periods)
+
+    def _blocks(self) -> Iterator[slice]:
+        # row blocks that keep the (symbols, bars) temporaries of `_against` bounded
+        size = max(1, _BLOCK_ELEMENTS // max(self.n_bars, 1))
+        for first in range(0, len(self), size):
+            yield slice(first, min(first + size, len(self)))
+
+    def pairs(self, symbol: str, stat: str = 'correlation') -> np.ndarray:
+        """
+        (symbols, bars) `stat` of every symbol against `symbol` at every bar; a
+        column of the `statistic` matrices. Betas are to `symbol`, so
+        `pairs('SPY', 'beta')` are the market betas.
+        """
+        column = self._row(symbol)
+        with span(f'portfolio.pairs.{stat}'):
+            return np.concatenate([self._against(stat, column, rows, 0, self.n_bars) for rows in self._blocks()], axis=0)
+
+    def peers(self, symbol: str, k: int = 10, at: int = -1, absolute: bool = False) -> pd.DataFrame:
+        """
+        The `k` symbols most correlated with `symbol` over the window ending at
+        bar `at`, with their correlation, covariance and beta to it.
+
+        :param absolute: Rank by absolute correlation, so anti-correlated symbols count too (e.g. for hedges).
+        """
+        column = self._row(symbol)
+        end = self._position(at) + 1
+        if end < self.window:
+            return pd.DataFrame(columns=['symbol', *STATISTICS])
+        stats = {stat: self._against(stat, column, slice(None), end - self.window, end)[:, -1] for stat in STATISTICS}
+        correlation = stats['correlation']
+        correlation[column] = np.nan
+        best = _top(np.abs(correlation) if absolute else correlation, k)
+        best = best[~np.isnan(correlation[best])]
+        return pd.DataFrame({'symbol': [self.symbols[row] for row in best], **{stat: values[best] for stat, values in stats.items()}})
+
+    def peer_history(self, symbol: str, k: int = 10, absolute: bool = False) -> tuple[np.ndarray, np.ndarray]:
+        """
+        The `k` most correlated symbols at every bar, merged block by block so only
+        (k, bars) candidates are held.
+
+        :return: (bars, k) row positions of the peers (-1 where undefined) and their correlations, best first.
+        """
+        column = self._row(symbol)
+        best_rows = np.empty((0, self.n_bars), dtype=np.intp)
+        best_values = np.empty((0, self.n_bars))
+        with span('portfolio.peer_history'):
+            for rows in self._blocks():
+                values = self._against('correlation', column, rows, 0, self.n_bars)
+                if rows.start <= column < rows.stop:
+                    values[column - rows.start] = np.nan
+                positions = np.broadcast_to(np.arange(rows.start, rows.stop)[:, None], values.shape)
+                values = np.concatenate((best_values, values))
+                positions = np.concatenate((best_rows, positions))
+                best = _top(np.abs(values) if absolute else values, k)
+                best_values = np.take_along_axis(values, best, axis=0)
+                best_rows = np.take_along_axis(positions, best, axis=0)
+        best_rows = np.where(np.isnan(best_values), -1, best_rows)
+        return best_rows.T, best_values.T
+
+    def heatmap(self, symbol: str, k: int = 20, at: int = -1) -> pd.DataFrame:
+        """
+        Correlation matrix of `symbol` and its `k` peers over the window ending at
+        bar `at`, labelled by symbol in peer order, e.g. for a heatmap pane.
+        """
+        names = [symbol, *self.peers(symbol, k, at)['symbol']]
+        end = self._position(at) + 1
+        if end < self.window:
+            return pd.DataFrame(index=names, columns=names, dtype=np.float64)
+        rows = [self._rows[name] for name in names]
+        window = RollingCorrelation(self.returns[rows, end - self.window:end], self.window, symbols=names, min_periods=self.min_periods)
+        return pd.DataFrame(window.correlation(), index=names, columns=names)
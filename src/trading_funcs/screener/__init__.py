@@ -0,0 +1,22 @@
+from src.utils.lazy import lazy_exports
+
+# submodules are imported on first attribute access, not with the package
+_EXPORTS = {
+    'Screener': 'src.trading_funcs.screener.screener',
+    'Condition': 'src.trading_funcs.screener.conditions',
+    'line': 'src.trading_funcs.screener.conditions',
+    'crosses_above': 'src.trading_funcs.screener.conditions',
+    'crosses_below': 'src.trading_funcs.screener.conditions',
+    'parse_condition': 'src.trading_funcs.screener.conditions'
+}
+
+__all__ = [
+    'Screener',
+    'Condition',
+    'line',
+    'crosses_above',
+    'crosses_below',
+    'parse_condition'
+]
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
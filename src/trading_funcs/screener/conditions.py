@@ -0,0 +1,277 @@
+"""
+Screening conditions over (symbols, bars) line arrays.
+
+Conditions are built from line references with Python operators
+
+    (line('RSI') < 30) & (line('close') < line('Lower Bollinger 20')) & crosses_above(line('%K'), line('%D'))
+
+or parsed from text with `parse_condition`:
+
+    RSI < 30 and close < Lower Bollinger 20 and %K crosses above %D
+
+Every condition evaluates to a boolean (symbols, bars) array in one vectorised
+pass; NaN values (warm-up, missing bars) never satisfy a comparison.
+"""
+
+import operator
+import re
+import numpy as np
+
+
+class Expr:
+    """
+    A value per symbol and bar: a line, a constant, or arithmetic on them.
+    """
+
+    def values(self, lines: dict[str, np.ndarray]) -> np.ndarray:
+        raise NotImplementedError("Subclasses should implement this method.")
+
+    def names(self) -> set[str]:
+        return set()
+
+    def _compare(self, other, op, symbol: str) -> 'Compare':
+        return Compare(self, as_expr(other), op, symbol)
+
+    def __lt__(self, other):
+        return self._compare(other, operator.lt, '<')
+
+    def __le__(self, other):
+        return self._compare(other, operator.le, '<=')
+
+    def __gt__(self, other):
+        return self._compare(other, operator.gt, '>')
+
+    def __ge__(self, other):
+        return self._compare(other, operator.ge, '>=')
+
+    def __add__(self, other):
+        return BinaryOp(self, as_expr(other), operator.add, '+')
+
+    def __sub__(self, other):
+        return BinaryOp(self, as_expr(other), operator.sub, '-')
+
+    def __mul__(self, other):
+        return BinaryOp(self, as_expr(other), operator.mul, '*')
+
+    def __truediv__(self, other):
+        return BinaryOp(self, as_expr(other), operator.truediv, '/')
+
+
+class Line(Expr):
+    def __init__(self, name: str):
+        self.name = name
+
+    def values(self, lines: dict[str, np.ndarray]) -> np.ndarray:
+        return lines[self.name]
+
+    def names(self) -> set[str]:
+        return {self.name}
+
+    def __repr__(self) -> str:
+        return self.name
+
+
+class Constant(Expr):
+    def __init__(self, value: float):
+        self.value = float(value)
+
+    def values(self, lines: dict[str, np.ndarray]) -> float:
+        return self.value
+
+    def __repr__(self) -> str:
+        return f'{self.value:g}'
+
+
+class BinaryOp(Expr):
+    def __init__(self, left: Expr, right: Expr, op, symbol: str):
+        self.left, self.right, self.op, self.symbol = left, right, op, symbol
+
+    def values(self, lines: dict[str, np.ndarray]) -> np.ndarray:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.op(self.left.values(lines), self.right.values(lines))
+
+    def names(self) -> set[str]:
+        return self.left.names() | self.right.names()
+
+    def __repr__(self) -> str:
+        return f'({self.left!r} {self.symbol} {self.right!r})'
+
+
+def as_expr(value) -> Expr:
+    return value if isinstance(value, Expr) else Constant(value)
+
+
+def line(name: str) -> Line:
+    return Line(name)
+
+
+class Condition:
+    """
+    A boolean per symbol and bar; combine with `&`, `|` and `~`.
+    """
+
+    def mask(self, lines: dict[str, np.ndarray]) -> np.ndarray:
+        raise NotImplementedError("Subclasses should implement this method.")
+
+    def names(self) -> set[str]:
+        raise NotImplementedError("Subclasses should implement this method.")
+
+    def __and__(self, other: 'Condition') -> 'Combined':
+        return Combined(self, other, np.logical_and, 'and')
+
+    def __or__(self, other: 'Condition') -> 'Combined':
+        return Combined(self, other, np.logical_or, 'or')
+
+    def __invert__(self) -> 'Not':
+        return Not(self)
+
+
+class Compare(Condition):
+    def __init__(self, left: Expr, right: Expr, op, symbol: str):
+        self.left, self.right, self.op, self.symbol = left, right, op, symbol
+
+    def mask(self, lines: dict[str, np.ndarray]) -> np.ndarray:
+        with np.errstate(invalid='ignore'):
+            return np.asarray(self.op(self.left.values(lines), self.right.values(lines)))
+
+    def names(self) -> set[str]:
+        return self.left.names() | self.right.names()
+
+    def __repr__(self) -> str:
+        return f'{self.left!r} {self.symbol} {self.right!r}'
+
+
+def _previous(values) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 0:
+        return values
+    shifted = np.full_like(values, np.nan)
+    shifted[..., 1:] = values[..., :-1]
+    return shifted
+
+
+class Cross(Condition):
+    """
+    `left` crosses `right` on a bar: on the other side (or touching) one bar
+    earlier, strictly past it now.
+    """
+
+    def __init__(self, left: Expr, right: Expr, above: bool = True):
+        self.left, self.right, self.above = left, right, above
+
+    def mask(self, lines: dict[str, np.ndarray]) -> np.ndarray:
+        spread = np.asarray(BinaryOp(self.left, self.right, operator.sub, '-').values(lines), dtype=np.float64)
+        before = _previous(spread)
+        with np.errstate(invalid='ignore'):
+            if self.above:
+                return (before <= 0) & (spread > 0)
+            return (before >= 0) & (spread < 0)
+
+    def names(self) -> set[str]:
+        return self.left.names() | self.right.names()
+
+    def __repr__(self) -> str:
+        return f'{self.left!r} crosses {"above" if self.above else "below"} {self.right!r}'
+
+
+def crosses_above(left, right) -> Cross:
+    return Cross(as_expr(left), as_expr(right), above=True)
+
+
+def crosses_below(left, right) -> Cross:
+    return Cross(as_expr(left), as_expr(right), above=False)
+
+
+class Combined(Condition):
+    def __init__(self, left: Condition, right: Condition, op, word: str):
+        self.left, self.right, self.op, self.word = left, right, op, word
+
+    def mask(self, lines: dict[str, np.ndarray]) -> np.ndarray:
+        return self.op(self.left.mask(lines), self.right.mask(lines))
+
+    def names(self) -> set[str]:
+        return self.left.names() | self.right.names()
+
+    def __repr__(self) -> str:
+        return f'({self.left!r} {self.word} {self.right!r})'
+
+
+class Not(Condition):
+    def __init__(self, condition: Condition):
+        self.condition = condition
+
+    def mask(self, lines: dict[str, np.ndarray]) -> np.ndarray:
+        return ~self.condition.mask(lines)
+
+    def names(self) -> set[str]:
+        return self.condition.names()
+
+    def __repr__(self) -> str:
+        return f'not {self.condition!r}'
+
+
+# longest first, so 'crosses above' wins over 'above' and '<=' over '<'
+_OPERATORS = {
+    'crosses above': lambda left, right: crosses_above(left, right),
+    'crossing above': lambda left, right: crosses_above(left, right),
+    'crosses below': lambda left, right: crosses_below(left, right),
+    'crossing below': lambda left, right: crosses_below(left, right),
+    'crosses': lambda left, right: crosses_above(left, right),
+    'crossing': lambda left, right: crosses_above(left, right),
+    'below': operator.lt,
+    'under': operator.lt,
+    'above': operator.gt,
+    'over': operator.gt,
+    '<=': operator.le,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '>': operator.gt
+}
+_CLAUSE = re.compile(
+    r'^\s*(?P<left>.+?)\s+(?P<op>' + '|'.join(re.escape(op) for op in _OPERATORS) + r')\s+(?P<right>.+?)\s*$',
+    re.IGNORECASE
+)
+
+
+def parse_expr(text: str, names: list[str]) -> Expr:
+    """
+    A number or a line name, matched case-insensitively against `names`.
+    """
+    text = text.strip()
+    try:
+        return Constant(float(text))
+    except ValueError:
+        pass
+    lookup = {name.lower(): name for name in names}
+    if text.lower() not in lookup:
+        raise ValueError(f'Unknown line "{text}"; available: {", ".join(names)}')
+    return Line(lookup[text.lower()])
+
+
+def parse_condition(text: str, names: list[str]) -> Condition:
+    """
+    Parse clauses joined by 'and' / 'or' ('and' binds tighter), each
+    `<line or number> <operator> <line or number>` with operators
+    <, <=, >, >=, below/under, above/over and crosses (above|below).
+    Line names are matched case-insensitively against `names`.
+    """
+    alternatives = []
+    for part in re.split(r'\s+or\s+', text.strip(), flags=re.IGNORECASE):
+        clauses = []
+        for clause in re.split(r'\s+and\s+', part, flags=re.IGNORECASE):
+            match = _CLAUSE.match(clause)
+            if match is None:
+                raise ValueError(f'Cannot parse condition "{clause}"')
+            left, right = parse_expr(match['left'], names), parse_expr(match['right'], names)
+            op = _OPERATORS[match['op'].lower()]
+            symbol = match['op'].lower()
+            clauses.append(op(left, right) if symbol.startswith('cross') else Compare(left, right, op, symbol))
+        condition = clauses[0]
+        for clause in clauses[1:]:
+            condition = condition & clause
+        alternatives.append(condition)
+
+    condition = alternatives[0]
+    for alternative in alternatives[1:]:
+        condition = condition | alternative
+    return condition
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+from src.trading_funcs.data.panel import Panel
+from src.trading_funcs.indicators.compute import compute_indicators
+from src.trading_funcs.screener.conditions import Condition, Expr, Line, parse_condition, parse_expr
+from src.utils.instrumentation import span
+from src.utils.logs import set_up_log
+
+
+logger = set_up_log(__name__)
+
+
+class Screener:
+    """
+    Evaluates conditions over a whole universe at once.
+
+    The default indicator set is computed once for the panel as (symbols, bars)
+    arrays, under the chart line names ('RSI', '%K', 'Lower Bollinger 20', ...)
+    next to the price columns; RSI and %K/%D are on the 0..100 scale.
+
+        screener = Screener(Panel.from_store(store, symbols, '1d'))
+        screener.scan('RSI < 30 and close < Lower Bollinger 20 and %K crosses above %D', rank_by='RSI')
+
+    :param panel: Universe to screen.
+    :param lines: Extra (symbols, bars) arrays to screen on, keyed by name.
+    """
+
+    def __init__(self, panel: Panel, lines: dict[str, np.ndarray] | None = None):
+        self.panel = panel
+        self._lines = None
+        self._extra = dict(lines or {})
+
+    @property
+    def lines(self) -> dict[str, np.ndarray]:
+        if self._lines is None:
+            with span('screener.indicators'):
+                lines = dict(self.panel.columns)
+                lines.update(compute_indicators(self.panel['high'], self.panel['low'], self.panel['close']))
+                lines.update(self._extra)
+            self._lines = lines
+        return self._lines
+
+    def mask(self, condition: Condition | str) -> np.ndarray:
+        """
+        Boolean (symbols, bars) array of where `condition` holds.
+        """
+        if isinstance(condition, str):
+            condition = parse_condition(condition, list(self.lines))
+        with span('screener.mask'):
+            return np.broadcast_to(condition.mask(self.lines), self.panel.shape)
+
+    def scan(self, condition: Condition | str, rank_by: Expr | str | None = None, ascending: bool = True, top: int | None = None, at: int = -1) -> pd.DataFrame:
+        """
+        Symbols matching `condition` on one bar, with the lines it references.
+
+        :param rank_by: Line (or expression) to sort matches by; input order when None.
+        :param ascending: Sort order for `rank_by`, e.g. lowest RSI first.
+        :param top: Keep only the first `top` matches.
+        :param at: Bar to screen, as a position on the panel's time axis (-1 is the latest).
+        """
+        if isinstance(condition, str):
+            condition = parse_condition(condition, list(self.lines))
+        if isinstance(rank_by, str):
+            rank_by = parse_expr(rank_by, list(self.lines))
+        if not len(self.panel) or not self.panel.shape[1]:
+            return pd.DataFrame(columns=['symbol'])
+
+        hits = np.flatnonzero(self.mask(condition)[:, at])
+        names = sorted(condition.names() | (rank_by.names() if rank_by is not None else set()))
+        result = pd.DataFrame({'symbol': [self.panel.symbols[row] for row in hits]})
+        for name in names:
+            result[name] = self.lines[name][hits, at]
+        if rank_by is not None:
+            key = rank_by.name if isinstance(rank_by, Line) else 'rank'
+            if key not in result:
+                result[key] = np.broadcast_to(rank_by.values(self.lines), self.panel.shape)[hits, at]
+            result = result.sort_values(key, ascending=ascending, kind='stable')
+        if top is not None:
+            result = result.head(top)
+
+        bar_time = pd.to_datetime(self.panel.time[at], unit='s')
+        logger.info(f'{len(hits)} of {len(self.panel)} symbols match {condition!r} at {bar_time}')
+        return result.reset_index(drop=True)
@@ -0,0 +1,268 @@
+"""
+Hot-path instrumentation: nested timing spans, per-stage histograms and
+optional allocation deltas, exportable as JSON or Prometheus text.
+
+    from src.utils.instrumentation import span, timed
+
+    with span('fetch'):
+        ...
+
+    @timed('indicator.rsi')
+    def calculate(...):
+        ...
+
+Instrumentation is off unless `INSTRUMENTATION` is set ('on', or 'memory' to
+also trace allocations) or `enable()` is called. When off, `span` returns a
+shared no-op context manager and `timed` calls straight through.
+"""
+
+import bisect
+import contextvars
+import functools
+import json
+import threading
+import time
+import tracemalloc
+from collections import deque
+from typing import Callable
+from src.initialize.init import ENV
+
+
+# histogram bucket upper bounds in seconds (Prometheus `le` labels)
+BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """
+    Cumulative-bucket latency histogram of one stage, plus allocation totals.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+        self.alloc_bytes = 0
+
+    def observe(self, seconds: float, alloc_bytes: int = 0) -> None:
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        self.alloc_bytes += alloc_bytes
+
+    def quantile(self, q: float) -> float:
+        """
+        Upper bound of the bucket holding the q-quantile (the max for the overflow bucket).
+        """
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self.buckets[index], self.max) if index < len(self.buckets) else self.max
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            'count': self.count,
+            'sum_seconds': self.sum,
+            'min_seconds': self.min if self.count else 0.0,
+            'max_seconds': self.max,
+            'p50_seconds': self.quantile(0.5),
+            'p95_seconds': self.quantile(0.95),
+            'p99_seconds': self.quantile(0.99),
+            'alloc_bytes': self.alloc_bytes,
+            'buckets': dict(zip([*map(str, self.buckets), '+Inf'], self.counts))
+        }
+
+
+class Span:
+    """
+    One timed region. Entering pushes it on the current span stack, so spans
+    opened inside it become its children. The stack is a context variable, so
+    threads and asyncio tasks each nest their own spans.
+    """
+
+    __slots__ = ('registry', 'name', 'parent', 'depth', 'start_ns', 'duration_ns', 'alloc_bytes', '_mem_start', '_token')
+
+    def __init__(self, registry: 'Instrumentation', name: str):
+        self.registry = registry
+        self.name = name
+        self.parent = None
+        self.depth = 0
+        self.start_ns = 0
+        self.duration_ns = 0
+        self.alloc_bytes = 0
+        self._mem_start = None
+        self._token = None
+
+    def __enter__(self) -> 'Span':
+        stack = _STACK.get()
+        if stack:
+            self.parent = stack[-1].name
+            self.depth = len(stack)
+        self._token = _STACK.set(stack + (self,))
+        if self.registry.trace_memory and tracemalloc.is_tracing():
+            self._mem_start = tracemalloc.get_traced_memory()[0]
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.duration_ns = time.perf_counter_ns() - self.start_ns
+        if self._mem_start is not None:
+            self.alloc_bytes = tracemalloc.get_traced_memory()[0] - self._mem_start
+        _STACK.reset(self._token)
+        self.registry._record(self)
+
+    def to_dict(self) -> dict:
+        return {
+            'name': self.name,
+            'parent': self.parent,
+            'depth': self.depth,
+            'seconds': self.duration_ns / 1e9,
+            'alloc_bytes': self.alloc_bytes
+        }
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> '_NoopSpan':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+_STACK = contextvars.ContextVar('instrumentation_spans', default=())
+
+
+class Instrumentation:
+    """
+    Registry of stage histograms and the most recent spans.
+
+    :param recent: How many finished spans to keep for the nested trace.
+    """
+
+    def __init__(self, enabled: bool = False, trace_memory: bool = False, recent: int = 1000):
+        self.enabled = enabled
+        self.trace_memory = trace_memory
+        self.histograms = {}
+        self.recent = deque(maxlen=recent)
+        self._lock = threading.Lock()
+        # whether tracemalloc was started here, and so is ours to stop
+        self._started_tracing = False
+
+    def enable(self, trace_memory: bool = False) -> None:
+        self.enabled = True
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        elif not trace_memory:
+            self._stop_tracing()
+
+    def disable(self) -> None:
+        self.enabled = False
+        self.trace_memory = False
+        self._stop_tracing()
+
+    def _stop_tracing(self) -> None:
+        # tracing started elsewhere (a benchmark, a profiler) is left running
+        if self._started_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._started_tracing = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self.histograms = {}
+            self.recent.clear()
+
+    def _record(self, span: Span) -> None:
+        with self._lock:
+            histogram = self.histograms.get(span.name)
+            if histogram is None:
+                histogram = self.histograms[span.name] = Histogram()
+            histogram.observe(span.duration_ns / 1e9, span.alloc_bytes)
+            self.recent.append(span)
+
+    def span(self, name: str) -> Span | _NoopSpan:
+        if not self.enabled:
+            return _NOOP_SPAN
+        return Span(self, name)
+
+    def timed(self, name: str | None = None) -> Callable:
+        """
+        Decorator recording every call of the function as a span (named after it by default).
+        """
+        def decorator(func):
+            span_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with Span(self, span_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                'stages': {name: histogram.to_dict() for name, histogram in self.histograms.items()},
+                'recent_spans': [span.to_dict() for span in self.recent]
+            }
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.snapshot(), **kwargs)
+
+    def to_prometheus(self, prefix: str = 'trading') -> str:
+        """
+        Stage histograms in the Prometheus text exposition format.
+        """
+        lines = [
+            f'# HELP {prefix}_stage_seconds Time spent per instrumented stage.',
+            f'# TYPE {prefix}_stage_seconds histogram'
+        ]
+        alloc_lines = [
+            f'# HELP {prefix}_stage_alloc_bytes Net traced allocations per instrumented stage.',
+            f'# TYPE {prefix}_stage_alloc_bytes gauge'
+        ]
+        with self._lock:
+            for name, histogram in sorted(self.histograms.items()):
+                label = name.replace('\\', '\\\\').replace('"', '\\"')
+                cumulative = 0
+                for bound, count in zip([*map(str, histogram.buckets), '+Inf'], histogram.counts):
+                    cumulative += count
+                    lines.append(f'{prefix}_stage_seconds_bucket{{stage="{label}",le="{bound}"}} {cumulative}')
+                lines.append(f'{prefix}_stage_seconds_sum{{stage="{label}"}} {histogram.sum}')
+                lines.append(f'{prefix}_stage_seconds_count{{stage="{label}"}} {histogram.count}')
+                alloc_lines.append(f'{prefix}_stage_alloc_bytes{{stage="{label}"}} {histogram.alloc_bytes}')
+        return '\n'.join(lines + alloc_lines) + '\n'
+
+    def report(self) -> str:
+        """
+        One line per stage, slowest total first.
+        """
+        rows = sorted(self.snapshot()['stages'].items(), key=lambda item: -item[1]['sum_seconds'])
+        return '\n'.join(
+            f"{name}: n={stats['count']} total={stats['sum_seconds'] * 1e3:.2f}ms "
+            f"p50<={stats['p50_seconds'] * 1e3:.2f}ms p99<={stats['p99_seconds'] * 1e3:.2f}ms "
+            f"max={stats['max_seconds'] * 1e3:.2f}ms alloc={stats['alloc_bytes'] / 2 ** 20:.2f}MB"
+            for name, stats in rows
+        )
+
+
+INSTRUMENTATION = Instrumentation()
+if ENV.INSTRUMENTATION:
+    INSTRUMENTATION.enable(trace_memory=ENV.INSTRUMENTATION.lower() == 'memory')
+
+span = INSTRUMENTATION.span
+timed = INSTRUMENTATION.timed
@@ -0,0 +1,26 @@
+import importlib
+from typing import Callable
+
+
+def lazy_exports(package: str, exports: dict[str, str]) -> tuple[Callable[[str], object], Callable[[], list[str]]]:
+    """
+    Module-level `__getattr__` and `__dir__` (PEP 562) that import a package's
+    public names from their submodules on first access, so importing the package
+    itself stays cheap.
+
+    :param package: The package's `__name__`.
+    :param exports: Public name -> module that defines it.
+    """
+    namespace = importlib.import_module(package).__dict__
+
+    def __getattr__(name: str) -> object:
+        if name not in exports:
+            raise AttributeError(f'module {package!r} has no attribute {name!r}')
+        value = getattr(importlib.import_module(exports[name]), name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted({*namespace, *exports})
+
+    return __getattr__, __dir__
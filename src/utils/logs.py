@@ -1,6 +1,4 @@
 import logging
-import time
-import functools
 from src.initialize.init import ENV
 
 
@@ -35,20 +33,3 @@ def set_up_log(logname):
 
     return logger
 
-
-def time_it(unit=None):
-    def decorator(func):
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-
-            start_time = time.time()
-            try:
-                result = func(*args, **kwargs)
-            finally:
-                end_time = time.time()
-                execution_time = end_time - start_time
-                class_name = func.__qualname__.split('.')[0] if '.' in func.__qualname__ else 'Global'
-                print(f"{unit if unit else ''} {class_name}.{func.__name__}, time cost: {execution_time:.6f}s")
-            return result
-        return wrapper
-    return decorator
\ No newline at end of file